@@ -6,30 +6,27 @@ Autore: Miaono Klaus
 Versione: 3.3 - Restructured UX with Separate Pages
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
 import streamlit as st
 
 # Import dei moduli personalizzati
 from translations import t
-from calculations import (
-    calcola_fondo_emergenza,
-    verifica_fondo_emergenza,
-    calcola_mesi_rientro_emergenza,
-    calcola_pac_totale,
-    calcola_disponibilita_investimenti
-)
 from ui_components import (
     render_language_selector,
     render_dati_base,
     render_dati_demografici,
+    archivio_obiettivi,
     render_gestione_obiettivi,
     render_profilo_rischio,
+    render_analisi_sensibilita,
+    render_confronto_profili,
     render_educational_resources
 )
-from report_generator_fase1 import genera_report_fase1
-from report_generator_fase2 import genera_report_fase2
-from report_generator_fase3 import genera_report_fase3
 from disclaimer import genera_disclaimer
-from pdf_generator import genera_pdf_piano_finanziario
+from goal_store import GoalStore
+from pipeline import PlanPipeline
 
 
 def setup_page():
@@ -48,7 +45,7 @@ def init_session_state():
     if 'language' not in st.session_state:
         st.session_state.language = 'it'
     if 'obiettivi' not in st.session_state:
-        st.session_state.obiettivi = []
+        st.session_state.obiettivi = GoalStore()
     if 'dati_salvati' not in st.session_state:
         st.session_state.dati_salvati = False
 
@@ -267,7 +264,7 @@ def render_results_page(lang):
     dati_base = st.session_state.dati_base
     dati_demografici = st.session_state.dati_demografici
     profilo_rischio = st.session_state.profilo_rischio
-    obiettivi = st.session_state.obiettivi
+    obiettivi = archivio_obiettivi().come_lista()
     
     # Titolo
     if lang == "it":
@@ -294,34 +291,20 @@ def render_results_page(lang):
         }
         st.info(info_text[lang])
     
-    # Calcoli preliminari
-    risparmio_mensile = dati_base['entrate'] - dati_base['uscite']
+    # Calcolo delle tre fasi (pipeline indipendente da Streamlit)
+    pipeline = PlanPipeline(lang)
+    risultato = pipeline.esegui(
+        dati_base,
+        obiettivi,
+        profilo_rischio,
+        dati_demografici['anni_pensione']
+    )
+    fe_completo = risultato['fase1']['fe_completo']
     
     # ====================================================================
     # FASE 1: Fondo di Emergenza
     # ====================================================================
-    fondo_emergenza = calcola_fondo_emergenza(dati_base['uscite'])
-    fe_completo, differenza = verifica_fondo_emergenza(
-        dati_base['capitale'], 
-        fondo_emergenza
-    )
-    
-    mesi_rientro = None
-    if not fe_completo and risparmio_mensile > 0:
-        mesi_rientro = calcola_mesi_rientro_emergenza(differenza, risparmio_mensile)
-    
-    # Genera report FASE 1
-    report_fase1 = genera_report_fase1(
-        dati_base['capitale'],
-        fondo_emergenza,
-        differenza,
-        dati_base['uscite'],
-        risparmio_mensile,
-        mesi_rientro,
-        lang
-    )
-    
-    st.markdown(report_fase1)
+    st.markdown(risultato['fase1']['report'])
     
     # Se il Fondo di Emergenza non è completo, mostra warning
     if not fe_completo:
@@ -338,40 +321,21 @@ def render_results_page(lang):
         st.warning(warning_text[lang])
         st.info(info_text[lang])
     
-    # Capitale eccedente (sarà 0 se fondo emergenza incompleto)
-    capitale_eccedente = max(0, differenza)
-    
     # ====================================================================
     # FASE 2: Spese Prevedibili (PAC)
     # ====================================================================
-    report_fase2, pac_totale, _, capitale_investibile_subito = genera_report_fase2(
-        obiettivi,
-        dati_base['entrate'],
-        dati_base['uscite'],
-        capitale_eccedente,
-        lang
-    )
-    
-    st.markdown(report_fase2)
+    st.markdown(risultato['fase2']['report'])
     
     # ====================================================================
     # FASE 3: Investimenti (Educativo + Allocazione)
     # ====================================================================
-    disponibilita_investimenti_mensile = calcola_disponibilita_investimenti(
-        dati_base['entrate'],
-        dati_base['uscite'],
-        pac_totale
-    )
+    st.markdown(risultato['fase3']['report'])
     
-    report_fase3 = genera_report_fase3(
-        disponibilita_investimenti_mensile,
-        capitale_investibile_subito,
-        profilo_rischio,
-        dati_demografici['anni_pensione'],
-        lang
-    )
+    # Analisi "cosa succede se" su entrate e uscite
+    render_analisi_sensibilita(lang, dati_base, obiettivi)
     
-    st.markdown(report_fase3)
+    # Confronto dei profili di rischio sugli stessi importi (senza ricalcolare le fasi)
+    render_confronto_profili(lang, pipeline, risultato)
     
     # Sezione link esterno per esempi di portafoglio
     st.markdown("---")
@@ -451,59 +415,8 @@ def render_results_page(lang):
     }
     st.markdown(export_description[lang])
     
-    # Genera il PDF
-    try:
-        pdf_buffer = genera_pdf_piano_finanziario(
-            dati_base=dati_base,
-            dati_demografici=dati_demografici,
-            profilo_rischio=profilo_rischio,
-            obiettivi=obiettivi,
-            report_fase1_text=report_fase1,
-            report_fase2_text=report_fase2,
-            report_fase3_text=report_fase3,
-            lang=lang
-        )
-        
-        # Nome file con data
-        from datetime import datetime
-        data_filename = datetime.now().strftime("%Y%m%d")
-        filename_map = {
-            'it': f'Piano_Finanziario_{data_filename}.pdf',
-            'en': f'Financial_Plan_{data_filename}.pdf',
-            'de': f'Finanzplan_{data_filename}.pdf'
-        }
-        
-        button_text = {
-            'it': '📥 Scarica Piano in PDF',
-            'en': '📥 Download Plan as PDF',
-            'de': '📥 Plan als PDF Herunterladen'
-        }
-        
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col2:
-            st.download_button(
-                label=button_text[lang],
-                data=pdf_buffer,
-                file_name=filename_map[lang],
-                mime='application/pdf',
-                type='primary',
-                use_container_width=True
-            )
-        
-        pdf_note = {
-            'it': '💡 **Nota:** Il PDF contiene un riepilogo dei tuoi dati e i report delle 3 fasi. Per ragioni di spazio, la sezione FASE 3 include solo i punti chiave dell\'allocazione. Consulta la versione online per i dettagli educativi completi.',
-            'en': '💡 **Note:** The PDF contains a summary of your data and the 3-phase reports. For space reasons, PHASE 3 includes only key allocation points. Consult the online version for complete educational details.',
-            'de': '💡 **Hinweis:** Das PDF enthält eine Zusammenfassung Ihrer Daten und die 3-Phasen-Berichte. Aus Platzgründen enthält PHASE 3 nur die wichtigsten Allokationspunkte. Konsultieren Sie die Online-Version für vollständige Bildungsdetails.'
-        }
-        st.info(pdf_note[lang])
-        
-    except Exception as e:
-        error_text = {
-            'it': f'⚠️ Errore nella generazione del PDF: {str(e)}',
-            'en': f'⚠️ Error generating PDF: {str(e)}',
-            'de': f'⚠️ Fehler beim Generieren des PDF: {str(e)}'
-        }
-        st.error(error_text[lang])
+    # Il PDF viene generato solo su richiesta (in background) e poi riutilizzato
+    render_pdf_export(lang, pipeline, risultato)
     
     # Bottone per ricominciare
     st.markdown("---")
@@ -518,10 +431,131 @@ def render_results_page(lang):
             # Reset dello stato
             st.session_state.page = 'home'
             st.session_state.dati_salvati = False
-            st.session_state.obiettivi = []
+            st.session_state.obiettivi = GoalStore()
             st.rerun()
 
 
+# Secondi tra due controlli dello stato del PDF in preparazione
+INTERVALLO_CONTROLLO_PDF = 0.5
+
+
+@st.cache_resource
+def get_pdf_executor():
+    """Executor condiviso tra le sessioni per generare i PDF in background."""
+    return ThreadPoolExecutor(max_workers=2)
+
+
+def render_pdf_export(lang, pipeline, risultato):
+    """
+    Renderizza l'esportazione PDF su richiesta.
+    
+    Il PDF non viene costruito a ogni rerun: parte in un thread in background solo
+    quando l'utente lo richiede, e il risultato resta in session_state finché i dati
+    (e quindi la chiave di contenuto) non cambiano. Durante la generazione solo il
+    riquadro dell'esportazione (un fragment) si aggiorna ogni INTERVALLO_CONTROLLO_PDF
+    secondi: il resto della pagina non viene ricalcolato.
+    """
+    chiave = pipeline.chiave_pdf(risultato)
+    export = st.session_state.get('pdf_export')
+    if export is None or export['chiave'] != chiave:
+        export = {'chiave': chiave, 'future': None}
+        st.session_state.pdf_export = export
+    
+    in_attesa = export['future'] is not None and not export['future'].done()
+    riquadro = st.fragment(_riquadro_pdf_export, run_every=INTERVALLO_CONTROLLO_PDF if in_attesa else None)
+    riquadro(lang, pipeline, risultato, export, in_attesa)
+
+
+def _riquadro_pdf_export(lang, pipeline, risultato, export, in_attesa):
+    """
+    Contenuto del riquadro di esportazione PDF (eseguito come fragment).
+    
+    Args:
+        lang (str): Codice lingua
+        pipeline (PlanPipeline): Pipeline che genera il PDF
+        risultato (dict): Risultato di PlanPipeline.esegui
+        export (dict): Stato dell'esportazione in session_state ({'chiave', 'future'})
+        in_attesa (bool): True se il fragment è stato creato con il controllo periodico attivo
+    """
+    future = export['future']
+    
+    # 1. Nessuna richiesta: mostra il bottone di preparazione
+    if future is None:
+        prepare_text = {
+            'it': '📄 Prepara il PDF',
+            'en': '📄 Prepare PDF',
+            'de': '📄 PDF Vorbereiten'
+        }
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            if st.button(prepare_text[lang], use_container_width=True):
+                export['future'] = get_pdf_executor().submit(pipeline.genera_pdf, risultato)
+                # Rerun completo: il riquadro riparte con il controllo periodico attivo
+                st.rerun()
+        return
+    
+    # 2. Generazione in corso: nessuna attesa qui, il fragment ricontrolla a ogni intervallo
+    if not future.done():
+        progress_text = {
+            'it': '⏳ Generazione del PDF in corso...',
+            'en': '⏳ Generating PDF...',
+            'de': '⏳ PDF wird generiert...'
+        }
+        st.info(progress_text[lang])
+        return
+    
+    # PDF appena completato: un solo rerun completo per fermare il controllo periodico
+    if in_attesa:
+        st.rerun()
+    
+    # 3. Generazione fallita: mostra l'errore e consenti di riprovare
+    errore = future.exception()
+    if errore is not None:
+        error_text = {
+            'it': f'⚠️ Errore nella generazione del PDF: {str(errore)}',
+            'en': f'⚠️ Error generating PDF: {str(errore)}',
+            'de': f'⚠️ Fehler beim Generieren des PDF: {str(errore)}'
+        }
+        st.error(error_text[lang])
+        retry_text = {'it': '🔁 Riprova', 'en': '🔁 Retry', 'de': '🔁 Erneut Versuchen'}
+        if st.button(retry_text[lang]):
+            export['future'] = None
+            st.rerun()
+        return
+    
+    # 4. PDF pronto: download
+    data_filename = datetime.now().strftime("%Y%m%d")
+    filename_map = {
+        'it': f'Piano_Finanziario_{data_filename}.pdf',
+        'en': f'Financial_Plan_{data_filename}.pdf',
+        'de': f'Finanzplan_{data_filename}.pdf'
+    }
+    
+    button_text = {
+        'it': '📥 Scarica Piano in PDF',
+        'en': '📥 Download Plan as PDF',
+        'de': '📥 Plan als PDF Herunterladen'
+    }
+    
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        st.download_button(
+            label=button_text[lang],
+            data=future.result(),
+            file_name=filename_map[lang],
+            mime='application/pdf',
+            type='primary',
+            use_container_width=True
+        )
+    
+    pdf_note = {
+        'it': '💡 **Nota:** Il PDF contiene un riepilogo dei tuoi dati e i report completi delle 3 fasi, incluse le tabelle e i dettagli educativi della FASE 3.',
+        'en': '💡 **Note:** The PDF contains a summary of your data and the complete 3-phase reports, including the tables and educational details of PHASE 3.',
+        'de': '💡 **Hinweis:** Das PDF enthält eine Zusammenfassung Ihrer Daten und die vollständigen 3-Phasen-Berichte, einschließlich der Tabellen und Bildungsdetails von PHASE 3.'
+    }
+    st.info(pdf_note[lang])
+
+
 def main():
     """Funzione principale dell'app."""
     setup_page()
@@ -0,0 +1,207 @@
+"""
+Backtest Module
+Backtest storico dell'allocazione (genera_allocazione_investimenti) sui rendimenti mensili
+di Azioni, Obbligazioni e Oro salvati in un file binario locale (data/rendimenti_storici.npy),
+letto con NumPy in memory-map: nessun accesso alla rete e nessun costo di caricamento.
+
+Per ogni mese di partenza della serie si simula l'intero orizzonte dell'utente (finestre
+mobili con sliding_window_view) e si riportano l'esito peggiore, mediano e migliore.
+Il modulo è solo una libreria, non collegata all'interfaccia: il file dei dati non è incluso
+e va creato da un CSV con converti_csv, usando una serie storica di cui si conoscono fonte e
+licenza; se manca, backtest_storico restituisce None.
+"""
+
+import csv
+import os
+import sys
+from functools import lru_cache
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from market_assumptions import ASSET, vettore_pesi
+
+
+# File dei rendimenti storici (array strutturato, un record per mese)
+PERCORSO_DATI = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'rendimenti_storici.npy')
+
+# Record del file: mese come intero AAAAMM e rendimento semplice mensile per classe di attivo
+DTYPE_DATI = np.dtype([('mese', '<i4')] + [(asset, '<f8') for asset in ASSET])
+
+
+def dati_disponibili(percorso=PERCORSO_DATI):
+    """Indica se il file dei rendimenti storici è presente."""
+    return os.path.isfile(percorso)
+
+
+@lru_cache(maxsize=4)
+def _carica(percorso, modificato):
+    """Apre il file in memory-map; la data di modifica invalida la cache se il file cambia."""
+    dati = np.load(percorso, mmap_mode='r')
+    if dati.dtype != DTYPE_DATI or dati.ndim != 1:
+        raise ValueError(f"Formato non valido per {percorso}: atteso {DTYPE_DATI}, trovato {dati.dtype}")
+    return dati
+
+
+def carica_rendimenti_storici(percorso=PERCORSO_DATI):
+    """
+    Carica la serie storica dei rendimenti mensili.
+
+    Args:
+        percorso (str): File .npy creato da converti_csv
+
+    Returns:
+        np.memmap | None: Array strutturato (campi 'mese' e ASSET), None se il file non esiste
+    """
+    if not dati_disponibili(percorso):
+        return None
+    return _carica(percorso, os.path.getmtime(percorso))
+
+
+def converti_csv(percorso_csv, percorso_npy=PERCORSO_DATI):
+    """
+    Converte un CSV di rendimenti mensili nel file binario letto dal backtest.
+
+    Il CSV ha intestazione `mese,Azioni,Obbligazioni,Oro`; il mese è nel formato AAAA-MM
+    e i rendimenti sono semplici e decimali (0.012 = +1,2% nel mese).
+
+    Args:
+        percorso_csv (str): File CSV di origine
+        percorso_npy (str): File .npy di destinazione
+
+    Returns:
+        int: Numero di mesi convertiti
+    """
+    with open(percorso_csv, newline='', encoding='utf-8') as file:
+        righe = list(csv.DictReader(file))
+
+    dati = np.empty(len(righe), dtype=DTYPE_DATI)
+    for indice, riga in enumerate(righe):
+        anno, mese = riga['mese'].strip().split('-')[:2]
+        dati[indice] = (int(anno) * 100 + int(mese),) + tuple(float(riga[asset]) for asset in ASSET)
+
+    dati = np.sort(dati, order='mese')
+    if len(dati) > 1 and np.any(np.diff(dati['mese']) == 0):
+        raise ValueError("Il CSV contiene mesi duplicati")
+    if np.any(np.column_stack([dati[asset] for asset in ASSET]) <= -1):
+        raise ValueError("Rendimenti mensili non validi (<= -100%)")
+
+    cartella = os.path.dirname(percorso_npy)
+    if cartella:
+        os.makedirs(cartella, exist_ok=True)
+    np.save(percorso_npy, dati)
+    return len(dati)
+
+
+def rendimenti_portafoglio(dati, allocazione):
+    """
+    Rendimento mensile del portafoglio ribilanciato ogni mese all'allocazione.
+
+    Args:
+        dati (np.ndarray): Serie storica (vedi carica_rendimenti_storici)
+        allocazione (dict): {'Azioni': 60, 'Obbligazioni': 30, 'Oro': 10}
+
+    Returns:
+        np.ndarray: Rendimento semplice mensile, shape (mesi,)
+    """
+    pesi = vettore_pesi(allocazione)
+    rendimenti = np.zeros(len(dati))
+    for asset, peso in zip(ASSET, pesi):
+        if peso:
+            rendimenti += peso * dati[asset]
+    return rendimenti
+
+
+def backtest_finestre(rendimenti, mesi, contributo_mensile=0.0, capitale_iniziale=0.0):
+    """
+    Valore finale di PAC + capitale per ogni finestra di `mesi` mesi consecutivi.
+
+    Con crescita[t] = prodotto dei fattori dei primi t mesi, il saldo di una finestra
+    che parte al mese s è crescita[s + mesi] × (capitale / crescita[s] + c × Σ 1 / crescita[k])
+    per k da s a s + mesi - 1 (contributo a inizio mese, come in projections).
+
+    Args:
+        rendimenti (np.ndarray): Rendimenti semplici mensili del portafoglio, shape (M,)
+        mesi (int): Durata di ogni finestra
+        contributo_mensile (float): Importo versato ogni mese
+        capitale_iniziale (float): Capitale investito all'inizio
+
+    Returns:
+        dict: {'patrimonio_finale', 'rendimento_annuo'} come array di shape (M - mesi + 1,);
+              vuoti se la serie è più corta della finestra
+    """
+    rendimenti = np.asarray(rendimenti, dtype=float)
+    if mesi <= 0 or len(rendimenti) < mesi:
+        return {'patrimonio_finale': np.empty(0), 'rendimento_annuo': np.empty(0)}
+
+    crescita = np.concatenate([[1.0], np.cumprod(1 + rendimenti)])
+    inizio = crescita[:len(crescita) - mesi]
+    fine = crescita[mesi:]
+    versamenti_scontati = sliding_window_view(1 / crescita[:-1], mesi).sum(axis=1)
+
+    return {
+        'patrimonio_finale': fine * (capitale_iniziale / inizio + contributo_mensile * versamenti_scontati),
+        'rendimento_annuo': (fine / inizio) ** (12 / mesi) - 1
+    }
+
+
+def _mese_leggibile(codice):
+    """Converte il mese AAAAMM in 'AAAA-MM'."""
+    return f"{int(codice) // 100:04d}-{int(codice) % 100:02d}"
+
+
+def backtest_storico(allocazione, anni, contributo_mensile=0.0, capitale_iniziale=0.0, dati=None):
+    """
+    Backtest su finestre mobili dell'allocazione per l'orizzonte dell'utente.
+
+    Args:
+        allocazione (dict): Allocazione percentuale (genera_allocazione_investimenti)
+        anni (int): Orizzonte in anni
+        contributo_mensile (float): Importo investito ogni mese
+        capitale_iniziale (float): Capitale investito subito
+        dati (np.ndarray): Serie storica (None = carica_rendimenti_storici())
+
+    Returns:
+        dict | None: {
+            'finestre': numero di mesi di partenza, 'periodo': (primo mese, ultimo mese),
+            'versato': totale versato, 'peggiore' / 'mediano' / 'migliore': {
+                'patrimonio_finale', 'rendimento_annuo', 'inizio' (mese di partenza)
+            }
+        }; None se i dati mancano o sono più corti dell'orizzonte
+    """
+    if dati is None:
+        dati = carica_rendimenti_storici()
+    mesi = int(round(anni * 12))
+    if dati is None or mesi <= 0 or len(dati) < mesi:
+        return None
+
+    risultato = backtest_finestre(
+        rendimenti_portafoglio(dati, allocazione), mesi, contributo_mensile, capitale_iniziale
+    )
+    patrimonio = risultato['patrimonio_finale']
+    ordine = np.argsort(patrimonio, kind='stable')
+    codici_mese = dati['mese']
+
+    def esito(indice):
+        return {
+            'patrimonio_finale': float(patrimonio[indice]),
+            'rendimento_annuo': float(risultato['rendimento_annuo'][indice]),
+            'inizio': _mese_leggibile(codici_mese[indice])
+        }
+
+    return {
+        'finestre': len(patrimonio),
+        'periodo': (_mese_leggibile(codici_mese[0]), _mese_leggibile(codici_mese[-1])),
+        'versato': float(capitale_iniziale + contributo_mensile * mesi),
+        'peggiore': esito(ordine[0]),
+        'mediano': esito(ordine[len(ordine) // 2]),
+        'migliore': esito(ordine[-1])
+    }
+
+
+if __name__ == '__main__':
+    if len(sys.argv) not in (2, 3):
+        print("Uso: python backtest.py rendimenti.csv [destinazione.npy]", file=sys.stderr)
+        sys.exit(2)
+    convertiti = converti_csv(*sys.argv[1:])
+    print(f"Mesi convertiti: {convertiti}")
@@ -0,0 +1,189 @@
+"""
+Batch Calculations Module
+Versione vettoriale (NumPy) dei calcoli delle tre fasi per molti profili in una sola chiamata.
+Fasi 1 e 3 e PAC coincidono con le funzioni scalari di calculations.py; la divisione del
+capitale eccedente tra obiettivi e investimenti segue le scadenze reali con
+timeline.simula_timeline (come timeline.alloca_capitale_obiettivi nel report della FASE 2).
+"""
+
+import numpy as np
+
+from calculations import CODICI_PROFILO, CODICE_PROFILO_DEFAULT, allocazioni_da_tabella
+from pac_solver import calcola_pac_batch
+from timeline import simula_timeline
+
+
+def codifica_profili(profili):
+    """
+    Converte una sequenza di profili (stringhe localizzate) in codici interi.
+
+    Args:
+        profili (iterable): Profili di rischio ("Conservatore", "Moderate", ...)
+
+    Returns:
+        np.ndarray: Codici 0 (Conservativo), 1 (Moderato), 2 (Aggressivo)
+    """
+    return np.array([CODICI_PROFILO.get(p, CODICE_PROFILO_DEFAULT) for p in profili], dtype=np.int64)
+
+
+def calcola_mesi_rientro_emergenza_batch(deficit, risparmio_mensile):
+    """
+    Equivalente vettoriale di calcola_mesi_rientro_emergenza.
+
+    Args:
+        deficit (array): Importi mancanti al fondo emergenza
+        risparmio_mensile (array): Risparmio mensile disponibile
+
+    Returns:
+        np.ndarray: Mesi necessari (inf dove il risparmio è nullo o negativo)
+    """
+    deficit = np.asarray(deficit, dtype=float)
+    risparmio_mensile = np.asarray(risparmio_mensile, dtype=float)
+
+    positivo = risparmio_mensile > 0
+    divisore = np.where(positivo, risparmio_mensile, 1.0)
+    return np.where(positivo, np.ceil(np.abs(deficit) / divisore), np.inf)
+
+
+def calcola_pac_mensile_batch(costi_obiettivi, anni_obiettivi, rendimenti=0.0, inflazione=0.0):
+    """
+    Equivalente vettoriale di calcola_pac_mensile.
+
+    Args:
+        costi_obiettivi (array): Costi totali degli obiettivi
+        anni_obiettivi (array): Anni disponibili per ciascun obiettivo
+        rendimenti (array): Rendimento annuo netto atteso (frazione, es. 0.03)
+        inflazione (array): Inflazione annua del costo (frazione)
+
+    Returns:
+        np.ndarray: PAC mensile per obiettivo (0 dove gli anni sono <= 0)
+    """
+    return calcola_pac_batch(costi_obiettivi, anni_obiettivi, rendimenti, inflazione)
+
+
+def genera_allocazione_investimenti_batch(codici_profilo, anni_pensione):
+    """
+    Equivalente vettoriale di genera_allocazione_investimenti (accesso alla tabella precalcolata).
+
+    Args:
+        codici_profilo (array): Codici profilo (vedi CODICI_PROFILO)
+        anni_pensione (array): Anni alla pensione
+
+    Returns:
+        dict: {'Azioni': array, 'Obbligazioni': array, 'Oro': array} in percentuale
+    """
+    allocazioni = allocazioni_da_tabella(codici_profilo, anni_pensione)
+    return {"Azioni": allocazioni[..., 0], "Obbligazioni": allocazioni[..., 1], "Oro": allocazioni[..., 2]}
+
+
+def calcola_piano_batch(entrate, uscite, capitale, costi_obiettivi=None, anni_obiettivi=None,
+                        profili=None, anni_pensione=None, rendimenti_obiettivi=None, inflazione_obiettivi=None):
+    """
+    Calcola le tre fasi del piano per N profili in una sola chiamata.
+
+    Replica la catena di render_results_page / genera_report_fase2: ogni riga
+    produce gli stessi numeri delle funzioni scalari di calculations.py e timeline.py.
+
+    Args:
+        entrate (array): Entrate mensili nette, shape (N,)
+        uscite (array): Uscite mensili totali, shape (N,)
+        capitale (array): Liquidità disponibile, shape (N,)
+        costi_obiettivi (array): Costi degli obiettivi, shape (N, K); NaN = obiettivo assente
+        anni_obiettivi (array): Anni agli obiettivi, shape (N, K)
+        profili (array): Codici profilo (vedi codifica_profili), shape (N,)
+        anni_pensione (array): Anni alla pensione, shape (N,)
+        rendimenti_obiettivi (array): Rendimento annuo atteso in percentuale, shape (N, K) (None = 0)
+        inflazione_obiettivi (array): Inflazione annua in percentuale, shape (N, K) (None = 0)
+
+    Returns:
+        dict: Array per ogni grandezza delle tre fasi (vedi chiavi restituite).
+              'mesi_rientro' vale inf se il risparmio è nullo/negativo e 0 se il fondo è completo;
+              'scoperto_residuo' è il totale dei PAC che né il risparmio (dopo il fondo di
+              emergenza) né il capitale eccedente riescono a pagare entro le scadenze.
+    """
+    entrate = np.asarray(entrate, dtype=float)
+    uscite = np.asarray(uscite, dtype=float)
+    capitale = np.asarray(capitale, dtype=float)
+    n = entrate.shape[0]
+
+    if costi_obiettivi is None:
+        costi_obiettivi = np.full((n, 0), np.nan)
+        anni_obiettivi = np.zeros((n, 0))
+    costi_obiettivi = np.asarray(costi_obiettivi, dtype=float).reshape(n, -1)
+    anni_obiettivi = np.asarray(anni_obiettivi, dtype=float).reshape(n, -1)
+    if rendimenti_obiettivi is None:
+        rendimenti_obiettivi = np.zeros(costi_obiettivi.shape)
+    if inflazione_obiettivi is None:
+        inflazione_obiettivi = np.zeros(costi_obiettivi.shape)
+    rendimenti_obiettivi = np.asarray(rendimenti_obiettivi, dtype=float).reshape(n, -1)
+    inflazione_obiettivi = np.asarray(inflazione_obiettivi, dtype=float).reshape(n, -1)
+
+    # FASE 1: Fondo di Emergenza
+    risparmio_mensile = entrate - uscite
+    fondo_emergenza = uscite * 6
+    differenza = capitale - fondo_emergenza
+    fe_completo = differenza >= 0
+    mesi_rientro = np.where(
+        fe_completo, 0.0,
+        calcola_mesi_rientro_emergenza_batch(differenza, risparmio_mensile)
+    )
+    capitale_eccedente = np.maximum(0.0, differenza)
+
+    # FASE 2: PAC (somma sequenziale come nel ciclo scalare)
+    presenti = ~np.isnan(costi_obiettivi)
+    pac = np.where(presenti, calcola_pac_mensile_batch(
+        np.nan_to_num(costi_obiettivi), anni_obiettivi,
+        np.nan_to_num(rendimenti_obiettivi) / 100, np.nan_to_num(inflazione_obiettivi) / 100
+    ), 0.0)
+    anni_validi = np.where(presenti, anni_obiettivi, 0.0)
+    n_obiettivi = presenti.sum(axis=1)
+
+    if costi_obiettivi.shape[1]:
+        pac_totale = np.cumsum(pac, axis=1)[:, -1]
+        somma_anni = np.cumsum(anni_validi, axis=1)[:, -1]
+    else:
+        pac_totale = np.zeros(n)
+        somma_anni = np.zeros(n)
+
+    con_obiettivi = n_obiettivi > 0
+    anni_media = np.where(con_obiettivi, somma_anni / np.maximum(n_obiettivi, 1), 5.0)
+    gap_mensile = risparmio_mensile - pac_totale
+
+    # Copertura del gap seguendo le scadenze reali degli obiettivi (vedi timeline):
+    # il risparmio ricostituisce prima il fondo di emergenza mancante, poi paga i PAC
+    timeline = simula_timeline(
+        risparmio_mensile, capitale_eccedente, np.where(presenti, pac, np.nan), anni_obiettivi * 12,
+        deficit_emergenza=np.maximum(-differenza, 0.0)
+    )
+    a_obiettivi = timeline['a_obiettivi']
+    a_investimenti = timeline['a_investimenti']
+    capitale_investibile_subito = np.where(
+        con_obiettivi & (gap_mensile < 0),
+        np.where(capitale_eccedente > 0, a_investimenti, 0.0),
+        capitale_eccedente
+    )
+
+    # FASE 3: Investimenti
+    disponibilita_investimenti = entrate - uscite - pac_totale
+
+    risultato = {
+        "risparmio_mensile": risparmio_mensile,
+        "fondo_emergenza": fondo_emergenza,
+        "differenza": differenza,
+        "fe_completo": fe_completo,
+        "mesi_rientro": mesi_rientro,
+        "capitale_eccedente": capitale_eccedente,
+        "pac_totale": pac_totale,
+        "anni_media_obiettivi": anni_media,
+        "gap_mensile": gap_mensile,
+        "a_obiettivi": a_obiettivi,
+        "a_investimenti": a_investimenti,
+        "scoperto_residuo": timeline['scoperto_residuo'],
+        "capitale_investibile_subito": capitale_investibile_subito,
+        "disponibilita_investimenti": disponibilita_investimenti
+    }
+
+    if profili is not None and anni_pensione is not None:
+        risultato["allocazione"] = genera_allocazione_investimenti_batch(profili, anni_pensione)
+
+    return risultato
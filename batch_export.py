@@ -0,0 +1,263 @@
+"""
+Batch Export Module
+Genera i PDF del piano finanziario per interi portafogli clienti usando un pool di processi.
+
+Uso da riga di comando:
+    python batch_export.py piani.jsonl --output pdf/ --workers 4
+    python batch_export.py piani.csv --output piani.zip --report esiti.jsonl
+
+Ogni piano (riga JSONL o CSV) contiene: id, entrate, uscite, capitale, capitale_investito,
+anni_pensione, profilo_rischio, lang, obiettivi (lista di {'nome', 'costo', 'anni'} con
+'rendimento' e 'inflazione' opzionali in percentuale e 'priorita', 'rinvio_massimo',
+'riduzione_massima' opzionali come in goal_optimizer; nel CSV è una stringa JSON).
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+
+from goal_optimizer import PRIORITA_PREDEFINITA
+from pipeline import PlanPipeline
+
+
+def leggi_piani(percorso):
+    """
+    Legge i piani da un file JSONL o CSV, uno alla volta.
+
+    Le righe non interpretabili vengono restituite come {'_errore': messaggio},
+    così da essere riportate come fallimenti senza interrompere il batch.
+
+    Args:
+        percorso (str): File .jsonl/.json oppure .csv
+
+    Yields:
+        dict: Record del piano
+    """
+    if percorso.lower().endswith('.csv'):
+        with open(percorso, newline='', encoding='utf-8') as f:
+            for indice, riga in enumerate(csv.DictReader(f)):
+                riga.setdefault('id', str(indice))
+                yield riga
+        return
+
+    with open(percorso, encoding='utf-8') as f:
+        for indice, riga in enumerate(f):
+            riga = riga.strip()
+            if not riga:
+                continue
+            try:
+                record = json.loads(riga)
+            except json.JSONDecodeError as e:
+                record = {'_errore': f'JSON non valido: {e}'}
+            if not isinstance(record, dict):
+                record = {'_errore': f'Record non valido: atteso un oggetto JSON, trovato {type(record).__name__}'}
+            record.setdefault('id', str(indice))
+            yield record
+
+
+def _anni(valore):
+    """Anni da JSON o CSV (anche frazionari, es. "30.5"); interi se il valore è intero."""
+    anni = float(valore)
+    return int(anni) if anni.is_integer() else anni
+
+
+def _normalizza_piano(record):
+    """Converte un record (JSONL o CSV) negli argomenti di PlanPipeline.esegui."""
+    if '_errore' in record:
+        raise ValueError(record['_errore'])
+    if record.get('id') is None or not str(record['id']).strip():
+        raise ValueError('Id del piano mancante')
+
+    obiettivi = record.get('obiettivi') or []
+    if isinstance(obiettivi, str):
+        obiettivi = json.loads(obiettivi)
+
+    dati_base = {
+        'entrate': float(record['entrate']),
+        'uscite': float(record['uscite']),
+        'capitale': float(record['capitale']),
+        'capitale_investito': float(record.get('capitale_investito') or 0)
+    }
+    obiettivi = [
+        {
+            'nome': str(o['nome']), 'costo': float(o['costo']), 'anni': _anni(o['anni']),
+            'rendimento': float(o.get('rendimento') or 0), 'inflazione': float(o.get('inflazione') or 0),
+            'priorita': int(o.get('priorita') or PRIORITA_PREDEFINITA),
+            'rinvio_massimo': float(o.get('rinvio_massimo') or 0),
+            'riduzione_massima': float(o.get('riduzione_massima') or 0)
+        }
+        for o in obiettivi
+    ]
+    return dati_base, obiettivi, record.get('profilo_rischio') or 'Moderato', _anni(record['anni_pensione'])
+
+
+def _genera_chunk(chunk):
+    """
+    Genera i PDF di un gruppo di piani (eseguita nei processi worker).
+
+    Returns:
+        list: Tuple (id, bytes del PDF o None, errore o None, secondi)
+    """
+    risultati = []
+    for record in chunk:
+        inizio = time.perf_counter()
+        try:
+            dati_base, obiettivi, profilo_rischio, anni_pensione = _normalizza_piano(record)
+            # Nessuna cache nei worker: ogni piano è generato una sola volta
+            pipeline = PlanPipeline(record.get('lang') or 'it', usa_cache=False)
+            pdf = pipeline.esegui(dati_base, obiettivi, profilo_rischio, anni_pensione, genera_pdf=True)['pdf']
+            risultati.append((record.get('id'), pdf, None, time.perf_counter() - inizio))
+        except Exception as e:
+            risultati.append((record.get('id'), None, f'{type(e).__name__}: {e}', time.perf_counter() - inizio))
+    return risultati
+
+
+def _nome_file(id_piano, usati=()):
+    """
+    Nome file sicuro per il PDF di un piano.
+
+    Se il nome è già in `usati` (id duplicati o che si riducono allo stesso nome)
+    si aggiunge un suffisso numerico: nessun PDF sovrascrive un altro.
+    """
+    base = re.sub(r'[^A-Za-z0-9._-]', '_', str(id_piano))
+    nome = base + '.pdf'
+    suffisso = 2
+    while nome in usati:
+        nome = f'{base}_{suffisso}.pdf'
+        suffisso += 1
+    return nome
+
+
+def esporta_pdf_batch(piani, destinazione, max_workers=None, chunksize=8, max_chunk_in_volo=None):
+    """
+    Genera i PDF per un flusso di piani con un ProcessPoolExecutor.
+
+    I piani vengono letti e inviati ai worker a gruppi (chunk); al massimo
+    `max_chunk_in_volo` gruppi sono in lavorazione contemporaneamente, quindi la
+    memoria resta limitata anche per portafogli molto grandi. Un errore su un
+    singolo piano viene registrato nel suo esito senza interrompere il batch.
+
+    Args:
+        piani (iterable): Record dei piani (vedi leggi_piani)
+        destinazione (str): Directory di output, oppure file .zip
+        max_workers (int): Numero di processi (default: numero di CPU)
+        chunksize (int): Piani per chunk inviato a un worker
+        max_chunk_in_volo (int): Chunk in lavorazione al massimo (default: 2 × worker)
+
+    Yields:
+        dict: Esito per piano {'id', 'file', 'secondi', 'errore'}
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    max_chunk_in_volo = max_chunk_in_volo or 2 * max_workers
+    piani = iter(piani)
+
+    archivio = None
+    if destinazione.lower().endswith('.zip'):
+        archivio = zipfile.ZipFile(destinazione, 'w', compression=zipfile.ZIP_DEFLATED)
+    else:
+        os.makedirs(destinazione, exist_ok=True)
+
+    nomi_usati = set()
+
+    def scrivi(id_piano, pdf):
+        nome = _nome_file(id_piano, nomi_usati)
+        if archivio is not None:
+            archivio.writestr(nome, pdf)
+        else:
+            percorso = os.path.join(destinazione, nome)
+            with open(percorso, 'wb') as f:
+                f.write(pdf)
+        nomi_usati.add(nome)
+        return nome if archivio is not None else percorso
+
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            # Future in lavorazione -> id dei piani del chunk (per riportarli se il worker fallisce)
+            in_volo = {}
+            esauriti = False
+            while in_volo or not esauriti:
+                while not esauriti and len(in_volo) < max_chunk_in_volo:
+                    chunk = list(islice(piani, chunksize))
+                    if not chunk:
+                        esauriti = True
+                        break
+                    ids_chunk = [record.get('id') for record in chunk]
+                    try:
+                        in_volo[executor.submit(_genera_chunk, chunk)] = ids_chunk
+                    except Exception as e:
+                        # Pool non più utilizzabile: i piani rimanenti vengono riportati come falliti
+                        errore = f'{type(e).__name__}: {e}'
+                        for id_piano in ids_chunk:
+                            yield {'id': id_piano, 'file': None, 'secondi': 0.0, 'errore': errore}
+
+                if not in_volo:
+                    break
+
+                completati, _ = wait(in_volo, return_when=FIRST_COMPLETED)
+                for future in completati:
+                    ids_chunk = in_volo.pop(future)
+                    try:
+                        risultati = future.result()
+                    except Exception as e:
+                        # Worker terminato (es. BrokenProcessPool): tutti i piani del chunk falliscono
+                        errore = f'{type(e).__name__}: {e}'
+                        risultati = [(id_piano, None, errore, 0.0) for id_piano in ids_chunk]
+                    for id_piano, pdf, errore, secondi in risultati:
+                        file_pdf = None
+                        if pdf is not None:
+                            try:
+                                file_pdf = scrivi(id_piano, pdf)
+                            except OSError as e:
+                                errore = f'{type(e).__name__}: {e}'
+                        yield {'id': id_piano, 'file': file_pdf, 'secondi': secondi, 'errore': errore}
+    finally:
+        if archivio is not None:
+            archivio.close()
+
+
+def main(argv=None):
+    """Entry point da riga di comando."""
+    parser = argparse.ArgumentParser(description='Genera in batch i PDF dei piani finanziari.')
+    parser.add_argument('input', help='File dei piani (.jsonl o .csv)')
+    parser.add_argument('--output', required=True, help='Directory di output oppure file .zip')
+    parser.add_argument('--workers', type=int, default=None, help='Numero di processi (default: CPU)')
+    parser.add_argument('--chunksize', type=int, default=8, help='Piani per chunk (default: 8)')
+    parser.add_argument('--report', default=None, help='File JSONL con tempi ed errori per documento')
+    args = parser.parse_args(argv)
+
+    generati = falliti = 0
+    secondi_totali = 0.0
+    inizio = time.perf_counter()
+    report = open(args.report, 'w', encoding='utf-8') if args.report else None
+    try:
+        for esito in esporta_pdf_batch(leggi_piani(args.input), args.output,
+                                       max_workers=args.workers, chunksize=args.chunksize):
+            secondi_totali += esito['secondi']
+            if esito['errore']:
+                falliti += 1
+                print(f"[ERRORE] {esito['id']}: {esito['errore']}", file=sys.stderr)
+            else:
+                generati += 1
+            if report is not None:
+                report.write(json.dumps(esito, ensure_ascii=False) + '\n')
+    finally:
+        if report is not None:
+            report.close()
+
+    totale = generati + falliti
+    durata = time.perf_counter() - inizio
+    media = secondi_totali / totale if totale else 0.0
+    print(f"PDF generati: {generati}, falliti: {falliti}, "
+          f"tempo totale: {durata:.1f}s, medio per documento: {media * 1000:.0f}ms")
+    return 1 if falliti else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
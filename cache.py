@@ -0,0 +1,300 @@
+"""
+Cache Module
+Cache LRU in memoria con limite di dimensione, scadenza (TTL) e contatori hit/miss.
+Include una cache per contenuti binari (PDF) limitata in byte con spill opzionale su disco.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+
+class LRUCache:
+    """
+    Cache LRU thread-safe con scadenza opzionale delle voci.
+
+    Args:
+        maxsize (int): Numero massimo di voci conservate
+        ttl (float): Durata in secondi di ogni voce (None = nessuna scadenza)
+    """
+
+    def __init__(self, maxsize=128, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._voci = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.scadute = 0
+
+    def get(self, chiave, default=None):
+        """Restituisce il valore associato alla chiave (o default) aggiornandone l'uso."""
+        with self._lock:
+            voce = self._voci.get(chiave)
+            if voce is None:
+                self.misses += 1
+                return default
+
+            valore, scadenza = voce
+            if scadenza is not None and scadenza <= time.monotonic():
+                del self._voci[chiave]
+                self.scadute += 1
+                self.misses += 1
+                return default
+
+            self._voci.move_to_end(chiave)
+            self.hits += 1
+            return valore
+
+    def set(self, chiave, valore):
+        """Inserisce (o aggiorna) una voce, rimuovendo le meno usate oltre maxsize."""
+        scadenza = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._voci[chiave] = (valore, scadenza)
+            self._voci.move_to_end(chiave)
+            while len(self._voci) > self.maxsize:
+                self._voci.popitem(last=False)
+                self.evictions += 1
+
+    def svuota(self):
+        """Rimuove tutte le voci e azzera i contatori."""
+        with self._lock:
+            self._voci.clear()
+            self.hits = self.misses = self.evictions = self.scadute = 0
+
+    def statistiche(self):
+        """
+        Restituisce le metriche della cache.
+
+        Returns:
+            dict: {'hits', 'misses', 'evictions', 'scadute', 'voci', 'hit_rate'}
+        """
+        with self._lock:
+            richieste = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'scadute': self.scadute,
+                'voci': len(self._voci),
+                'hit_rate': self.hits / richieste if richieste else 0.0
+            }
+
+    def __len__(self):
+        return len(self._voci)
+
+
+class BytesCache:
+    """
+    Cache LRU thread-safe per contenuti binari, limitata dalla dimensione totale in byte.
+
+    Le voci rimosse dalla memoria vengono scritte (spill) nella directory indicata,
+    da cui vengono ricaricate al successivo accesso.
+
+    Args:
+        max_bytes (int): Byte massimi conservati in memoria
+        directory (str): Directory di spill su disco (None = solo memoria)
+        max_bytes_disco (int): Byte massimi conservati su disco
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, directory=None, max_bytes_disco=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_bytes_disco = max_bytes_disco
+        self._memoria = OrderedDict()
+        self._disco = OrderedDict()
+        self._bytes_memoria = 0
+        self._bytes_disco = 0
+        self._lock = threading.Lock()
+        self.hits_memoria = 0
+        self.hits_disco = 0
+        self.misses = 0
+        self.evictions = 0
+        self.spill = 0
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            # Recupera le voci già presenti su disco (dalla più vecchia alla più recente)
+            file_esistenti = sorted(
+                (os.path.join(directory, nome) for nome in os.listdir(directory) if nome.endswith('.bin')),
+                key=os.path.getmtime
+            )
+            for percorso in file_esistenti:
+                dimensione = os.path.getsize(percorso)
+                self._disco[os.path.basename(percorso)[:-4]] = dimensione
+                self._bytes_disco += dimensione
+
+    def _percorso(self, chiave):
+        return os.path.join(self.directory, chiave + '.bin')
+
+    def get(self, chiave):
+        """
+        Restituisce il contenuto associato alla chiave.
+
+        Returns:
+            bytes: Contenuto memorizzato, oppure None se assente
+        """
+        with self._lock:
+            dati = self._memoria.get(chiave)
+            if dati is not None:
+                self._memoria.move_to_end(chiave)
+                self.hits_memoria += 1
+                return dati
+
+            if chiave in self._disco:
+                try:
+                    with open(self._percorso(chiave), 'rb') as f:
+                        dati = f.read()
+                except OSError:
+                    self._bytes_disco -= self._disco.pop(chiave)
+                else:
+                    self._bytes_disco -= self._disco.pop(chiave)
+                    try:
+                        os.remove(self._percorso(chiave))
+                    except OSError:
+                        pass
+                    self.hits_disco += 1
+                    self._inserisci(chiave, dati)
+                    return dati
+
+            self.misses += 1
+            return None
+
+    def set(self, chiave, dati):
+        """Memorizza un contenuto binario."""
+        with self._lock:
+            if chiave in self._memoria:
+                self._bytes_memoria -= len(self._memoria.pop(chiave))
+            self._inserisci(chiave, bytes(dati))
+
+    def _inserisci(self, chiave, dati):
+        """Inserisce in memoria e rimuove le voci meno usate oltre max_bytes (lock già acquisito)."""
+        self._memoria[chiave] = dati
+        self._bytes_memoria += len(dati)
+        while self._bytes_memoria > self.max_bytes and len(self._memoria) > 1:
+            chiave_vecchia, dati_vecchi = self._memoria.popitem(last=False)
+            self._bytes_memoria -= len(dati_vecchi)
+            self.evictions += 1
+            if self.directory:
+                self._scrivi_su_disco(chiave_vecchia, dati_vecchi)
+
+    def _scrivi_su_disco(self, chiave, dati):
+        """Scrive una voce su disco in modo atomico, rispettando max_bytes_disco."""
+        if len(dati) > self.max_bytes_disco:
+            return
+        temporaneo = None
+        try:
+            fd, temporaneo = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(dati)
+            os.replace(temporaneo, self._percorso(chiave))
+        except OSError:
+            if temporaneo and os.path.exists(temporaneo):
+                os.remove(temporaneo)
+            return
+
+        if chiave in self._disco:
+            self._bytes_disco -= self._disco.pop(chiave)
+        self._disco[chiave] = len(dati)
+        self._bytes_disco += len(dati)
+        self.spill += 1
+        while self._bytes_disco > self.max_bytes_disco:
+            chiave_vecchia, dimensione = self._disco.popitem(last=False)
+            self._bytes_disco -= dimensione
+            try:
+                os.remove(self._percorso(chiave_vecchia))
+            except OSError:
+                pass
+
+    def svuota(self):
+        """Rimuove tutte le voci (memoria e disco) e azzera i contatori."""
+        with self._lock:
+            for chiave in self._disco:
+                try:
+                    os.remove(self._percorso(chiave))
+                except OSError:
+                    pass
+            self._memoria.clear()
+            self._disco.clear()
+            self._bytes_memoria = self._bytes_disco = 0
+            self.hits_memoria = self.hits_disco = self.misses = self.evictions = self.spill = 0
+
+    def statistiche(self):
+        """
+        Restituisce le metriche della cache.
+
+        Returns:
+            dict: Contatori di hit/miss, evictions, spill e occupazione in byte
+        """
+        with self._lock:
+            hits = self.hits_memoria + self.hits_disco
+            richieste = hits + self.misses
+            return {
+                'hits_memoria': self.hits_memoria,
+                'hits_disco': self.hits_disco,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'spill': self.spill,
+                'voci_memoria': len(self._memoria),
+                'voci_disco': len(self._disco),
+                'bytes_memoria': self._bytes_memoria,
+                'bytes_disco': self._bytes_disco,
+                'hit_rate': hits / richieste if richieste else 0.0
+            }
+
+
+def _normalizza(valore, decimali):
+    """Converte un valore in una forma canonica e hashabile (float arrotondati)."""
+    if isinstance(valore, bool) or valore is None or isinstance(valore, (int, str)):
+        return valore
+    if isinstance(valore, float):
+        return round(valore, decimali) + 0.0  # + 0.0 unifica -0.0 e 0.0
+    if isinstance(valore, dict):
+        return tuple(sorted((str(k), _normalizza(v, decimali)) for k, v in valore.items()))
+    if isinstance(valore, (list, tuple)):
+        return tuple(_normalizza(v, decimali) for v in valore)
+    return repr(valore)
+
+
+def chiave_canonica(*args, decimali=2, **kwargs):
+    """
+    Calcola una chiave di cache stabile a partire dagli argomenti.
+
+    I float vengono arrotondati a `decimali` cifre, i dizionari ordinati per chiave;
+    il tipo dei numeri resta distinto (5 e 5.0 producono chiavi diverse).
+
+    Returns:
+        str: Digest SHA-256 esadecimale
+    """
+    forma = (_normalizza(args, decimali), _normalizza(kwargs, decimali))
+    return hashlib.sha256(repr(forma).encode('utf-8')).hexdigest()
+
+
+def memoizza(cache, prefisso='', decimali=2):
+    """
+    Decoratore che memorizza il risultato di una funzione pura nella cache data.
+
+    Args:
+        cache (LRUCache): Cache da usare
+        prefisso (str): Prefisso della chiave (per condividere una cache tra funzioni)
+        decimali (int): Cifre decimali a cui arrotondare i float negli argomenti
+    """
+    def decoratore(funzione):
+        @wraps(funzione)
+        def wrapper(*args, **kwargs):
+            chiave = prefisso + chiave_canonica(*args, decimali=decimali, **kwargs)
+            mancante = object()
+            risultato = cache.get(chiave, mancante)
+            if risultato is mancante:
+                risultato = funzione(*args, **kwargs)
+                cache.set(chiave, risultato)
+            return risultato
+
+        wrapper.cache = cache
+        return wrapper
+    return decoratore
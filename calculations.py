@@ -5,6 +5,12 @@ Contiene tutte le funzioni pure per i calcoli finanziari
 
 import math
 
+import numpy as np
+
+from market_assumptions import ASSET
+from pac_solver import calcola_pac_batch
+
+
 def calcola_fondo_emergenza(uscite_mensili):
     """
     Calcola il fondo di emergenza target (6 mesi di spese).
@@ -50,21 +56,59 @@ def calcola_mesi_rientro_emergenza(deficit, risparmio_mensile):
     return math.ceil(abs(deficit) / risparmio_mensile)
 
 
-def calcola_pac_mensile(costo_obiettivo, anni_obiettivo):
+def calcola_pac_mensile(costo_obiettivo, anni_obiettivo, rendimento_annuo=0.0, inflazione=0.0):
     """
     Calcola il Piano di Accumulo Mensile per un obiettivo.
     
+    Il costo (in euro di oggi) viene rivalutato con l'inflazione fino alla scadenza e
+    i versamenti crescono al rendimento indicato (formula della rendita, vedi pac_solver).
+    Con rendimento e inflazione nulli il PAC è semplicemente costo / mesi.
+    
     Args:
         costo_obiettivo (float): Costo totale dell'obiettivo
         anni_obiettivo (int): Anni disponibili per raggiungere l'obiettivo
+        rendimento_annuo (float): Rendimento annuo netto atteso (es. 0.03)
+        inflazione (float): Inflazione annua del costo (es. 0.02)
         
     Returns:
         float: Importo mensile da accantonare
     """
     if anni_obiettivo <= 0:
         return 0
-    mesi = anni_obiettivo * 12
-    return costo_obiettivo / mesi
+    return float(calcola_pac_batch(costo_obiettivo, anni_obiettivo, rendimento_annuo, inflazione))
+
+
+def parametri_obiettivi(obiettivi):
+    """
+    Converte una lista di obiettivi in array per i calcoli vettoriali.
+    
+    Rendimento e inflazione sono opzionali e indicati in percentuale
+    (es. {'nome': 'Casa', 'costo': 30000, 'anni': 5, 'rendimento': 3, 'inflazione': 2}).
+    
+    Args:
+        obiettivi (list): Lista di dizionari con obiettivi
+        
+    Returns:
+        tuple: (costi, anni, rendimenti, inflazione) come np.ndarray (frazioni annue)
+    """
+    costi = np.array([obiettivo['costo'] for obiettivo in obiettivi], dtype=float)
+    anni = np.array([obiettivo['anni'] for obiettivo in obiettivi], dtype=float)
+    rendimenti = np.array([obiettivo.get('rendimento', 0) for obiettivo in obiettivi], dtype=float) / 100
+    inflazione = np.array([obiettivo.get('inflazione', 0) for obiettivo in obiettivi], dtype=float) / 100
+    return costi, anni, rendimenti, inflazione
+
+
+def calcola_pac_obiettivi(obiettivi):
+    """
+    Calcola il PAC mensile di ogni obiettivo con una sola chiamata vettoriale.
+    
+    Args:
+        obiettivi (list): Lista di dizionari con obiettivi
+        
+    Returns:
+        np.ndarray: PAC mensile per obiettivo, nello stesso ordine
+    """
+    return calcola_pac_batch(*parametri_obiettivi(obiettivi))
 
 
 def calcola_pac_totale(obiettivi):
@@ -77,14 +121,10 @@ def calcola_pac_totale(obiettivi):
     Returns:
         float: PAC mensile totale
     """
-    pac_totale = 0
-    for obiettivo in obiettivi:
-        pac_mensile = calcola_pac_mensile(
-            obiettivo['costo'], 
-            obiettivo['anni']
-        )
-        pac_totale += pac_mensile
-    return pac_totale
+    if not obiettivi:
+        return 0
+    # Somma cumulativa: stesso ordine (e stesso risultato) della somma sequenziale
+    return float(np.cumsum(calcola_pac_obiettivi(obiettivi))[-1])
 
 
 def alloca_capitale_eccedente(capitale_eccedente, gap_obiettivi_mensile, anni_media_obiettivi):
@@ -93,6 +133,9 @@ def alloca_capitale_eccedente(capitale_eccedente, gap_obiettivi_mensile, anni_me
     1. Copertura gap obiettivi (se presente)
     2. Investimento immediato
     
+    Stima rapida con la scadenza media degli obiettivi; i report usano
+    timeline.alloca_capitale_obiettivi, che segue le scadenze reali.
+    
     Args:
         capitale_eccedente (float): Capitale oltre il fondo emergenza
         gap_obiettivi_mensile (float): Deficit mensile per obiettivi (se negativo)
@@ -144,54 +187,129 @@ def calcola_disponibilita_investimenti(entrate_mensili, uscite_mensili, pac_tota
     return entrate_mensili - uscite_mensili - pac_totale
 
 
+# Codici compatti dei profili di rischio (tutte le varianti linguistiche)
+CODICI_PROFILO = {
+    "Conservatore": 0,
+    "Conservative": 0,
+    "Konservativ": 0,
+    "Moderato": 1,
+    "Moderate": 1,
+    "Moderat": 1,
+    "Aggressivo": 2,
+    "Aggressive": 2,
+    "Aggressiv": 2
+}
+
+# Codice usato per profili sconosciuti (Moderato)
+CODICE_PROFILO_DEFAULT = 1
+
+# Orizzonte massimo della tabella: oltre i 20 anni l'allocazione non cambia più
+ANNI_MASSIMI_TABELLA = 50
+
+# Soglie della regola per orizzonte: più azioni oltre SOGLIA_ANNI_LUNGO, meno sotto SOGLIA_ANNI_CORTO
+SOGLIA_ANNI_LUNGO = 20
+SOGLIA_ANNI_CORTO = 10
+
+# Allocazioni base per profilo, nell'ordine di ASSET (Azioni, Obbligazioni, Oro)
+_ALLOCAZIONI_BASE = (
+    (30, 60, 10),
+    (50, 40, 10),
+    (70, 20, 10)
+)
+
+
+def _allocazione_per_regola(codice_profilo, anni_pensione):
+    """Applica le regole di aggiustamento per orizzonte all'allocazione base del profilo."""
+    azioni, obbligazioni, oro = _ALLOCAZIONI_BASE[codice_profilo]
+    
+    # Aggiustamento per orizzonte temporale lungo (>20 anni)
+    if anni_pensione > SOGLIA_ANNI_LUNGO:
+        bonus_azioni = 10
+        azioni += bonus_azioni
+        obbligazioni -= bonus_azioni
+    
+    # Aggiustamento per orizzonte temporale corto (<10 anni)
+    elif anni_pensione < SOGLIA_ANNI_CORTO:
+        riduzione_azioni = 10
+        azioni = max(20, azioni - riduzione_azioni)
+        obbligazioni += riduzione_azioni
+    
+    return azioni, obbligazioni, oro
+
+
+def _costruisci_tabella_allocazioni():
+    """Precalcola l'allocazione per ogni profilo e orizzonte (0..ANNI_MASSIMI_TABELLA anni)."""
+    tabella = np.array([
+        [_allocazione_per_regola(codice, anni) for anni in range(ANNI_MASSIMI_TABELLA + 1)]
+        for codice in range(len(_ALLOCAZIONI_BASE))
+    ], dtype=np.int64)
+    tabella.setflags(write=False)
+    return tabella
+
+
+# Tabella (profilo, anni, asset) in percentuale, in sola lettura
+TABELLA_ALLOCAZIONI = _costruisci_tabella_allocazioni()
+
+# Stessa tabella come tuple Python, per l'accesso scalare senza conversioni NumPy
+_RIGHE_ALLOCAZIONI = tuple(tuple(map(tuple, righe)) for righe in TABELLA_ALLOCAZIONI.tolist())
+
+
+def codice_profilo(profilo_rischio):
+    """
+    Converte un profilo di rischio (in qualsiasi lingua) nel suo codice intero.
+    
+    Args:
+        profilo_rischio (str): "Conservatore", "Moderate", "Aggressiv", ...
+        
+    Returns:
+        int: 0 (Conservativo), 1 (Moderato), 2 (Aggressivo); Moderato se sconosciuto
+    """
+    return CODICI_PROFILO.get(profilo_rischio, CODICE_PROFILO_DEFAULT)
+
+
+def allocazioni_da_tabella(codici_profilo, anni_pensione):
+    """
+    Allocazioni di molti profili/orizzonti con un solo accesso indicizzato alla tabella.
+    
+    Args:
+        codici_profilo (array): Codici profilo (vedi CODICI_PROFILO)
+        anni_pensione (array): Anni alla pensione (anche frazionari; oltre la tabella si usa l'ultimo anno)
+        
+    Returns:
+        np.ndarray: Allocazioni in percentuale, shape (..., 3) nell'ordine di ASSET
+    """
+    anni = np.asarray(anni_pensione, dtype=float)
+    riga = np.clip(anni, 0, ANNI_MASSIMI_TABELLA)
+    
+    # Orizzonti frazionari: riga della tabella con lo stesso esito della regola (come lo scalare)
+    frazionari = riga != np.floor(riga)
+    riga_regola = np.where(
+        anni > SOGLIA_ANNI_LUNGO, SOGLIA_ANNI_LUNGO + 1,
+        np.where(anni < SOGLIA_ANNI_CORTO, SOGLIA_ANNI_CORTO - 1, SOGLIA_ANNI_CORTO)
+    )
+    riga = np.where(frazionari, riga_regola, riga).astype(np.int64)
+    return TABELLA_ALLOCAZIONI[np.asarray(codici_profilo, dtype=np.int64), riga]
+
+
 def genera_allocazione_investimenti(profilo_rischio, anni_pensione):
     """
     Genera un'allocazione di portafoglio basata sul profilo di rischio e orizzonte temporale.
     
     Args:
         profilo_rischio (str): "Conservatore", "Moderato", "Aggressivo" (o versioni inglesi/tedesche)
-        anni_pensione (int): Anni alla pensione
+        anni_pensione (float): Anni alla pensione (anche frazionari)
         
     Returns:
         dict: Allocazione percentuale per classe di attivo
     """
-    # Traduci profili in inglese se necessario
-    profile_map = {
-        "Conservatore": "Conservative",
-        "Conservative": "Conservative",
-        "Konservativ": "Conservative",
-        "Moderato": "Moderate",
-        "Moderate": "Moderate",
-        "Moderat": "Moderate",
-        "Aggressivo": "Aggressive",
-        "Aggressive": "Aggressive",
-        "Aggressiv": "Aggressive"
-    }
-    
-    profilo_norm = profile_map.get(profilo_rischio, "Moderate")
-    
-    # Allocazioni base per profilo
-    allocazioni_base = {
-        "Conservative": {"Azioni": 30, "Obbligazioni": 60, "Oro": 10},
-        "Moderate": {"Azioni": 50, "Obbligazioni": 40, "Oro": 10},
-        "Aggressive": {"Azioni": 70, "Obbligazioni": 20, "Oro": 10}
-    }
-    
-    allocazione = allocazioni_base.get(profilo_norm, allocazioni_base["Moderate"]).copy()
+    codice = codice_profilo(profilo_rischio)
     
-    # Aggiustamento per orizzonte temporale lungo (>20 anni)
-    if anni_pensione > 20:
-        bonus_azioni = 10
-        allocazione["Azioni"] += bonus_azioni
-        allocazione["Obbligazioni"] -= bonus_azioni
-    
-    # Aggiustamento per orizzonte temporale corto (<10 anni)
-    elif anni_pensione < 10:
-        riduzione_azioni = 10
-        allocazione["Azioni"] = max(20, allocazione["Azioni"] - riduzione_azioni)
-        allocazione["Obbligazioni"] += riduzione_azioni
+    # Orizzonti frazionari: le soglie della regola non coincidono con le righe della tabella
+    if anni_pensione != int(anni_pensione):
+        return dict(zip(ASSET, _allocazione_per_regola(codice, anni_pensione)))
     
-    return allocazione
+    anni = min(max(int(anni_pensione), 0), ANNI_MASSIMI_TABELLA)
+    return dict(zip(ASSET, _RIGHE_ALLOCAZIONI[codice][anni]))
 
 
 def formatta_valuta(importo):
@@ -205,3 +323,18 @@ def formatta_valuta(importo):
         str: Importo formattato
     """
     return f"€{importo:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def formatta_valuta_intera(importo, lang='it'):
+    """
+    Formatta un importo in euro senza decimali, con il separatore delle migliaia della lingua.
+    
+    Args:
+        importo (float): Importo da formattare
+        lang (str): Lingua ('it', 'en', 'de')
+        
+    Returns:
+        str: Importo formattato (es. €71.965 in italiano, €71,965 in inglese)
+    """
+    testo = f"€{importo:,.0f}"
+    return testo if lang == 'en' else testo.replace(",", ".")
@@ -0,0 +1,185 @@
+"""
+Decumulation Module
+Simulazione Monte Carlo della fase di prelievo dopo la pensione: dal capitale accumulato si
+preleva ogni mese secondo una regola (importo fisso rivalutato, percentuale del capitale,
+guardrail) e si misura quanto spesso il capitale dura per tutto il periodo. Il rischio di
+sequenza dei rendimenti (anni negativi all'inizio dei prelievi) è incluso nei percorsi.
+
+I valori sono in euro di oggi (rendimenti reali con INFLAZIONE_ATTESA). Tutti i calcoli sono
+vettorizzati su utenti (N) e percorsi (P): lo stato della simulazione ha shape (N, P).
+"""
+
+import numpy as np
+
+from market_assumptions import INFLAZIONE_ATTESA, parametri_lognormali_mensili, parametri_portafoglio
+from monte_carlo import crea_generatore
+
+
+# Regole di prelievo supportate
+STRATEGIE = ('fissa', 'percentuale', 'guardrail')
+
+# Parametri predefiniti
+ANNI_DECUMULO = 30
+TASSO_PRELIEVO = 0.04
+FIDUCIA = 0.90
+BANDA_GUARDRAIL = 0.20
+AGGIUSTAMENTO_GUARDRAIL = 0.10
+
+
+def _parametri_utenti(allocazione, ter, inflazione):
+    """Parametri lognormali mensili per utente, shape (N, 1) ciascuno."""
+    allocazioni = [allocazione] if isinstance(allocazione, dict) else list(allocazione)
+    parametri = np.array([
+        parametri_lognormali_mensili(*parametri_portafoglio(allocazione_utente), ter=ter, inflazione=inflazione)
+        for allocazione_utente in allocazioni
+    ])
+    return parametri[:, 0:1], parametri[:, 1:2]
+
+
+def simula_decumulo(capitale, allocazione, anni=ANNI_DECUMULO, tasso_prelievo=TASSO_PRELIEVO,
+                    strategia='fissa', n_percorsi=10000, seed=None, rng=None, ter=0.0,
+                    inflazione=INFLAZIONE_ATTESA, fiducia=FIDUCIA, banda=BANDA_GUARDRAIL,
+                    aggiustamento=AGGIUSTAMENTO_GUARDRAIL):
+    """
+    Simula i prelievi dal capitale alla pensione per N utenti e P percorsi.
+
+    Il prelievo avviene a inizio mese e viene ricalcolato a inizio di ogni anno:
+    - 'fissa': tasso_prelievo × capitale iniziale, costante in euro di oggi;
+    - 'percentuale': tasso_prelievo × capitale di inizio anno (non si esaurisce mai, ma varia);
+    - 'guardrail': come 'fissa', ma se il tasso attuale esce di ±banda dal tasso iniziale il
+      prelievo viene ridotto o aumentato di `aggiustamento`.
+
+    Il tasso sostenibile è il prelievo fisso massimo che dura `anni` anni nella quota
+    `fiducia` dei percorsi: per ogni percorso vale 12 / Σ 1 / crescita[k] (crescita
+    cumulata prima del prelievo k), indipendentemente dalla strategia simulata.
+
+    Args:
+        capitale (float | array): Capitale alla pensione, shape (N,) oppure (N, P) per percorso
+        allocazione (dict | list): Allocazione percentuale, oppure una per utente
+        anni (int): Durata dei prelievi
+        tasso_prelievo (float | array): Prelievo annuo iniziale sul capitale, shape (N,)
+        strategia (str): 'fissa', 'percentuale' o 'guardrail'
+        n_percorsi (int): Percorsi simulati (ignorato se capitale ha shape (N, P))
+        seed (int): Seed per la riproducibilità (ignorato se rng è fornito)
+        rng (np.random.Generator): Generatore da usare
+        ter (float): Costi annui del portafoglio
+        inflazione (float): Inflazione annua (0 = valori nominali)
+        fiducia (float): Quota di percorsi per tasso sostenibile e prelievo minimo
+        banda (float): Ampiezza relativa dei guardrail
+        aggiustamento (float): Variazione del prelievo quando si tocca un guardrail
+
+    Returns:
+        dict: Array di shape (N,): {
+            'probabilita_successo': quota di percorsi in cui ogni prelievo è pagato per intero,
+            'tasso_sostenibile': prelievo fisso annuo sostenibile (quota del capitale iniziale),
+            'prelievo_iniziale': prelievo mensile del primo anno (mediana sui percorsi),
+            'prelievo_mediano': prelievo mensile medio del periodo (mediana sui percorsi),
+            'prelievo_minimo': prelievo mensile più basso nello scenario sfavorevole (quantile 1 - fiducia),
+            'capitale_finale': capitale residuo (mediana sui percorsi)
+        }
+    """
+    if strategia not in STRATEGIE:
+        raise ValueError(f"Strategia di prelievo sconosciuta: {strategia}")
+    if rng is None:
+        rng = crea_generatore(seed)
+
+    media_log, sigma_log = _parametri_utenti(allocazione, ter, inflazione)
+    capitale = np.asarray(capitale, dtype=float)
+    if capitale.ndim == 2:
+        n_percorsi = capitale.shape[1]
+    else:
+        capitale = np.atleast_1d(capitale)[:, np.newaxis]
+    tasso = np.atleast_1d(np.asarray(tasso_prelievo, dtype=float))[:, np.newaxis]
+
+    n_utenti = max(media_log.shape[0], capitale.shape[0], tasso.shape[0])
+    forma = (n_utenti, n_percorsi)
+    media_log, sigma_log, tasso = (np.broadcast_to(valore, (n_utenti, 1)) for valore in (media_log, sigma_log, tasso))
+
+    patrimonio = np.broadcast_to(capitale, forma).copy()
+    prelievo = patrimonio * tasso / 12
+    prelievo_iniziale = prelievo.copy()
+    pagato = np.empty(forma)
+    somma_prelievi = np.zeros(forma)
+    prelievo_minimo = np.full(forma, np.inf)
+    sconto = np.ones(forma)
+    somma_sconti = np.zeros(forma)
+
+    for anno in range(int(anni)):
+        if anno > 0 and strategia == 'percentuale':
+            prelievo = patrimonio * tasso / 12
+        elif anno > 0 and strategia == 'guardrail':
+            tasso_attuale = np.divide(prelievo * 12, patrimonio, out=np.full(forma, np.inf), where=patrimonio > 0)
+            prelievo = prelievo * np.where(
+                tasso_attuale > tasso * (1 + banda), 1 - aggiustamento,
+                np.where(tasso_attuale < tasso * (1 - banda), 1 + aggiustamento, 1.0)
+            )
+
+        # Fattori di crescita dell'anno, un blocco di numeri casuali per anno
+        fattori = rng.standard_normal((12,) + forma)
+        fattori *= sigma_log
+        fattori += media_log
+        np.exp(fattori, out=fattori)
+
+        # Operazioni in place: nessuna allocazione dentro il ciclo sui mesi
+        for fattore in fattori:
+            np.minimum(prelievo, patrimonio, out=pagato)
+            patrimonio -= pagato
+            somma_prelievi += pagato
+            np.minimum(prelievo_minimo, pagato, out=prelievo_minimo)
+
+            somma_sconti += sconto
+            sconto /= fattore
+            patrimonio *= fattore
+
+    # Un capitale esaurito resta a zero: il piano fallisce se a fine periodo è nullo con prelievi dovuti
+    fallito = (patrimonio <= 0) & (prelievo > 0)
+    mesi = max(int(anni) * 12, 1)
+    quantile_basso = (1 - fiducia) * 100
+    return {
+        'probabilita_successo': 1 - fallito.mean(axis=1),
+        'tasso_sostenibile': np.percentile(12 / np.maximum(somma_sconti, 1e-12), quantile_basso, axis=1),
+        'prelievo_iniziale': np.median(prelievo_iniziale, axis=1),
+        'prelievo_mediano': np.median(somma_prelievi / mesi, axis=1),
+        'prelievo_minimo': np.percentile(np.where(np.isinf(prelievo_minimo), 0.0, prelievo_minimo), quantile_basso, axis=1),
+        'capitale_finale': np.median(patrimonio, axis=1)
+    }
+
+
+def analisi_decumulo(capitale, allocazione, **parametri):
+    """
+    Decumulo di un singolo utente (capitale unico o un valore per percorso).
+
+    Args:
+        capitale (float | array): Capitale alla pensione, oppure shape (P,) per percorso
+            (es. i percorsi finali di monte_carlo.simula_patrimonio)
+        allocazione (dict): Allocazione percentuale alla pensione
+        **parametri: Vedi simula_decumulo
+
+    Returns:
+        dict: Stesse chiavi di simula_decumulo, come float
+    """
+    capitale = np.asarray(capitale, dtype=float)
+    if capitale.ndim == 1:
+        capitale = capitale[np.newaxis, :]
+    risultato = simula_decumulo(capitale, allocazione, **parametri)
+    return {chiave: float(valore[0]) for chiave, valore in risultato.items()}
+
+
+def confronta_strategie(capitale, allocazione, strategie=STRATEGIE, seed=None, **parametri):
+    """
+    Confronta le regole di prelievo sugli stessi percorsi di rendimento (stesso seed).
+
+    Args:
+        capitale (float | array): Capitale alla pensione
+        allocazione (dict): Allocazione percentuale alla pensione
+        strategie (iterable): Regole da confrontare
+        seed (int): Seed comune a tutte le regole
+        **parametri: Vedi simula_decumulo
+
+    Returns:
+        dict: {strategia: risultato di analisi_decumulo}
+    """
+    return {
+        strategia: analisi_decumulo(capitale, allocazione, strategia=strategia, seed=seed, **parametri)
+        for strategia in strategie
+    }
@@ -0,0 +1,93 @@
+"""
+Fee Drag Module
+Impatto dei costi (TER) sul capitale finale: valore finale, costi pagati in euro e perdita
+percentuale rispetto allo stesso piano senza costi, per una griglia TER × orizzonti × piani
+di versamento calcolata in un'unica chiamata vettoriale (formule chiuse di projections).
+Le griglie usate dai report sono memorizzate (lru_cache) perché si ripetono tra le richieste.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from projections import tasso_mensile, valore_finale
+
+
+# TER mostrati nella tabella dei costi del report
+TER_REPORT = (0.002, 0.005, 0.01, 0.015, 0.02)
+
+
+def impatto_costi(ter, anni, contributo_mensile, capitale_iniziale, rendimento_annuo):
+    """
+    Impatto dei costi per ogni combinazione degli input (broadcasting NumPy).
+
+    Per una griglia completa si passano assi diversi, es. ter di shape (T, 1, 1),
+    anni di shape (1, H, 1) e contributi/capitali di shape (1, 1, P).
+    Ogni mese il TER sottrae (fattore lordo - fattore netto) × saldo investito: la somma
+    dei saldi investiti si ricava in forma chiusa dagli interessi maturati.
+
+    Args:
+        ter (array): Costi annui (es. 0.002 per 0.20%)
+        anni (array): Durata in anni
+        contributo_mensile (array): Importo versato a inizio mese
+        capitale_iniziale (array): Capitale investito subito
+        rendimento_annuo (array): Rendimento lordo annuo
+
+    Returns:
+        dict: Array della shape risultante: {
+            'valore_finale': capitale finale al netto dei costi,
+            'valore_senza_costi': capitale finale con TER nullo,
+            'costi_pagati': somma dei costi addebitati nel periodo,
+            'differenza': valore_senza_costi - valore_finale (costi + rendimento perso su di essi),
+            'perdita_percentuale': differenza / valore_senza_costi
+        }
+    """
+    ter, anni, contributo, capitale, rendimento = np.broadcast_arrays(
+        *(np.asarray(valore, dtype=float) for valore in (ter, anni, contributo_mensile, capitale_iniziale, rendimento_annuo))
+    )
+    finale = np.asarray(valore_finale(contributo, capitale, anni, rendimento, ter=ter))
+    senza_costi = np.asarray(valore_finale(contributo, capitale, anni, rendimento))
+
+    # Somma dei saldi investiti a inizio mese: interessi / tasso (con tasso nullo, progressione aritmetica)
+    i = np.asarray(tasso_mensile(rendimento, ter))
+    mesi = anni * 12
+    interessi = finale - capitale - contributo * mesi
+    nullo = np.abs(i) < 1e-12
+    somma_saldi = np.where(
+        nullo, capitale * mesi + contributo * mesi * (mesi + 1) / 2, interessi / np.where(nullo, 1.0, i)
+    )
+    costi_pagati = (np.asarray(tasso_mensile(rendimento)) - i) * somma_saldi
+
+    differenza = senza_costi - finale
+    return {
+        'valore_finale': finale,
+        'valore_senza_costi': senza_costi,
+        'costi_pagati': costi_pagati,
+        'differenza': differenza,
+        'perdita_percentuale': np.divide(differenza, senza_costi, out=np.zeros_like(differenza), where=senza_costi > 0)
+    }
+
+
+@lru_cache(maxsize=256)
+def griglia_costi(ter, anni, piani, rendimento_annuo):
+    """
+    Impatto dei costi su una griglia TER × orizzonti × piani, memorizzato per griglia.
+
+    Args:
+        ter (tuple): TER annui, T valori
+        anni (tuple): Orizzonti in anni, H valori
+        piani (tuple): Piani di versamento (contributo_mensile, capitale_iniziale), P coppie
+        rendimento_annuo (float): Rendimento lordo annuo
+
+    Returns:
+        dict: Come impatto_costi, array di sola lettura di shape (T, H, P)
+    """
+    piani = np.asarray(piani, dtype=float).reshape(-1, 2)
+    risultato = impatto_costi(
+        np.asarray(ter, dtype=float)[:, np.newaxis, np.newaxis],
+        np.asarray(anni, dtype=float)[np.newaxis, :, np.newaxis],
+        piani[:, 0], piani[:, 1], rendimento_annuo
+    )
+    for valore in risultato.values():
+        valore.flags.writeable = False
+    return risultato
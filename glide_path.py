@@ -0,0 +1,131 @@
+"""
+Glide Path Module
+Percorso di discesa dell'allocazione verso la pensione: anno per anno la quota azionaria
+scende dall'allocazione attuale (tabella di calculations) a quella finale del profilo,
+spostando la differenza sulle obbligazioni. Calcolato come matrice NumPy per molti utenti
+e usato dalle proiezioni (projections) e dalla simulazione Monte Carlo (monte_carlo).
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from calculations import allocazioni_da_tabella, codice_profilo
+from market_assumptions import ASSET, RENDIMENTI_ATTESI
+
+
+# Curva di un profilo: quota azionaria alla pensione e anni prima della pensione in cui inizia la discesa
+CurvaGlidePath = namedtuple('CurvaGlidePath', ['azioni_finali', 'anni_discesa'])
+
+# Curve per codice profilo (0 Conservativo, 1 Moderato, 2 Aggressivo)
+CURVE_GLIDE_PATH = {
+    0: CurvaGlidePath(azioni_finali=20, anni_discesa=15),
+    1: CurvaGlidePath(azioni_finali=30, anni_discesa=20),
+    2: CurvaGlidePath(azioni_finali=40, anni_discesa=25)
+}
+
+
+def _parametri_curve(codici_profilo, curve):
+    """Estrae quota azionaria finale e anni di discesa di ogni utente come array."""
+    codici = np.asarray(codici_profilo, dtype=np.int64)
+    azioni_finali = np.array([curve[codice].azioni_finali for codice in range(len(curve))], dtype=float)
+    anni_discesa = np.array([curve[codice].anni_discesa for codice in range(len(curve))], dtype=float)
+    return azioni_finali[codici], anni_discesa[codici]
+
+
+def matrice_glide_path(codici_profilo, anni_pensione, anni=None, curve=CURVE_GLIDE_PATH):
+    """
+    Allocazione anno per anno di N utenti, calcolata in un'unica operazione vettoriale.
+
+    L'anno 0 coincide con l'allocazione attuale (genera_allocazione_investimenti); negli
+    ultimi anni_discesa anni la quota azionaria scende linearmente fino a quella finale
+    (mai sopra quella attuale). L'oro resta costante, le obbligazioni completano il 100%.
+    Dopo la pensione l'allocazione resta quella finale.
+
+    Args:
+        codici_profilo (array): Codici profilo (vedi CODICI_PROFILO), shape (N,)
+        anni_pensione (array): Anni alla pensione, shape (N,) (anche frazionari)
+        anni (int): Anni da calcolare (None = il massimo di anni_pensione, arrotondato per eccesso)
+        curve (dict): Curve per codice profilo (vedi CURVE_GLIDE_PATH)
+
+    Returns:
+        np.ndarray: Allocazioni in percentuale, shape (N, anni + 1, 3) nell'ordine di ASSET
+    """
+    codici = np.atleast_1d(np.asarray(codici_profilo, dtype=np.int64))
+    anni_pensione = np.atleast_1d(np.asarray(anni_pensione, dtype=float))
+    if anni is None:
+        anni = int(np.ceil(anni_pensione.max(initial=0)))
+
+    attuale = allocazioni_da_tabella(codici, anni_pensione).astype(float)
+    azioni_finali, anni_discesa = _parametri_curve(codici, curve)
+    azioni_finali = np.minimum(azioni_finali, attuale[:, 0])
+
+    # Anni mancanti alla pensione per ogni anno del piano, shape (N, anni + 1)
+    mancanti = anni_pensione[:, np.newaxis] - np.arange(anni + 1)
+    durata = np.minimum(anni_pensione, anni_discesa)[:, np.newaxis]
+    frazione = np.clip(mancanti / np.where(durata > 0, durata, 1.0), 0.0, 1.0)
+
+    azioni = np.rint(azioni_finali[:, np.newaxis] + (attuale[:, 0:1] - azioni_finali[:, np.newaxis]) * frazione)
+    oro = np.broadcast_to(attuale[:, 2:3], azioni.shape)
+    obbligazioni = 100 - azioni - oro
+    return np.stack([azioni, obbligazioni, oro], axis=-1)
+
+
+def glide_path(profilo_rischio, anni_pensione, curve=CURVE_GLIDE_PATH):
+    """
+    Allocazione anno per anno di un singolo utente.
+
+    Args:
+        profilo_rischio (str): Profilo di rischio (qualsiasi lingua)
+        anni_pensione (float): Anni alla pensione (anche frazionari)
+        curve (dict): Curve per codice profilo
+
+    Returns:
+        np.ndarray: Allocazioni in percentuale, shape (ceil(anni_pensione) + 1, 3); l'ultima riga è quella alla pensione
+    """
+    return matrice_glide_path([codice_profilo(profilo_rischio)], [anni_pensione], curve=curve)[0]
+
+
+def rendimenti_glide_path(matrice):
+    """
+    Rendimento atteso lordo di ogni anno del glide path.
+
+    Args:
+        matrice (np.ndarray): Allocazioni in percentuale, shape (..., anni + 1, 3)
+
+    Returns:
+        np.ndarray: Rendimento annuo atteso, shape (..., anni + 1)
+    """
+    rendimenti = np.array([RENDIMENTI_ATTESI[asset] for asset in ASSET])
+    return matrice @ rendimenti / 100
+
+
+def rendimenti_mensili_glide_path(matrice, anni):
+    """
+    Rendimento annuo atteso da applicare a ogni mese dei primi `anni` anni.
+
+    Il risultato ha come ultima dimensione i mesi, come richiesto da projections.serie_mensile
+    con per_mese=True.
+
+    Args:
+        matrice (np.ndarray): Allocazioni in percentuale, shape (..., A + 1, 3) con A >= anni
+        anni (int): Anni di accumulo
+
+    Returns:
+        np.ndarray: Rendimento annuo di ogni mese, shape (..., anni * 12)
+    """
+    return np.repeat(rendimenti_glide_path(matrice)[..., :anni], 12, axis=-1)
+
+
+def allocazioni_annue(matrice, anni):
+    """
+    Allocazioni come lista di dizionari, una per anno (anni 0..anni - 1), per monte_carlo.
+
+    Args:
+        matrice (np.ndarray): Allocazioni di un utente, shape (A + 1, 3)
+        anni (float): Numero di anni (arrotondato per eccesso se frazionario)
+
+    Returns:
+        list: [{'Azioni': .., 'Obbligazioni': .., 'Oro': ..}, ...]
+    """
+    return [dict(zip(ASSET, riga)) for riga in matrice[:int(np.ceil(anni))].tolist()]
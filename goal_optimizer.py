@@ -0,0 +1,163 @@
+"""
+Goal Optimizer Module
+Piano consigliato quando i PAC degli obiettivi superano il risparmio disponibile (gap
+negativo della FASE 2): in base a priorità e flessibilità di ogni obiettivo sceglie quali
+scadenze rinviare e quali costi ridurre per rientrare nel risparmio mensile.
+
+Ogni obiettivo può indicare (chiavi opzionali):
+- 'priorita': 1 alta, 2 media, 3 bassa (PRIORITA_PREDEFINITA se assente);
+- 'rinvio_massimo': anni di cui la scadenza può slittare;
+- 'riduzione_massima': riduzione massima del costo, in percentuale.
+
+Algoritmo greedy in O(n log n): gli obiettivi sono ordinati per priorità (prima i meno
+importanti) e, a parità, per risparmio ottenibile; per ciascuno si applica prima il rinvio
+(l'obiettivo resta intatto) e poi la riduzione del costo, fino a coprire il deficit. Tutti i
+PAC sono calcolati in blocco con pac_solver; solo l'ultima leva viene applicata in parte.
+"""
+
+import math
+
+import numpy as np
+
+from calculations import parametri_obiettivi
+from pac_solver import anni_minimi, calcola_pac_batch
+
+
+# Priorità degli obiettivi (1 = alta, 3 = bassa)
+PRIORITA = (1, 2, 3)
+PRIORITA_PREDEFINITA = 2
+
+# Tolleranza in euro sul deficit mensile
+_TOLLERANZA = 1e-6
+
+
+def parametri_flessibilita(obiettivi):
+    """
+    Converte priorità e flessibilità degli obiettivi in array.
+
+    Args:
+        obiettivi (list): Lista di dizionari con obiettivi
+
+    Returns:
+        tuple: (priorita, rinvio_massimo in anni, riduzione_massima come frazione) come np.ndarray
+    """
+    priorita = np.array([obiettivo.get('priorita', PRIORITA_PREDEFINITA) for obiettivo in obiettivi], dtype=np.int64)
+    rinvio = np.array([obiettivo.get('rinvio_massimo', 0) for obiettivo in obiettivi], dtype=float)
+    riduzione = np.array([obiettivo.get('riduzione_massima', 0) for obiettivo in obiettivi], dtype=float) / 100
+    return priorita, np.maximum(rinvio, 0.0), np.clip(riduzione, 0.0, 1.0)
+
+
+def ha_flessibilita(obiettivi):
+    """Indica se almeno un obiettivo può essere rinviato o ridotto."""
+    return any(obiettivo.get('rinvio_massimo', 0) > 0 or obiettivo.get('riduzione_massima', 0) > 0 for obiettivo in obiettivi)
+
+
+def ottimizza_obiettivi(obiettivi, risparmio_disponibile):
+    """
+    Rinvii e riduzioni di costo che riportano i PAC entro il risparmio disponibile.
+
+    I rinvii sono arrotondati per eccesso al mese e le riduzioni al punto percentuale,
+    quindi il piano copre sempre il deficit quando la flessibilità basta.
+
+    Args:
+        obiettivi (list): Lista di dizionari con obiettivi (vedi modulo per le chiavi opzionali)
+        risparmio_disponibile (float): Entrate - uscite mensili
+
+    Returns:
+        dict: {
+            'deficit': PAC totale - risparmio disponibile (0 se già sostenibile),
+            'fattibile': True se il piano copre tutto il deficit,
+            'pac_totale', 'pac_totale_proposto': PAC mensile totale prima e dopo,
+            'deficit_residuo': deficit che resta con tutta la flessibilità usata,
+            'modifiche': lista, in ordine di applicazione, di {
+                'indice', 'nome', 'priorita', 'anni', 'anni_proposti', 'rinvio_mesi',
+                'costo', 'costo_proposto', 'riduzione' (in %), 'pac', 'pac_proposto'
+            },
+            'obiettivi_proposti': copie degli obiettivi con 'anni' e 'costo' aggiornati
+        }
+    """
+    costi, anni, rendimenti, inflazione = parametri_obiettivi(obiettivi)
+    priorita, rinvio_massimo, riduzione_massima = parametri_flessibilita(obiettivi)
+
+    pac = calcola_pac_batch(costi, anni, rendimenti, inflazione)
+    pac_totale = float(pac.sum())
+    deficit = max(pac_totale - risparmio_disponibile, 0.0)
+
+    # Risparmio massimo di ogni leva (con inflazione sopra il rendimento il rinvio può non convenire)
+    pac_rinviato = calcola_pac_batch(costi, anni + rinvio_massimo, rendimenti, inflazione)
+    risparmio_rinvio = np.maximum(pac - pac_rinviato, 0.0)
+    pac_dopo_rinvio = np.where(risparmio_rinvio > 0, pac_rinviato, pac)
+    risparmio_riduzione = riduzione_massima * pac_dopo_rinvio
+
+    # Prima le priorità più basse, a parità quelle che liberano di più
+    ordine = np.lexsort((-(risparmio_rinvio + risparmio_riduzione), -priorita))
+    risparmi_leve = np.column_stack([risparmio_rinvio[ordine], risparmio_riduzione[ordine]]).ravel()
+    cumulato = np.cumsum(risparmi_leve)
+
+    # Leve usate per intero, poi l'ultima in parte (leva 2k = rinvio, 2k + 1 = riduzione dell'obiettivo ordine[k])
+    quote = np.zeros(len(risparmi_leve))
+    if deficit > _TOLLERANZA and len(quote):
+        ultima = min(int(np.searchsorted(cumulato, deficit - _TOLLERANZA)), len(quote) - 1)
+        quote[:ultima] = 1.0
+        precedente = cumulato[ultima - 1] if ultima else 0.0
+        if risparmi_leve[ultima] > 0:
+            quote[ultima] = min((deficit - precedente) / risparmi_leve[ultima], 1.0)
+        quote[risparmi_leve <= 0] = 0.0
+
+    quota_rinvio = np.zeros(len(obiettivi))
+    quota_riduzione = np.zeros(len(obiettivi))
+    quota_rinvio[ordine] = quote[0::2]
+    quota_riduzione[ordine] = quote[1::2]
+
+    anni_proposti = np.where(quota_rinvio > 0, anni + rinvio_massimo, anni)
+    parziali = np.flatnonzero((quota_rinvio > 0) & (quota_rinvio < 1))
+    if len(parziali):
+        # Anni che portano il PAC al valore richiesto, arrotondati per eccesso al mese
+        pac_richiesto = pac[parziali] - quota_rinvio[parziali] * risparmio_rinvio[parziali]
+        necessari = anni_minimi(
+            costi[parziali], pac_richiesto, rendimenti[parziali], inflazione[parziali],
+            anni_massimi=math.ceil(float((anni + rinvio_massimo)[parziali].max()))
+        )
+        necessari = np.ceil(necessari * 12 - 1e-9) / 12
+        anni_proposti[parziali] = np.clip(necessari, anni[parziali], anni[parziali] + rinvio_massimo[parziali])
+
+    riduzione = np.minimum(np.ceil(quota_riduzione * riduzione_massima * 100 - 1e-9) / 100, riduzione_massima)
+    costi_proposti = costi * (1 - riduzione)
+    pac_proposto = calcola_pac_batch(costi_proposti, anni_proposti, rendimenti, inflazione)
+    pac_totale_proposto = float(pac_proposto.sum())
+    deficit_residuo = max(pac_totale_proposto - risparmio_disponibile, 0.0)
+
+    modificati = [indice for indice in ordine.tolist() if anni_proposti[indice] != anni[indice] or riduzione[indice] > 0]
+    modifiche = [
+        {
+            'indice': indice,
+            'nome': obiettivi[indice]['nome'],
+            'priorita': int(priorita[indice]),
+            'anni': float(anni[indice]),
+            'anni_proposti': float(anni_proposti[indice]),
+            'rinvio_mesi': int(round((anni_proposti[indice] - anni[indice]) * 12)),
+            'costo': float(costi[indice]),
+            'costo_proposto': float(costi_proposti[indice]),
+            'riduzione': float(round(riduzione[indice] * 100, 6)) + 0.0,  # + 0.0 unifica -0.0 e 0.0
+            'pac': float(pac[indice]),
+            'pac_proposto': float(pac_proposto[indice])
+        }
+        for indice in modificati
+    ]
+
+    obiettivi_proposti = []
+    for indice, obiettivo in enumerate(obiettivi):
+        proposto = dict(obiettivo)
+        proposto['anni'] = float(anni_proposti[indice]) if anni_proposti[indice] != anni[indice] else obiettivo['anni']
+        proposto['costo'] = float(costi_proposti[indice]) if riduzione[indice] > 0 else obiettivo['costo']
+        obiettivi_proposti.append(proposto)
+
+    return {
+        'deficit': deficit,
+        'fattibile': deficit_residuo <= _TOLLERANZA,
+        'pac_totale': pac_totale,
+        'pac_totale_proposto': pac_totale_proposto,
+        'deficit_residuo': deficit_residuo,
+        'modifiche': modifiche,
+        'obiettivi_proposti': obiettivi_proposti
+    }
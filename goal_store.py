@@ -0,0 +1,253 @@
+"""
+Goal Store Module
+Archivio degli obiettivi della FASE 2 per elenchi lunghi (centinaia di obiettivi): i dati
+numerici stanno in un array strutturato NumPy con capacità che raddoppia, ogni obiettivo ha
+un id stabile (usabile come chiave dei widget), il PAC di ciascun obiettivo è calcolato solo
+quando viene aggiunto o modificato e il PAC totale è aggiornato a ogni operazione.
+
+La cancellazione sposta l'ultima riga al posto di quella rimossa (O(1)); l'ordine di
+inserimento si ricostruisce dagli id, crescenti.
+"""
+
+import numpy as np
+
+from goal_optimizer import PRIORITA_PREDEFINITA
+from pac_solver import calcola_pac_batch
+
+
+# Campi numerici di un obiettivo (rendimento, inflazione e riduzione_massima in percentuale)
+DTYPE_OBIETTIVO = np.dtype([
+    ('id', '<i8'),
+    ('costo', '<f8'),
+    ('anni', '<f8'),
+    ('rendimento', '<f8'),
+    ('inflazione', '<f8'),
+    ('priorita', '<i8'),
+    ('rinvio_massimo', '<f8'),
+    ('riduzione_massima', '<f8'),
+    ('pac', '<f8')
+])
+
+# Campi letti dai dizionari degli obiettivi e valori se assenti (None = obbligatorio)
+CAMPI_OBIETTIVO = {
+    'costo': None,
+    'anni': None,
+    'rendimento': 0.0,
+    'inflazione': 0.0,
+    'priorita': PRIORITA_PREDEFINITA,
+    'rinvio_massimo': 0.0,
+    'riduzione_massima': 0.0
+}
+
+# Campi restituiti come interi quando il valore è intero (come li inserisce l'interfaccia)
+_CAMPI_INTERI = ('anni', 'rinvio_massimo')
+
+_CAPACITA_INIZIALE = 16
+
+
+def _pac_righe(righe):
+    """PAC mensile di un blocco di righe dell'array (vedi calculations.calcola_pac_obiettivi)."""
+    return calcola_pac_batch(righe['costo'], righe['anni'], righe['rendimento'] / 100, righe['inflazione'] / 100)
+
+
+class GoalStore:
+    """
+    Archivio degli obiettivi con id stabili e PAC totale incrementale.
+
+    Esempio:
+        archivio = GoalStore()
+        id_casa = archivio.aggiungi({'nome': 'Casa', 'costo': 30000, 'anni': 5})
+        archivio.aggiorna(id_casa, anni=6)
+        archivio.pac_totale    # aggiornato senza ricalcolare gli altri obiettivi
+        archivio.come_lista()  # lista di dizionari per PlanPipeline.esegui
+
+    Args:
+        obiettivi (list): Obiettivi iniziali (dizionari {'nome', 'costo', 'anni', ...})
+    """
+
+    __slots__ = ('_righe', '_nomi', '_posizioni', '_numero', '_prossimo_id', 'pac_totale')
+
+    def __init__(self, obiettivi=None):
+        self._righe = np.zeros(_CAPACITA_INIZIALE, dtype=DTYPE_OBIETTIVO)
+        self._nomi = [None] * _CAPACITA_INIZIALE
+        self._posizioni = {}
+        self._numero = 0
+        self._prossimo_id = 0
+        self.pac_totale = 0.0
+        if obiettivi:
+            self.aggiungi_molti(obiettivi)
+
+    def __len__(self):
+        return self._numero
+
+    def __contains__(self, id_obiettivo):
+        return id_obiettivo in self._posizioni
+
+    def _garantisci_capacita(self, numero):
+        """Raddoppia la capacità degli array finché contengono `numero` righe."""
+        capacita = len(self._righe)
+        if numero <= capacita:
+            return
+        while capacita < numero:
+            capacita *= 2
+        righe = np.zeros(capacita, dtype=DTYPE_OBIETTIVO)
+        righe[:self._numero] = self._righe[:self._numero]
+        self._righe = righe
+        self._nomi.extend([None] * (capacita - len(self._nomi)))
+
+    def aggiungi(self, obiettivo):
+        """
+        Aggiunge un obiettivo.
+
+        Args:
+            obiettivo (dict): {'nome', 'costo', 'anni'} più i campi opzionali di CAMPI_OBIETTIVO
+
+        Returns:
+            int: Id dell'obiettivo
+        """
+        return self.aggiungi_molti([obiettivo])[0]
+
+    def aggiungi_molti(self, obiettivi):
+        """
+        Aggiunge più obiettivi calcolandone i PAC in una sola chiamata vettoriale.
+
+        Args:
+            obiettivi (list): Lista di dizionari con obiettivi
+
+        Returns:
+            list: Id assegnati, nello stesso ordine
+        """
+        obiettivi = list(obiettivi)
+        inizio, fine = self._numero, self._numero + len(obiettivi)
+        self._garantisci_capacita(fine)
+
+        nuove = self._righe[inizio:fine]
+        nuove['id'] = np.arange(self._prossimo_id, self._prossimo_id + len(obiettivi))
+        for campo, predefinito in CAMPI_OBIETTIVO.items():
+            nuove[campo] = [obiettivo.get(campo, predefinito) if predefinito is not None else obiettivo[campo] for obiettivo in obiettivi]
+        nuove['pac'] = _pac_righe(nuove)
+
+        ids = nuove['id'].tolist()
+        for posizione, (id_obiettivo, obiettivo) in enumerate(zip(ids, obiettivi), start=inizio):
+            self._nomi[posizione] = obiettivo['nome']
+            self._posizioni[id_obiettivo] = posizione
+        self._numero = fine
+        self._prossimo_id += len(obiettivi)
+        self.pac_totale += float(nuove['pac'].sum())
+        return ids
+
+    def aggiorna(self, id_obiettivo, **campi):
+        """
+        Modifica un obiettivo e ne ricalcola solo il PAC.
+
+        Args:
+            id_obiettivo (int): Id restituito da aggiungi
+            **campi: Nuovi valori ('nome' e/o campi di CAMPI_OBIETTIVO)
+
+        Raises:
+            KeyError: Se l'id non esiste o un campo non è previsto
+        """
+        posizione = self._posizioni[id_obiettivo]
+        sconosciuti = set(campi) - set(CAMPI_OBIETTIVO) - {'nome'}
+        if sconosciuti:
+            raise KeyError(f"Campi obiettivo sconosciuti: {', '.join(sorted(sconosciuti))}")
+
+        for campo, valore in campi.items():
+            if campo == 'nome':
+                self._nomi[posizione] = valore
+            else:
+                self._righe[campo][posizione] = valore
+
+        riga = self._righe[posizione:posizione + 1]
+        precedente = float(riga['pac'][0])
+        riga['pac'] = _pac_righe(riga)
+        self.pac_totale += float(riga['pac'][0]) - precedente
+
+    def rimuovi(self, id_obiettivo):
+        """
+        Rimuove un obiettivo in O(1) spostando l'ultima riga al suo posto.
+
+        Args:
+            id_obiettivo (int): Id restituito da aggiungi
+
+        Raises:
+            KeyError: Se l'id non esiste
+        """
+        posizione = self._posizioni.pop(id_obiettivo)
+        ultima = self._numero - 1
+        self.pac_totale -= float(self._righe['pac'][posizione])
+
+        if posizione != ultima:
+            self._righe[posizione] = self._righe[ultima]
+            self._nomi[posizione] = self._nomi[ultima]
+            self._posizioni[int(self._righe['id'][posizione])] = posizione
+        self._nomi[ultima] = None
+        self._numero = ultima
+        if not self._numero:
+            self.pac_totale = 0.0
+
+    def ricalcola_totale(self):
+        """Ricalcola il PAC totale da zero (elimina gli errori di arrotondamento accumulati)."""
+        self.pac_totale = float(self._righe['pac'][:self._numero].sum())
+        return self.pac_totale
+
+    def _ordine(self):
+        """Posizioni delle righe in ordine di inserimento."""
+        return np.argsort(self._righe['id'][:self._numero], kind='stable')
+
+    def _dizionario(self, posizione):
+        """Obiettivo in una posizione come dizionario (senza il PAC)."""
+        riga = self._righe[posizione]
+        obiettivo = {'nome': self._nomi[posizione]}
+        for campo in CAMPI_OBIETTIVO:
+            valore = riga[campo].item()
+            if campo in _CAMPI_INTERI and float(valore).is_integer():
+                valore = int(valore)
+            obiettivo[campo] = valore
+        return obiettivo
+
+    def ottieni(self, id_obiettivo):
+        """
+        Restituisce un obiettivo.
+
+        Args:
+            id_obiettivo (int): Id restituito da aggiungi
+
+        Returns:
+            dict: Obiettivo con tutti i campi di CAMPI_OBIETTIVO e 'nome'
+        """
+        return self._dizionario(self._posizioni[id_obiettivo])
+
+    def pac(self, id_obiettivo):
+        """PAC mensile di un obiettivo (calcolato all'inserimento o all'ultima modifica)."""
+        return float(self._righe['pac'][self._posizioni[id_obiettivo]])
+
+    def numero_pagine(self, dimensione):
+        """Numero di pagine da `dimensione` obiettivi (almeno 1)."""
+        return max(-(-self._numero // dimensione), 1)
+
+    def pagina(self, numero, dimensione):
+        """
+        Obiettivi di una pagina, in ordine di inserimento.
+
+        Args:
+            numero (int): Pagina (da 1)
+            dimensione (int): Obiettivi per pagina
+
+        Returns:
+            list: Tuple (id, obiettivo, pac_mensile)
+        """
+        posizioni = self._ordine()[(numero - 1) * dimensione:numero * dimensione]
+        return [
+            (int(self._righe['id'][posizione]), self._dizionario(posizione), float(self._righe['pac'][posizione]))
+            for posizione in posizioni.tolist()
+        ]
+
+    def come_lista(self):
+        """
+        Tutti gli obiettivi in ordine di inserimento, nel formato di PlanPipeline.esegui.
+
+        Returns:
+            list: Lista di dizionari con obiettivi
+        """
+        return [self._dizionario(posizione) for posizione in self._ordine().tolist()]
@@ -0,0 +1,98 @@
+"""
+Inflation Module
+Potere d'acquisto reale di liquidità e risparmi lasciati fermi sul conto, per una griglia
+di tassi di inflazione × orizzonti. I fattori di sconto di ogni griglia sono calcolati una
+sola volta (lru_cache, array di sola lettura): la tabella di un utente costa una
+moltiplicazione vettoriale. Le stesse tabelle alimentano il report Markdown e quindi il PDF.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+
+# Griglia mostrata nel report (scenario A = target BCE, scenario B = media storica)
+TASSI_INFLAZIONE_REPORT = (0.02, 0.03)
+ANNI_INFLAZIONE_REPORT = (10, 20, 30)
+
+# Importo dell'esempio quando la liquidità dell'utente non è nota
+LIQUIDITA_ESEMPIO = 10000
+
+
+def _sola_lettura(array):
+    """Rende un array non modificabile (condiviso dalla cache)."""
+    array.flags.writeable = False
+    return array
+
+
+@lru_cache(maxsize=64)
+def tabella_potere_acquisto(tassi, anni):
+    """
+    Valore reale di €1 tenuto fermo per ogni tasso e orizzonte.
+
+    Args:
+        tassi (tuple): Tassi di inflazione annui, R valori
+        anni (tuple): Orizzonti in anni, H valori
+
+    Returns:
+        np.ndarray: (1 + tasso) ** -anni, shape (R, H), sola lettura
+    """
+    tassi = np.asarray(tassi, dtype=float)[:, np.newaxis]
+    return _sola_lettura((1 + tassi) ** -np.asarray(anni, dtype=float))
+
+
+@lru_cache(maxsize=64)
+def tabella_contributi(tassi, anni):
+    """
+    Valore reale a fine periodo di €1 accantonato (senza rendimento) a inizio di ogni mese.
+
+    Il versamento del mese m perde potere d'acquisto per i mesi restanti: la somma
+    è la serie geometrica Σ q^j per j = 1..mesi, con q = (1 + tasso) ** (-1/12).
+
+    Args:
+        tassi (tuple): Tassi di inflazione annui, R valori
+        anni (tuple): Orizzonti in anni, H valori
+
+    Returns:
+        np.ndarray: Fattori di shape (R, H), sola lettura (pari ai mesi con tasso nullo)
+    """
+    q = (1 + np.asarray(tassi, dtype=float)[:, np.newaxis]) ** (-1 / 12)
+    mesi = np.asarray(anni, dtype=float) * 12
+    nullo = np.abs(1 - q) < 1e-12
+    fattori = np.where(nullo, mesi, q * (1 - q ** mesi) / np.where(nullo, 1.0, 1 - q))
+    return _sola_lettura(fattori)
+
+
+def tabella_inflazione(liquidita, contributo_mensile=0.0, tassi=TASSI_INFLAZIONE_REPORT,
+                       anni=ANNI_INFLAZIONE_REPORT):
+    """
+    Tabelle del potere d'acquisto per uno o più utenti.
+
+    Args:
+        liquidita (float | array): Liquidità attuale, shape (N,) per più utenti
+        contributo_mensile (float | array): Risparmio mensile accantonato sul conto
+        tassi (tuple): Tassi di inflazione annui
+        anni (tuple): Orizzonti in anni
+
+    Returns:
+        dict: {
+            'tassi', 'anni': la griglia,
+            'reale': valore reale della liquidità, shape (..., R, H),
+            'perso': potere d'acquisto perso, shape (..., R, H),
+            'versato': totale accantonato, shape (..., H),
+            'versato_reale': valore reale dell'accantonato, shape (..., R, H)
+        }
+    """
+    tassi, anni = tuple(tassi), tuple(anni)
+    liquidita = np.asarray(liquidita, dtype=float)[..., np.newaxis, np.newaxis]
+    contributo = np.asarray(contributo_mensile, dtype=float)[..., np.newaxis, np.newaxis]
+
+    reale = liquidita * tabella_potere_acquisto(tassi, anni)
+    return {
+        'tassi': tassi,
+        'anni': anni,
+        'reale': reale,
+        'perso': liquidita - reale,
+        'versato': contributo[..., 0, :] * np.asarray(anni, dtype=float) * 12,
+        'versato_reale': contributo * tabella_contributi(tassi, anni)
+    }
@@ -0,0 +1,99 @@
+"""
+Market Assumptions Module
+Ipotesi di mercato (rendimento atteso, volatilità, correlazioni) per le classi di attivo
+dell'allocazione: usate da proiezioni e simulazioni. Sono valori ipotetici di lungo periodo,
+non previsioni.
+"""
+
+import numpy as np
+
+
+# Ordine delle classi di attivo in vettori e matrici
+ASSET = ("Azioni", "Obbligazioni", "Oro")
+
+# Rendimento atteso annuo (media aritmetica, lordo costi e tasse)
+RENDIMENTI_ATTESI = {
+    "Azioni": 0.07,
+    "Obbligazioni": 0.03,
+    "Oro": 0.04
+}
+
+# Volatilità annua (deviazione standard)
+VOLATILITA = {
+    "Azioni": 0.16,
+    "Obbligazioni": 0.06,
+    "Oro": 0.15
+}
+
+# Matrice di correlazione, nell'ordine di ASSET
+CORRELAZIONI = np.array([
+    [1.00, 0.10, 0.05],
+    [0.10, 1.00, 0.20],
+    [0.05, 0.20, 1.00]
+])
+
+# Inflazione annua attesa, per esprimere i valori in euro di oggi
+INFLAZIONE_ATTESA = 0.02
+
+
+def vettore_pesi(allocazione):
+    """
+    Converte un'allocazione percentuale nel vettore dei pesi.
+
+    Args:
+        allocazione (dict): {'Azioni': 60, 'Obbligazioni': 30, 'Oro': 10}
+
+    Returns:
+        np.ndarray: Pesi nell'ordine di ASSET (somma 1)
+    """
+    pesi = np.array([allocazione.get(asset, 0) for asset in ASSET], dtype=float)
+    totale = pesi.sum()
+    return pesi / totale if totale > 0 else pesi
+
+
+def matrice_covarianza():
+    """
+    Restituisce la matrice di covarianza annua delle classi di attivo.
+
+    Returns:
+        np.ndarray: Matrice (3, 3) nell'ordine di ASSET
+    """
+    sigma = np.array([VOLATILITA[asset] for asset in ASSET])
+    return CORRELAZIONI * np.outer(sigma, sigma)
+
+
+def parametri_portafoglio(allocazione):
+    """
+    Calcola rendimento atteso e volatilità annui di un portafoglio.
+
+    Args:
+        allocazione (dict): Allocazione percentuale per classe di attivo
+
+    Returns:
+        tuple: (float rendimento atteso annuo, float volatilità annua)
+    """
+    pesi = vettore_pesi(allocazione)
+    mu = float(pesi @ np.array([RENDIMENTI_ATTESI[asset] for asset in ASSET]))
+    sigma = float(np.sqrt(pesi @ matrice_covarianza() @ pesi))
+    return mu, sigma
+
+
+def parametri_lognormali_mensili(mu_annuo, sigma_annuo, ter=0.0, inflazione=0.0):
+    """
+    Converte rendimento e volatilità annui nei parametri del log-rendimento mensile.
+
+    Il fattore di crescita annuo è lognormale con media 1 + mu_annuo e deviazione
+    standard sigma_annuo; TER e inflazione riducono il drift (rendimento netto e reale).
+
+    Args:
+        mu_annuo (float): Rendimento atteso annuo
+        sigma_annuo (float): Volatilità annua
+        ter (float): Costi annui (es. 0.002 per 0.20%)
+        inflazione (float): Inflazione annua (valori in euro di oggi se > 0)
+
+    Returns:
+        tuple: (float media, float deviazione standard) del log-rendimento mensile
+    """
+    varianza_log = np.log1p(sigma_annuo ** 2 / (1 + mu_annuo) ** 2)
+    media_log = np.log1p(mu_annuo) - varianza_log / 2 + np.log1p(-ter) - np.log1p(inflazione)
+    return float(media_log / 12), float(np.sqrt(varianza_log / 12))
@@ -0,0 +1,170 @@
+"""
+Monte Carlo Module
+Simulazione Monte Carlo del patrimonio investito (PAC mensile + capitale iniziale) secondo
+l'allocazione della FASE 3. Vettorizzata sui percorsi con NumPy; generatori casuali
+riproducibili tramite seed (SeedSequence).
+"""
+
+import numpy as np
+
+from market_assumptions import (
+    ASSET, CORRELAZIONI, RENDIMENTI_ATTESI, VOLATILITA,
+    parametri_portafoglio, parametri_lognormali_mensili
+)
+
+
+# Seed usato dai report, così che lo stesso input produca sempre lo stesso testo
+SEED_REPORT = 20240101
+
+# Mesi simulati per blocco di numeri casuali (limita la memoria: blocco × percorsi float)
+_MESI_PER_BLOCCO = 120
+
+
+def crea_generatore(seed=None):
+    """
+    Crea un generatore casuale riproducibile.
+
+    Args:
+        seed (int): Seed (None = entropia del sistema)
+
+    Returns:
+        np.random.Generator: Generatore PCG64
+    """
+    return np.random.default_rng(np.random.SeedSequence(seed))
+
+
+def crea_generatori_indipendenti(seed, numero):
+    """
+    Crea flussi casuali indipendenti e riproducibili (es. uno per processo/worker).
+
+    Args:
+        seed (int): Seed principale
+        numero (int): Numero di flussi
+
+    Returns:
+        list: Lista di np.random.Generator
+    """
+    return [np.random.default_rng(figlio) for figlio in np.random.SeedSequence(seed).spawn(numero)]
+
+
+def simula_patrimonio(contributo_mensile, capitale_iniziale, allocazione, anni,
+                      n_percorsi=10000, obiettivo=None, seed=None, rng=None,
+                      ter=0.0, inflazione=0.0, percentili=(5, 50, 95), allocazioni_annue=None):
+    """
+    Simula l'evoluzione del patrimonio con PAC mensile e capitale iniziale.
+
+    Ogni mese il contributo viene versato a inizio mese e il patrimonio cresce
+    con un rendimento lognormale del portafoglio (ipotesi di market_assumptions).
+    Con inflazione > 0 i valori sono espressi in euro di oggi (contributi rivalutati).
+
+    Args:
+        contributo_mensile (float): Importo investito ogni mese
+        capitale_iniziale (float): Capitale investito subito (lump sum)
+        allocazione (dict): Allocazione percentuale {'Azioni', 'Obbligazioni', 'Oro'}
+        anni (float): Anni di simulazione (anche frazionari, arrotondati al mese)
+        n_percorsi (int): Numero di scenari simulati
+        obiettivo (float): Capitale obiettivo (None = nessuna probabilità calcolata)
+        seed (int): Seed per la riproducibilità (ignorato se rng è fornito)
+        rng (np.random.Generator): Generatore da usare
+        ter (float): Costi annui del portafoglio (es. 0.002)
+        inflazione (float): Inflazione annua
+        percentili (tuple): Percentili delle bande
+        allocazioni_annue (list): Allocazione di ogni anno (es. glide path); sostituisce
+            allocazione, e dopo l'ultimo anno indicato resta valida l'ultima
+
+    Returns:
+        dict: {
+            'anni': array degli anni (0..anni),
+            'bande': {percentile: array del patrimonio a fine di ogni anno},
+            'finale': {percentile: patrimonio finale},
+            'media_finale': media del patrimonio finale,
+            'versato_totale': capitale iniziale + contributi,
+            'probabilita_obiettivo': quota di scenari >= obiettivo (o None),
+            'percorsi_finali': patrimonio finale di ogni scenario, shape (n_percorsi,),
+            'n_percorsi': numero di scenari
+        }
+    """
+    if rng is None:
+        rng = crea_generatore(seed)
+
+    mesi = int(round(anni * 12))
+    # Anni simulati: l'ultimo può essere parziale con un orizzonte frazionario
+    righe_anni = -(-mesi // 12)
+    if allocazioni_annue is None:
+        allocazioni_annue = [allocazione]
+
+    # Parametri lognormali di ogni anno, poi di ogni mese
+    parametri = np.array([
+        parametri_lognormali_mensili(*parametri_portafoglio(allocazione_anno), ter=ter, inflazione=inflazione)
+        for allocazione_anno in allocazioni_annue
+    ])
+    indice_anno = np.minimum(np.arange(mesi) // 12, len(parametri) - 1)
+    media_log = parametri[indice_anno, 0]
+    sigma_log = parametri[indice_anno, 1]
+
+    patrimonio = np.full(n_percorsi, float(capitale_iniziale))
+    fine_anno = np.empty((righe_anni + 1, n_percorsi))
+    fine_anno[0] = patrimonio
+
+    mese = 0
+    while mese < mesi:
+        blocco = min(_MESI_PER_BLOCCO, mesi - mese)
+        # Fattori di crescita del blocco, calcolati in place
+        fattori = rng.standard_normal((blocco, n_percorsi))
+        fattori *= sigma_log[mese:mese + blocco, np.newaxis]
+        fattori += media_log[mese:mese + blocco, np.newaxis]
+        np.exp(fattori, out=fattori)
+
+        for fattore in fattori:
+            patrimonio += contributo_mensile
+            patrimonio *= fattore
+            mese += 1
+            if mese % 12 == 0 or mese == mesi:
+                fine_anno[-(-mese // 12)] = patrimonio
+
+    bande = np.percentile(fine_anno, percentili, axis=1)
+    finale = fine_anno[-1]
+
+    return {
+        'anni': np.arange(righe_anni + 1) if mesi % 12 == 0 else np.append(np.arange(righe_anni), mesi / 12),
+        'bande': {p: bande[i] for i, p in enumerate(percentili)},
+        'finale': {p: float(bande[i][-1]) for i, p in enumerate(percentili)},
+        'media_finale': float(finale.mean()),
+        'versato_totale': float(capitale_iniziale + contributo_mensile * mesi),
+        'probabilita_obiettivo': float(np.mean(finale >= obiettivo)) if obiettivo is not None else None,
+        'percorsi_finali': finale,
+        'n_percorsi': n_percorsi
+    }
+
+
+def simula_rendimenti_asset(anni, n_percorsi=1000, seed=None, rng=None):
+    """
+    Simula rendimenti mensili correlati per ogni classe di attivo (per ribilanciamento e confronti).
+
+    Ogni classe ha rendimento lognormale con media e volatilità di market_assumptions;
+    la correlazione è applicata ai log-rendimenti tramite la fattorizzazione di Cholesky.
+    Memoria: mesi × percorsi × 3 float (es. 30 anni × 10.000 percorsi ≈ 86 MB).
+
+    Args:
+        anni (int): Anni simulati
+        n_percorsi (int): Numero di scenari
+        seed (int): Seed per la riproducibilità (ignorato se rng è fornito)
+        rng (np.random.Generator): Generatore da usare
+
+    Returns:
+        np.ndarray: Rendimenti semplici mensili, shape (mesi, n_percorsi, 3) nell'ordine di ASSET
+    """
+    if rng is None:
+        rng = crea_generatore(seed)
+
+    parametri = np.array([
+        parametri_lognormali_mensili(RENDIMENTI_ATTESI[asset], VOLATILITA[asset]) for asset in ASSET
+    ])
+    fattore = np.linalg.cholesky(CORRELAZIONI)
+
+    rendimenti = rng.standard_normal((int(anni) * 12, n_percorsi, len(ASSET)))
+    rendimenti = rendimenti @ fattore.T
+    rendimenti *= parametri[:, 1]
+    rendimenti += parametri[:, 0]
+    np.expm1(rendimenti, out=rendimenti)
+    return rendimenti
@@ -0,0 +1,180 @@
+"""
+PAC Solver Module
+Calcolo del PAC mensile per gli obiettivi della FASE 2 con rendimento e inflazione
+(formula della rendita) e ricerca inversa: costo massimo sostenibile, anni minimi e
+rendimento richiesto. Tutte le funzioni lavorano su array di obiettivi senza cicli Python.
+
+Convenzioni: i costi sono in euro di oggi e crescono con l'inflazione fino alla scadenza;
+il PAC è un importo nominale costante versato a inizio mese (come in projections).
+"""
+
+import numpy as np
+
+from projections import valore_finale
+
+
+# Iterazioni massime del risolutore (la bisezione dimezza l'intervallo a ogni passo)
+_MAX_ITERAZIONI = 100
+_TOLLERANZA = 1e-10
+
+
+def fattore_accumulo(anni, rendimento_annuo=0.0):
+    """
+    Valore a scadenza di €1 versato ogni mese per il periodo.
+
+    Args:
+        anni (array): Anni di accumulo
+        rendimento_annuo (array): Rendimento annuo netto (es. 0.03)
+
+    Returns:
+        np.ndarray: Fattore di accumulo (pari ai mesi se il rendimento è nullo)
+    """
+    return np.asarray(valore_finale(1.0, 0.0, anni, rendimento_annuo))
+
+
+def costo_futuro(costi, anni, inflazione=0.0):
+    """Costo a scadenza di obiettivi espressi in euro di oggi."""
+    return np.asarray(costi, dtype=float) * (1 + np.asarray(inflazione, dtype=float)) ** np.asarray(anni, dtype=float)
+
+
+def calcola_pac_batch(costi, anni, rendimenti=0.0, inflazione=0.0):
+    """
+    PAC mensile necessario per ciascun obiettivo.
+
+    Con rendimento e inflazione nulli coincide con costo / (anni × 12).
+
+    Args:
+        costi (array): Costi degli obiettivi in euro di oggi
+        anni (array): Anni disponibili per ciascun obiettivo
+        rendimenti (array): Rendimento annuo netto atteso del PAC
+        inflazione (array): Inflazione annua del costo dell'obiettivo
+
+    Returns:
+        np.ndarray: PAC mensile per obiettivo (0 dove gli anni sono <= 0)
+    """
+    anni = np.asarray(anni, dtype=float)
+    validi = anni > 0
+    anni_validi = np.where(validi, anni, 1.0)
+    pac = costo_futuro(costi, anni_validi, inflazione) / fattore_accumulo(anni_validi, rendimenti)
+    return np.where(validi, pac, 0.0)
+
+
+def costo_massimo(pac_mensile, anni, rendimenti=0.0, inflazione=0.0):
+    """
+    Costo massimo (in euro di oggi) raggiungibile con un PAC mensile dato.
+
+    Args:
+        pac_mensile (array): Importo mensile disponibile
+        anni (array): Anni di accumulo
+        rendimenti (array): Rendimento annuo netto atteso
+        inflazione (array): Inflazione annua del costo
+
+    Returns:
+        np.ndarray: Costo massimo sostenibile
+    """
+    anni = np.asarray(anni, dtype=float)
+    accumulato = np.asarray(pac_mensile, dtype=float) * fattore_accumulo(np.maximum(anni, 0.0), rendimenti)
+    return accumulato / (1 + np.asarray(inflazione, dtype=float)) ** np.maximum(anni, 0.0)
+
+
+def _risolvi(funzione, basso, alto):
+    """
+    Trova lo zero di una funzione crescente in [basso, alto], elemento per elemento.
+
+    Passo di Newton (derivata numerica) protetto da bisezione: se il passo esce
+    dall'intervallo che contiene lo zero si usa il punto medio.
+
+    Args:
+        funzione (callable): f(x) vettoriale, crescente in x
+        basso (np.ndarray): Estremi inferiori (f(basso) <= 0)
+        alto (np.ndarray): Estremi superiori (f(alto) >= 0)
+
+    Returns:
+        np.ndarray: Zeri della funzione
+    """
+    basso = basso.astype(float)
+    alto = alto.astype(float)
+    x = (basso + alto) / 2
+
+    for _ in range(_MAX_ITERAZIONI):
+        valore = funzione(x)
+        basso = np.where(valore <= 0, x, basso)
+        alto = np.where(valore > 0, x, alto)
+
+        passo = 1e-6 * np.maximum(1.0, np.abs(x))
+        derivata = (funzione(x + passo) - valore) / passo
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = x - valore / derivata
+        dentro = np.isfinite(newton) & (newton > basso) & (newton < alto)
+        nuovo = np.where(dentro, newton, (basso + alto) / 2)
+
+        if np.all(np.abs(nuovo - x) <= _TOLLERANZA * np.maximum(1.0, np.abs(x))):
+            return nuovo
+        x = nuovo
+    return x
+
+
+def anni_minimi(costi, pac_mensile, rendimenti=0.0, inflazione=0.0, anni_massimi=100):
+    """
+    Anni minimi per raggiungere ciascun obiettivo con il PAC mensile dato.
+
+    Args:
+        costi (array): Costi degli obiettivi in euro di oggi
+        pac_mensile (array): Importo mensile disponibile
+        rendimenti (array): Rendimento annuo netto atteso
+        inflazione (array): Inflazione annua del costo
+        anni_massimi (float): Orizzonte massimo della ricerca
+
+    Returns:
+        np.ndarray: Anni (frazionari) necessari; inf se non raggiungibile entro anni_massimi
+    """
+    costi, pac_mensile, rendimenti, inflazione = np.broadcast_arrays(
+        *(np.asarray(valore, dtype=float) for valore in (costi, pac_mensile, rendimenti, inflazione))
+    )
+
+    def scarto(anni):
+        return pac_mensile * fattore_accumulo(anni, rendimenti) - costo_futuro(costi, anni, inflazione)
+
+    # Con inflazione maggiore del rendimento lo scarto può tornare a scendere: si cerca
+    # il primo anno intero in cui l'obiettivo è raggiunto e si risolve dentro quell'anno
+    primo_anno = np.full(costi.shape, np.inf)
+    for anno in range(1, int(anni_massimi) + 1):
+        raggiunto = np.isinf(primo_anno) & (scarto(np.full(costi.shape, float(anno))) >= 0)
+        primo_anno[raggiunto] = anno
+
+    raggiungibile = np.isfinite(primo_anno)
+    alto = np.where(raggiungibile, primo_anno, 1.0)
+    anni = _risolvi(scarto, alto - 1, alto)
+    return np.where(costi <= 0, 0.0, np.where(raggiungibile, anni, np.inf))
+
+
+def rendimento_richiesto(costi, pac_mensile, anni, inflazione=0.0, rendimento_massimo=1.0):
+    """
+    Rendimento annuo netto necessario per raggiungere ciascun obiettivo.
+
+    Args:
+        costi (array): Costi degli obiettivi in euro di oggi
+        pac_mensile (array): Importo mensile disponibile
+        anni (array): Anni disponibili
+        inflazione (array): Inflazione annua del costo
+        rendimento_massimo (float): Limite superiore della ricerca
+
+    Returns:
+        np.ndarray: Rendimento annuo richiesto (negativo se basta meno del versato);
+                    nan se fuori da [-99%, rendimento_massimo] o se anni/PAC sono <= 0
+    """
+    costi, pac_mensile, anni, inflazione = np.broadcast_arrays(
+        *(np.asarray(valore, dtype=float) for valore in (costi, pac_mensile, anni, inflazione))
+    )
+    validi = (anni > 0) & (pac_mensile > 0)
+    anni_validi = np.where(validi, anni, 1.0)
+    obiettivo = costo_futuro(costi, anni_validi, inflazione)
+
+    def scarto(rendimento):
+        return np.where(validi, pac_mensile, 1.0) * fattore_accumulo(anni_validi, rendimento) - obiettivo
+
+    minimo = np.full(costi.shape, -0.99)
+    massimo = np.full(costi.shape, float(rendimento_massimo))
+    risolvibile = validi & (scarto(minimo) <= 0) & (scarto(massimo) >= 0)
+    rendimento = _risolvi(scarto, minimo, massimo)
+    return np.where(risolvibile, rendimento, np.nan)
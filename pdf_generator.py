@@ -4,17 +4,28 @@ Genera PDF professionali del piano finanziario
 """
 
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import cm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, PageBreak
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from io import BytesIO
 from datetime import datetime
+from functools import lru_cache
+import os
+import re
 
 from calculations import formatta_valuta
+from cache import BytesCache, chiave_canonica
+from pdf_styles import get_stile, get_stile_tabella
+from pdf_markdown import compila_markdown
+
+
+# Cache dei PDF generati, indirizzata per contenuto.
+# BASICFIN_PDF_CACHE_DIR abilita lo spill su disco delle voci rimosse dalla memoria.
+PDF_CACHE = BytesCache(
+    max_bytes=32 * 1024 * 1024,
+    directory=os.environ.get('BASICFIN_PDF_CACHE_DIR')
+)
 
 
 def genera_pdf_piano_finanziario(
@@ -53,70 +64,12 @@ def genera_pdf_piano_finanziario(
         bottomMargin=2*cm
     )
     
-    # Stili
-    styles = getSampleStyleSheet()
-    
-    # Stile personalizzato per titolo
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#1f77b4'),
-        spaceAfter=30,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
-    
-    # Stile per sottotitoli
-    subtitle_style = ParagraphStyle(
-        'CustomSubtitle',
-        parent=styles['Heading2'],
-        fontSize=16,
-        textColor=colors.HexColor('#2c3e50'),
-        spaceAfter=12,
-        spaceBefore=12,
-        fontName='Helvetica-Bold'
-    )
-    
-    # Stile per sezioni
-    section_style = ParagraphStyle(
-        'CustomSection',
-        parent=styles['Heading3'],
-        fontSize=14,
-        textColor=colors.HexColor('#34495e'),
-        spaceAfter=10,
-        spaceBefore=10,
-        fontName='Helvetica-Bold'
-    )
-    
-    # Stile per testo normale
-    normal_style = ParagraphStyle(
-        'CustomNormal',
-        parent=styles['Normal'],
-        fontSize=10,
-        alignment=TA_JUSTIFY,
-        spaceAfter=8,
-        fontName='Helvetica'
-    )
-    
-    # Stile per warning/info
-    warning_style = ParagraphStyle(
-        'CustomWarning',
-        parent=styles['Normal'],
-        fontSize=10,
-        textColor=colors.HexColor('#e74c3c'),
-        spaceAfter=8,
-        fontName='Helvetica-Bold'
-    )
-    
-    success_style = ParagraphStyle(
-        'CustomSuccess',
-        parent=styles['Normal'],
-        fontSize=10,
-        textColor=colors.HexColor('#27ae60'),
-        spaceAfter=8,
-        fontName='Helvetica-Bold'
-    )
+    # Stili condivisi (costruiti una sola volta, vedi pdf_styles)
+    title_style = get_stile('CustomTitle')
+    subtitle_style = get_stile('CustomSubtitle')
+    section_style = get_stile('CustomSection')
+    normal_style = get_stile('CustomNormal')
+    warning_style = get_stile('CustomWarning')
     
     # Contenuto del documento
     story = []
@@ -185,19 +138,7 @@ def genera_pdf_piano_finanziario(
     ]
     
     data_table = Table(data_table_data, colWidths=[8*cm, 6*cm])
-    data_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 10),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-    ]))
+    data_table.setStyle(get_stile_tabella('DatiInseriti'))
     
     story.append(data_table)
     story.append(Spacer(1, 0.5*cm))
@@ -226,18 +167,7 @@ def genera_pdf_piano_finanziario(
             ])
         
         obiettivi_table = Table(obiettivi_data, colWidths=[7*cm, 4*cm, 3*cm])
-        obiettivi_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-        ]))
+        obiettivi_table.setStyle(get_stile_tabella('Obiettivi'))
         
         story.append(obiettivi_table)
         story.append(Spacer(1, 0.5*cm))
@@ -254,9 +184,8 @@ def genera_pdf_piano_finanziario(
     }
     story.append(Paragraph(fase1_titolo.get(lang, fase1_titolo['it']), subtitle_style))
     
-    # Converti markdown semplice in paragrafi
-    fase1_paragrafi = _markdown_to_paragraphs(report_fase1_text, normal_style, warning_style, success_style)
-    story.extend(fase1_paragrafi)
+    # Converti il markdown del report in flowable (titolo di fase già stampato sopra)
+    story.extend(_markdown_to_flowables(report_fase1_text))
     
     story.append(PageBreak())
     
@@ -270,13 +199,12 @@ def genera_pdf_piano_finanziario(
     }
     story.append(Paragraph(fase2_titolo.get(lang, fase2_titolo['it']), subtitle_style))
     
-    fase2_paragrafi = _markdown_to_paragraphs(report_fase2_text, normal_style, warning_style, success_style)
-    story.extend(fase2_paragrafi)
+    story.extend(_markdown_to_flowables(report_fase2_text))
     
     story.append(PageBreak())
     
     # ========================================================================
-    # SEZIONE 4: REPORT FASE 3 (SOMMARIO)
+    # SEZIONE 4: REPORT FASE 3
     # ========================================================================
     fase3_titolo = {
         'it': 'FASE 3: Investimenti a Lungo Termine',
@@ -285,20 +213,7 @@ def genera_pdf_piano_finanziario(
     }
     story.append(Paragraph(fase3_titolo.get(lang, fase3_titolo['it']), subtitle_style))
     
-    # Nota: Il report fase 3 è molto lungo, includiamo solo i punti chiave
-    nota_fase3 = {
-        'it': '<i>Nota: Per ragioni di spazio, questa sezione include solo i punti chiave dell\'allocazione. Consulta il report completo online per dettagli educativi su pensioni, inflazione e interesse composto.</i>',
-        'en': '<i>Note: For space reasons, this section includes only key allocation points. Consult the complete online report for educational details on pensions, inflation, and compound interest.</i>',
-        'de': '<i>Hinweis: Aus Platzgründen enthält dieser Abschnitt nur die wichtigsten Allokationspunkte. Konsultieren Sie den vollständigen Online-Bericht für Bildungsdetails zu Renten, Inflation und Zinseszins.</i>'
-    }
-    story.append(Paragraph(nota_fase3.get(lang, nota_fase3['it']), normal_style))
-    story.append(Spacer(1, 0.3*cm))
-    
-    # Estrai solo le parti chiave (disponibilità e allocazione)
-    fase3_key_lines = _extract_fase3_key_info(report_fase3_text, lang)
-    for line in fase3_key_lines:
-        story.append(Paragraph(line, normal_style))
-        story.append(Spacer(1, 0.2*cm))
+    story.extend(_markdown_to_flowables(report_fase3_text))
     
     story.append(PageBreak())
     
@@ -343,121 +258,161 @@ def genera_pdf_piano_finanziario(
     return buffer
 
 
-def _markdown_to_paragraphs(text, normal_style, warning_style, success_style):
-    """Converte markdown semplice in lista di paragrafi."""
-    paragraphs = []
-    lines = text.split('\n')
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        
-        # Salta header markdown (##, ###)
-        if line.startswith('#'):
-            continue
-        
-        # Salta separatori
-        if line.startswith('---'):
-            paragraphs.append(Spacer(1, 0.3*cm))
-            continue
-        
-        # Converti bullet points
-        if line.startswith('- '):
-            line = '• ' + line[2:]
-        
-        # Converti bold markdown in HTML
-        line = line.replace('**', '<b>').replace('**', '</b>')
-        
-        # Determina stile
-        style = normal_style
-        if '⚠️' in line or 'ATTENZIONE' in line or 'WARNING' in line:
-            style = warning_style
-        elif '✅' in line or 'Complimenti' in line or 'Congratulations' in line:
-            style = success_style
-        
-        # Rimuovi emoji problematici per PDF
-        line = _clean_emoji(line)
-        
-        try:
-            paragraphs.append(Paragraph(line, style))
-            paragraphs.append(Spacer(1, 0.1*cm))
-        except:
-            # Se il parsing fallisce, skippa la riga
-            continue
-    
-    return paragraphs
+def chiave_pdf(dati_base, dati_demografici, profilo_rischio, obiettivi,
+               report_fase1_text, report_fase2_text, report_fase3_text, lang='it'):
+    """
+    Calcola la chiave di contenuto di un PDF.
+    
+    Include la data odierna, perché il PDF riporta la data di generazione.
+    
+    Returns:
+        str: Digest SHA-256 esadecimale
+    """
+    return chiave_canonica(
+        dati_base, dati_demografici, profilo_rischio, obiettivi,
+        report_fase1_text, report_fase2_text, report_fase3_text, lang,
+        datetime.now().strftime("%Y%m%d")
+    )
 
 
-def _extract_fase3_key_info(text, lang):
-    """Estrae solo le informazioni chiave dalla Fase 3."""
-    lines = []
-    
-    # Cerca la sezione disponibilità
-    if 'Importo Mensile Investibile' in text or 'Monthly Investable Amount' in text or 'Monatlich investierbarer Betrag' in text:
-        for line in text.split('\n'):
-            if 'Importo Mensile Investibile' in line or 'Monthly Investable Amount' in line or 'Monatlich investierbarer Betrag' in line:
-                lines.append('<b>' + line.strip().replace('**', '') + '</b>')
-                break
-    
-    # Cerca allocazione portafoglio
-    if 'Allocazione di Portafoglio' in text or 'Portfolio Allocation' in text or 'Portfolio-Allokation' in text:
-        lines.append('<b>Allocazione Suggerita / Suggested Allocation / Vorgeschlagene Allokation:</b>')
-        
-        in_allocation = False
-        for line in text.split('\n'):
-            if 'Allocazione di Portafoglio' in line or 'Portfolio Allocation' in line or 'Portfolio-Allokation' in line:
-                in_allocation = True
-                continue
-            if in_allocation and ('Azioni' in line or 'Stocks' in line or 'Aktien' in line or 
-                                 'Obbligazioni' in line or 'Bonds' in line or 'Anleihen' in line or
-                                 'Oro' in line or 'Gold' in line):
-                clean_line = line.strip().replace('**', '').replace('- ', '• ')
-                lines.append(clean_line)
-            if in_allocation and line.strip().startswith('---'):
-                break
-    
-    return lines
+def genera_pdf_piano_finanziario_cache(
+    dati_base,
+    dati_demografici,
+    profilo_rischio,
+    obiettivi,
+    report_fase1_text,
+    report_fase2_text,
+    report_fase3_text,
+    lang='it'
+):
+    """
+    Come genera_pdf_piano_finanziario, ma riusa i PDF già generati con lo stesso contenuto.
+    
+    Returns:
+        BytesIO: Buffer contenente il PDF
+    """
+    argomenti = (
+        dati_base, dati_demografici, profilo_rischio, obiettivi,
+        report_fase1_text, report_fase2_text, report_fase3_text, lang
+    )
+    chiave = chiave_pdf(*argomenti)
+    
+    dati_pdf = PDF_CACHE.get(chiave)
+    if dati_pdf is None:
+        dati_pdf = genera_pdf_piano_finanziario(*argomenti).getvalue()
+        PDF_CACHE.set(chiave, dati_pdf)
+    
+    return BytesIO(dati_pdf)
 
 
-def _clean_emoji(text):
-    """Rimuove emoji problematici per il PDF."""
-    # Lista di emoji comuni che possono causare problemi
-    emoji_map = {
-        '💰': '[€]',
-        '💵': '[€]',
-        '💳': '[Card]',
-        '🏦': '[Bank]',
-        '📊': '[Chart]',
-        '🎯': '[Target]',
-        '📈': '[Growth]',
-        '📉': '[Down]',
-        '⚠️': '[!]',
-        '✅': '[OK]',
-        '❌': '[X]',
-        '🛡️': '[Shield]',
-        '🎓': '[Education]',
-        '🔗': '[Link]',
-        '💡': '[Idea]',
-        '📚': '[Books]',
-        '📺': '[Video]',
-        '🌍': '',
-        '🇮🇹': 'IT',
-        '🇬🇧': 'EN',
-        '🇩🇪': 'DE',
-        '🚀': '[->]',
-        '💎': '[Diamond]',
-        '🧮': '[Calc]',
-        '🛒': '[Shop]',
-        '⏱️': '[Time]',
-        '📄': '[Doc]',
-        '🏠': '[Home]',
-        '💼': '[Work]',
-        '🥇': '[Gold]',
-        '📋': '[List]'
-    }
-    
-    for emoji, replacement in emoji_map.items():
-        text = text.replace(emoji, replacement)
+def _markdown_to_flowables(text):
+    """Converte il markdown di un report in flowable, senza il titolo iniziale della fase."""
+    return compila_markdown(_clean_emoji(text), salta_titolo_iniziale=True)
+
+
+# Sostituzioni testuali per emoji e simboli non supportati dai font standard del PDF
+EMOJI_MAP = {
+    '💰': '[€]',
+    '💵': '[€]',
+    '💳': '[Card]',
+    '🏦': '[Bank]',
+    '📊': '[Chart]',
+    '🎯': '[Target]',
+    '📈': '[Growth]',
+    '📉': '[Down]',
+    '⚠️': '[!]',
+    '🚨': '[!]',
+    '✅': '[OK]',
+    '❌': '[X]',
+    '⛔': '[X]',
+    '🛡️': '[Shield]',
+    '🎓': '[Education]',
+    '🔗': '[Link]',
+    '💡': '[Idea]',
+    'ℹ️': '[i]',
+    '📚': '[Books]',
+    '📺': '[Video]',
+    '🌍': '',
+    '🇮🇹': 'IT',
+    '🇬🇧': 'EN',
+    '🇩🇪': 'DE',
+    '🚀': '[->]',
+    '💎': '[Diamond]',
+    '🧮': '[Calc]',
+    '🛒': '[Shop]',
+    '⏱️': '[Time]',
+    '📄': '[Doc]',
+    '📅': '[Date]',
+    '🏠': '[Home]',
+    '💼': '[Work]',
+    '🥇': '[Gold]',
+    '🎁': '[Gift]',
+    '📋': '[List]',
+    '→': '->',
+    '≈': '~'
+}
+
+# Sostituzione per le emoji non presenti in EMOJI_MAP
+EMOJI_FALLBACK = ''
+
+_APICI = str.maketrans('⁰¹²³⁴⁵⁶⁷⁸⁹', '0123456789')
+
+_EMOJI_PATTERN = re.compile(
+    # Voci della mappa (le più lunghe prima), con o senza variation selector
+    '(?P<mappa>' + '|'.join(
+        re.escape(chiave) for chiave in sorted(
+            {chiave.replace('\ufe0f', '') for chiave in EMOJI_MAP}, key=len, reverse=True
+        )
+    ) + ')\ufe0f?'
+    # Bandiere: coppie di regional indicator
+    '|(?P<bandiera>[\U0001F1E6-\U0001F1FF]{2})'
+    # Esponenti non presenti nei font standard (es. ³⁰ → ^30)
+    '|(?P<apice>[⁰¹²³⁴-⁹]*[⁰⁴-⁹][⁰¹²³⁴-⁹]*)'
+    # Qualsiasi altra emoji, con modificatori, ZWJ, tag e variation selector
+    '|(?P<emoji>(?:[\U0001F000-\U0001FAFF\u2300-\u23FF\u2600-\u27BF\u2B00-\u2BFF]'
+    '[\ufe00-\ufe0f\u20e3\U000E0020-\U000E007F\U0001F3FB-\U0001F3FF]*\u200d?)+)'
+    # Caratteri invisibili isolati (variation selector, ZWJ, keycap: 1️⃣ → 1)
+    '|(?P<invisibile>[\ufe00-\ufe0f\u200d\u20e3])'
+)
+_EMOJI_MAPPA_NORMALIZZATA = {chiave.replace('\ufe0f', ''): valore for chiave, valore in EMOJI_MAP.items()}
+
+# Caratteri che possono iniziare una sostituzione (devono includere quelli delle chiavi di EMOJI_MAP):
+# il testo ordinario viene saltato senza provare le alternative di _EMOJI_PATTERN
+_CANDIDATI_PATTERN = re.compile(
+    '[\u00b2\u00b3\u00b9\u2070-\u2079\u200d\u20e3\u2139\u2190-\u21FF\u2248\u2300-\u23FF\u2600-\u27BF\u2B00-\u2BFF'
+    '\ufe00-\ufe0f\U0001F000-\U0001FAFF\U000E0020-\U000E007F]+'
+)
+
+
+def _clean_emoji(text, fallback=None):
+    """
+    Sostituisce emoji e simboli non supportati dal PDF in un solo passaggio.
     
-    return text
+    Args:
+        text (str): Testo da ripulire (anche un report intero)
+        fallback (str): Sostituzione per le emoji non mappate (default: EMOJI_FALLBACK)
+        
+    Returns:
+        str: Testo ripulito
+    """
+    if fallback is None:
+        fallback = EMOJI_FALLBACK
+    return _CANDIDATI_PATTERN.sub(lambda candidati: _sostituisci_sequenza(candidati.group(), fallback), text)
+
+
+@lru_cache(maxsize=1024)
+def _sostituisci_sequenza(sequenza, fallback):
+    """Traduce una sequenza di caratteri candidati (le stesse emoji si ripetono in ogni report)."""
+    def sostituisci(match):
+        tipo = match.lastgroup
+        if tipo == 'mappa':
+            return _EMOJI_MAPPA_NORMALIZZATA[match.group('mappa')]
+        if tipo == 'bandiera':
+            return ''.join(chr(ord(c) - 0x1F1E6 + ord('A')) for c in match.group('bandiera'))
+        if tipo == 'apice':
+            return '^' + match.group('apice').translate(_APICI)
+        if tipo == 'invisibile':
+            return ''
+        return fallback
+    
+    return _EMOJI_PATTERN.sub(sostituisci, sequenza)
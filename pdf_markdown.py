@@ -0,0 +1,343 @@
+"""
+PDF Markdown Module
+Converte il markdown dei report in flowable ReportLab (titoli, elenchi, tabelle, codice,
+grassetto/corsivo, link) con un tokenizzatore a passaggio singolo.
+
+I token di ogni sezione (blocchi separati da ---) sono memorizzati: le sezioni statiche,
+identiche per tutti gli utenti, vengono analizzate una sola volta per processo.
+I flowable sono invece ricreati a ogni documento, perché ReportLab li modifica durante il layout.
+"""
+
+import re
+from functools import lru_cache
+
+from reportlab.lib import colors
+from reportlab.lib.units import cm
+from reportlab.platypus import Paragraph, Preformatted, Spacer, Table
+from reportlab.platypus.flowables import HRFlowable
+
+from pdf_styles import get_stile, get_stile_tabella
+
+
+# Larghezza utile di una pagina A4 con margini di 2 cm
+LARGHEZZA_PAGINA = 17 * cm
+
+_RE_TITOLO = re.compile(r'^(#{1,6})\s+(.*?)\s*#*$')
+_RE_SEPARATORE = re.compile(r'^(?:-{3,}|\*{3,}|_{3,})$')
+_RE_ELENCO = re.compile(r'^(\s*)([-*+]|\d+[.)])\s+(.*)$')
+_RE_RIGA_ALLINEAMENTO = re.compile(r'^\|?\s*:?-+:?\s*(?:\|\s*:?-+:?\s*)*\|?$')
+_RE_MARCATORE_INIZIALE = re.compile(r'^\[[^\]]*\]\s*')
+
+_RE_CODICE_INLINE = re.compile(r'`([^`]+)`')
+_RE_LINK = re.compile(r'\[([^\]]+)\]\(([^)\s]+)\)')
+_RE_GRASSETTO = re.compile(r'\*\*(?!\s)(.+?)(?<!\s)\*\*|__(?!\s)(.+?)(?<!\s)__')
+_RE_CORSIVO = re.compile(r'(?<![\w*])\*(?![\s*])(.+?)(?<![\s*])\*(?![\w*])|(?<!\w)_(?![\s_])(.+?)(?<![\s_])_(?!\w)')
+
+# Parole chiave che determinano il tono di un paragrafo (dopo la pulizia delle emoji)
+_AVVISO = ('[!]', 'ATTENZIONE', 'WARNING', 'ACHTUNG')
+_SUCCESSO = ('[OK]', 'Complimenti', 'Congratulations', 'Glückwunsch')
+
+_STILI_TONO = {
+    'normale': 'CustomNormal',
+    'avviso': 'CustomWarning',
+    'successo': 'CustomSuccess'
+}
+_COLORI_TONO = {
+    'avviso': '#e74c3c',
+    'successo': '#27ae60'
+}
+
+
+# ============================================================================
+# TOKENIZZAZIONE
+# ============================================================================
+
+def _escape(testo):
+    """Escape dei caratteri speciali del markup dei Paragraph."""
+    return testo.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def _inline(testo):
+    """
+    Converte il markdown inline in markup ReportLab.
+
+    Args:
+        testo (str): Testo markdown di una riga/paragrafo
+
+    Returns:
+        str: Markup per Paragraph (caratteri speciali già escapati)
+    """
+    testo = _escape(testo)
+
+    # Il contenuto del codice inline non va interpretato
+    codici = []
+
+    def proteggi(match):
+        codici.append(match.group(1))
+        return f'\x00{len(codici) - 1}\x00'
+
+    testo = _RE_CODICE_INLINE.sub(proteggi, testo)
+    testo = _RE_LINK.sub(r'<link href="\2" color="#1f77b4">\1</link>', testo)
+    testo = _RE_GRASSETTO.sub(lambda m: f'<b>{m.group(1) or m.group(2)}</b>', testo)
+    testo = _RE_CORSIVO.sub(lambda m: f'<i>{m.group(1) or m.group(2)}</i>', testo)
+
+    if codici:
+        testo = re.sub(
+            '\x00(\\d+)\x00',
+            lambda m: f'<font face="Courier">{codici[int(m.group(1))]}</font>',
+            testo
+        )
+    return testo
+
+
+def _tono(testo):
+    """Restituisce il tono ('normale', 'avviso', 'successo') di un testo."""
+    if any(parola in testo for parola in _AVVISO):
+        return 'avviso'
+    if any(parola in testo for parola in _SUCCESSO):
+        return 'successo'
+    return 'normale'
+
+
+def _celle(riga):
+    """Divide una riga di tabella markdown nelle sue celle."""
+    riga = riga.strip()
+    if riga.startswith('|'):
+        riga = riga[1:]
+    if riga.endswith('|'):
+        riga = riga[:-1]
+    return tuple(_inline(cella.strip()) for cella in riga.split('|'))
+
+
+@lru_cache(maxsize=512)
+def _tokenizza_sezione(sezione):
+    """
+    Tokenizza una sezione di markdown in un solo passaggio sulle righe.
+
+    Token prodotti (tuple, quindi condivisibili tra documenti):
+        ('titolo', livello, markup)
+        ('paragrafo', markup, tono)
+        ('elenco', ((livello, marcatore, markup, tono), ...))
+        ('tabella', ((cella, ...), ...))  - la prima riga è l'intestazione
+        ('codice', testo)
+    """
+    token = []
+    paragrafo = []
+    elenco = []
+    tabella = []
+    codice = None
+    spazi_finali = False
+
+    def chiudi_paragrafo():
+        if paragrafo:
+            testo = ''.join(paragrafo)
+            token.append(('paragrafo', _inline(testo).replace('\n', '<br/>'), _tono(testo)))
+            paragrafo.clear()
+
+    def chiudi_elenco():
+        if elenco:
+            token.append(('elenco', tuple(
+                (livello, marcatore, _inline(testo), _tono(testo))
+                for livello, marcatore, testo in elenco
+            )))
+            elenco.clear()
+
+    def chiudi_tabella():
+        if tabella:
+            righe = [_celle(riga) for riga in tabella if not _RE_RIGA_ALLINEAMENTO.match(riga.strip())]
+            token.append(('tabella', tuple(righe)))
+            tabella.clear()
+
+    def chiudi_blocchi():
+        chiudi_paragrafo()
+        chiudi_elenco()
+        chiudi_tabella()
+
+    for riga in sezione.split('\n'):
+        pulita = riga.strip()
+
+        # Blocchi di codice
+        if codice is not None:
+            if pulita.startswith('```'):
+                token.append(('codice', '\n'.join(codice)))
+                codice = None
+            else:
+                codice.append(riga.rstrip())
+            continue
+        if pulita.startswith('```'):
+            chiudi_blocchi()
+            codice = []
+            continue
+
+        if not pulita:
+            chiudi_paragrafo()
+            chiudi_tabella()
+            continue
+
+        # Tabelle
+        if pulita.startswith('|'):
+            chiudi_paragrafo()
+            chiudi_elenco()
+            tabella.append(pulita)
+            continue
+        chiudi_tabella()
+
+        # Titoli
+        match = _RE_TITOLO.match(pulita)
+        if match:
+            chiudi_blocchi()
+            testo = _RE_MARCATORE_INIZIALE.sub('', match.group(2))
+            token.append(('titolo', len(match.group(1)), _inline(testo)))
+            continue
+
+        # Separatori orizzontali
+        if _RE_SEPARATORE.match(pulita):
+            chiudi_blocchi()
+            token.append(('separatore',))
+            continue
+
+        # Elenchi puntati e numerati (rientro di 2-3 spazi = livello successivo)
+        match = _RE_ELENCO.match(riga)
+        if match:
+            chiudi_paragrafo()
+            livello = min(len(match.group(1).expandtabs(4)) // 2, 2)
+            marcatore = match.group(2)
+            marcatore = '•' if marcatore in '-*+' else marcatore
+            elenco.append((livello, marcatore, match.group(3).strip()))
+            continue
+
+        # Continuazione di una voce di elenco rientrata
+        if elenco and riga[:1].isspace() and not paragrafo:
+            livello, marcatore, testo = elenco[-1]
+            elenco[-1] = (livello, marcatore, testo + ' ' + pulita)
+            continue
+
+        chiudi_elenco()
+        if paragrafo:
+            # A capo esplicito: due spazi o backslash a fine riga, oppure riga che inizia con un'etichetta in grassetto
+            a_capo = spazi_finali or paragrafo[-1].endswith('\\') or pulita.startswith('**')
+            paragrafo[-1] = paragrafo[-1].rstrip('\\')
+            paragrafo.append(('\n' if a_capo else ' ') + pulita)
+        else:
+            paragrafo.append(pulita)
+        spazi_finali = riga.endswith('  ')
+
+    if codice is not None:
+        token.append(('codice', '\n'.join(codice)))
+    chiudi_blocchi()
+    return tuple(token)
+
+
+def tokenizza_markdown(testo):
+    """
+    Tokenizza un report markdown.
+
+    Il testo viene diviso nelle sezioni separate da righe '---'; i token di ogni
+    sezione sono memorizzati, quindi le sezioni statiche si analizzano una sola volta.
+
+    Args:
+        testo (str): Report in markdown (emoji già rimosse)
+
+    Returns:
+        list: Token (vedi _tokenizza_sezione) più ('separatore',) tra le sezioni
+    """
+    token = []
+    for indice, sezione in enumerate(re.split(r'(?m)^[ \t]*---[ \t]*$', testo)):
+        if indice:
+            token.append(('separatore',))
+        token.extend(_tokenizza_sezione(sezione))
+    return token
+
+
+# ============================================================================
+# COSTRUZIONE DEI FLOWABLE
+# ============================================================================
+
+def _paragrafo(markup, stile, **kwargs):
+    """Crea un Paragraph; se il markup non è valido ripiega sul testo semplice."""
+    try:
+        return Paragraph(markup, stile, **kwargs)
+    except ValueError:
+        testo = re.sub(r'<[^>]+>', '', markup)
+        return Paragraph(testo, stile, **kwargs)
+
+
+def _con_tono(markup, tono):
+    """Applica colore e grassetto del tono a un frammento di markup."""
+    if tono == 'normale':
+        return markup
+    return f'<font color="{_COLORI_TONO[tono]}"><b>{markup}</b></font>'
+
+
+def _tabella(righe, larghezza):
+    """Crea una Table con celle a capo automatico e colonne di uguale larghezza."""
+    colonne = max(len(riga) for riga in righe)
+    stile_intestazione = get_stile('MdCellaIntestazione')
+    stile_cella = get_stile('MdCella')
+    dati = []
+    for indice, riga in enumerate(righe):
+        stile = stile_intestazione if indice == 0 else stile_cella
+        celle = [_paragrafo(cella, stile) for cella in riga]
+        celle += [''] * (colonne - len(celle))
+        dati.append(celle)
+    tabella = Table(dati, colWidths=[larghezza / colonne] * colonne, repeatRows=1, hAlign='LEFT')
+    tabella.setStyle(get_stile_tabella('Markdown'))
+    return tabella
+
+
+def compila_markdown(testo, salta_titolo_iniziale=False, larghezza=LARGHEZZA_PAGINA):
+    """
+    Converte un report markdown in flowable ReportLab.
+
+    Args:
+        testo (str): Report in markdown (emoji già rimosse)
+        salta_titolo_iniziale (bool): Se True ignora il primo titolo (già stampato dal PDF)
+        larghezza (float): Larghezza disponibile per le tabelle
+
+    Returns:
+        list: Flowable pronti per la story del documento
+    """
+    flowables = []
+    stili_titolo = {
+        1: get_stile('CustomSubtitle'),
+        2: get_stile('CustomSection'),
+        3: get_stile('MdTitolo3')
+    }
+
+    for token in tokenizza_markdown(testo):
+        tipo = token[0]
+
+        if tipo == 'titolo':
+            if salta_titolo_iniziale and not flowables:
+                salta_titolo_iniziale = False
+                continue
+            flowables.append(_paragrafo(token[2], stili_titolo.get(token[1], get_stile('MdTitolo4'))))
+
+        elif tipo == 'paragrafo':
+            flowables.append(_paragrafo(token[1], get_stile(_STILI_TONO[token[2]])))
+
+        elif tipo == 'elenco':
+            for livello, marcatore, markup, tono in token[1]:
+                flowables.append(_paragrafo(
+                    _con_tono(markup, tono),
+                    get_stile(f'MdElenco{livello}'),
+                    bulletText=marcatore
+                ))
+            flowables.append(Spacer(1, 0.15 * cm))
+
+        elif tipo == 'tabella':
+            flowables.append(_tabella(token[1], larghezza))
+            flowables.append(Spacer(1, 0.3 * cm))
+
+        elif tipo == 'codice':
+            flowables.append(Preformatted(token[1], get_stile('MdCodice')))
+
+        elif tipo == 'separatore':
+            # Niente separatori all'inizio o ripetuti
+            if flowables and not isinstance(flowables[-1], HRFlowable):
+                flowables.append(HRFlowable(
+                    width='100%', thickness=0.5, color=colors.lightgrey,
+                    spaceBefore=4, spaceAfter=8
+                ))
+
+    return flowables
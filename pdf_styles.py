@@ -0,0 +1,276 @@
+"""
+PDF Styles Module
+Registro degli stili ReportLab (paragrafi e tabelle) condivisi da tutti i PDF.
+Gli stili vengono costruiti una sola volta per processo e non sono modificabili:
+per aggiungerne di nuovi si usano registra_stile() e registra_stile_tabella().
+"""
+
+from types import MappingProxyType
+
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import TableStyle
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
+
+
+class StileParagrafo(ParagraphStyle):
+    """
+    ParagraphStyle condiviso e non modificabile dopo la costruzione.
+
+    Il genitore può essere un qualsiasi ParagraphStyle: i suoi attributi vengono
+    copiati alla costruzione, come fa ReportLab.
+    """
+
+    def __init__(self, name, parent=None, **kw):
+        attributi = {}
+        if parent is not None:
+            attributi = {
+                chiave: valore for chiave, valore in parent.__dict__.items()
+                if chiave not in ('name', 'parent', '_congelato')
+            }
+        attributi.update(kw)
+        super().__init__(name, **attributi)
+        self.__dict__['_congelato'] = True
+
+    def __setattr__(self, nome, valore):
+        if self.__dict__.get('_congelato'):
+            raise AttributeError(f"Lo stile '{self.name}' è condiviso e non modificabile")
+        super().__setattr__(nome, valore)
+
+
+class StileTabella(TableStyle):
+    """TableStyle condiviso: i comandi sono fissati alla costruzione."""
+
+    def add(self, *cmd):
+        raise AttributeError("Lo stile di tabella è condiviso e non modificabile")
+
+
+# Foglio di stile di base di ReportLab (costruito una sola volta)
+_BASE = getSampleStyleSheet()
+
+_stili = {}
+_stili_tabella = {}
+
+# Viste in sola lettura dei registri
+STILI = MappingProxyType(_stili)
+STILI_TABELLA = MappingProxyType(_stili_tabella)
+
+
+def registra_stile(nome, parent='Normal', **attributi):
+    """
+    Registra un nuovo stile di paragrafo condiviso.
+
+    Args:
+        nome (str): Nome univoco dello stile
+        parent (str): Stile genitore (registrato o del foglio base di ReportLab)
+        **attributi: Attributi di ParagraphStyle (fontSize, textColor, ...)
+
+    Returns:
+        StileParagrafo: Lo stile registrato
+    """
+    if nome in _stili:
+        raise ValueError(f"Stile '{nome}' già registrato")
+    genitore = None
+    if parent is not None:
+        genitore = _stili[parent] if parent in _stili else _BASE[parent]
+    stile = StileParagrafo(nome, parent=genitore, **attributi)
+    _stili[nome] = stile
+    return stile
+
+
+def registra_stile_tabella(nome, comandi):
+    """
+    Registra un nuovo stile di tabella condiviso.
+
+    Args:
+        nome (str): Nome univoco dello stile
+        comandi (list): Comandi TableStyle
+
+    Returns:
+        StileTabella: Lo stile registrato
+    """
+    if nome in _stili_tabella:
+        raise ValueError(f"Stile di tabella '{nome}' già registrato")
+    stile = StileTabella(comandi)
+    _stili_tabella[nome] = stile
+    return stile
+
+
+def get_stile(nome):
+    """Restituisce uno stile di paragrafo registrato."""
+    return _stili[nome]
+
+
+def get_stile_tabella(nome):
+    """Restituisce uno stile di tabella registrato."""
+    return _stili_tabella[nome]
+
+
+# ============================================================================
+# STILI DEL PIANO FINANZIARIO
+# ============================================================================
+
+# Stile personalizzato per titolo
+registra_stile(
+    'CustomTitle',
+    parent='Heading1',
+    fontSize=24,
+    textColor=colors.HexColor('#1f77b4'),
+    spaceAfter=30,
+    alignment=TA_CENTER,
+    fontName='Helvetica-Bold'
+)
+
+# Stile per sottotitoli
+registra_stile(
+    'CustomSubtitle',
+    parent='Heading2',
+    fontSize=16,
+    textColor=colors.HexColor('#2c3e50'),
+    spaceAfter=12,
+    spaceBefore=12,
+    fontName='Helvetica-Bold'
+)
+
+# Stile per sezioni
+registra_stile(
+    'CustomSection',
+    parent='Heading3',
+    fontSize=14,
+    textColor=colors.HexColor('#34495e'),
+    spaceAfter=10,
+    spaceBefore=10,
+    fontName='Helvetica-Bold'
+)
+
+# Stile per testo normale
+registra_stile(
+    'CustomNormal',
+    parent='Normal',
+    fontSize=10,
+    alignment=TA_JUSTIFY,
+    spaceAfter=8,
+    fontName='Helvetica'
+)
+
+# Stile per warning/info
+registra_stile(
+    'CustomWarning',
+    parent='Normal',
+    fontSize=10,
+    textColor=colors.HexColor('#e74c3c'),
+    spaceAfter=8,
+    fontName='Helvetica-Bold'
+)
+
+registra_stile(
+    'CustomSuccess',
+    parent='Normal',
+    fontSize=10,
+    textColor=colors.HexColor('#27ae60'),
+    spaceAfter=8,
+    fontName='Helvetica-Bold'
+)
+
+# Tabella riepilogo dati inseriti
+registra_stile_tabella('DatiInseriti', [
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 10),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
+])
+
+# Tabella obiettivi
+registra_stile_tabella('Obiettivi', [
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 11),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 10),
+])
+
+# ============================================================================
+# STILI DEL MARKDOWN DEI REPORT (vedi pdf_markdown)
+# ============================================================================
+
+registra_stile(
+    'MdTitolo3',
+    parent='Heading4',
+    fontSize=12,
+    leading=15,
+    textColor=colors.HexColor('#34495e'),
+    spaceAfter=6,
+    spaceBefore=8,
+    fontName='Helvetica-Bold',
+    keepWithNext=1
+)
+
+registra_stile(
+    'MdTitolo4',
+    parent='Heading5',
+    fontSize=10.5,
+    leading=13,
+    textColor=colors.HexColor('#2c3e50'),
+    spaceAfter=4,
+    spaceBefore=6,
+    fontName='Helvetica-BoldOblique',
+    keepWithNext=1
+)
+
+# Voci di elenco per livello di rientro
+for _livello in range(3):
+    registra_stile(
+        f'MdElenco{_livello}',
+        parent='CustomNormal',
+        alignment=TA_LEFT,
+        leftIndent=14 + 14 * _livello,
+        bulletIndent=2 + 14 * _livello,
+        spaceAfter=3
+    )
+
+registra_stile(
+    'MdCodice',
+    parent='Code',
+    fontSize=8.5,
+    leading=11,
+    backColor=colors.HexColor('#f4f6f7'),
+    borderPadding=4,
+    spaceBefore=4,
+    spaceAfter=8
+)
+
+registra_stile(
+    'MdCella',
+    parent='Normal',
+    fontSize=9,
+    leading=11,
+    fontName='Helvetica'
+)
+
+registra_stile(
+    'MdCellaIntestazione',
+    parent='MdCella',
+    textColor=colors.whitesmoke,
+    fontName='Helvetica-Bold'
+)
+
+registra_stile_tabella('Markdown', [
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f4f6f7')]),
+    ('TOPPADDING', (0, 0), (-1, -1), 4),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+])
@@ -0,0 +1,234 @@
+"""
+Pipeline Module
+Esegue la catena FASE 1 → FASE 2 → FASE 3 senza dipendere da Streamlit.
+Utilizzabile da worker, script batch e benchmark.
+"""
+
+from calculations import (
+    calcola_fondo_emergenza,
+    verifica_fondo_emergenza,
+    calcola_mesi_rientro_emergenza,
+    calcola_disponibilita_investimenti,
+    calcola_pac_obiettivi,
+    genera_allocazione_investimenti
+)
+from report_generator_fase1 import genera_report_fase1
+from report_generator_fase2 import genera_report_fase2
+from report_generator_fase3 import genera_report_fase3
+from report_cache import (
+    genera_report_fase1_cache,
+    genera_report_fase2_cache,
+    genera_report_fase3_cache
+)
+from pdf_generator import genera_pdf_piano_finanziario, genera_pdf_piano_finanziario_cache, chiave_pdf
+from profile_comparison import confronta_allocazioni
+from goal_optimizer import ha_flessibilita, ottimizza_obiettivi
+
+
+class PlanPipeline:
+    """
+    Pipeline headless del piano finanziario a tre fasi.
+
+    Esempio:
+        pipeline = PlanPipeline(lang='en')
+        risultato = pipeline.esegui(dati_base, obiettivi, 'Moderate', 30, genera_pdf=True)
+        risultato['pdf']  # bytes del PDF
+    """
+
+    def __init__(self, lang='it', usa_cache=True):
+        """
+        Args:
+            lang (str): Codice lingua dei report (it, en, de)
+            usa_cache (bool): Se True usa i generatori di report memorizzati (report_cache)
+                              e la cache dei PDF (pdf_generator.PDF_CACHE)
+        """
+        self.lang = lang
+        if usa_cache:
+            self._report_fase1 = genera_report_fase1_cache
+            self._report_fase2 = genera_report_fase2_cache
+            self._report_fase3 = genera_report_fase3_cache
+            self._pdf = genera_pdf_piano_finanziario_cache
+        else:
+            self._report_fase1 = genera_report_fase1
+            self._report_fase2 = genera_report_fase2
+            self._report_fase3 = genera_report_fase3
+            self._pdf = genera_pdf_piano_finanziario
+
+    def esegui(self, dati_base, obiettivi, profilo_rischio, anni_pensione, genera_pdf=False):
+        """
+        Calcola le tre fasi e genera i relativi report.
+
+        Args:
+            dati_base (dict): {'entrate', 'uscite', 'capitale', 'capitale_investito'}
+            obiettivi (list): Lista di dizionari {'nome', 'costo', 'anni'} ('rendimento', 'inflazione' opzionali, in %;
+                              'priorita', 'rinvio_massimo', 'riduzione_massima' opzionali, vedi goal_optimizer)
+            profilo_rischio (str): Profilo di rischio (qualsiasi lingua)
+            anni_pensione (int): Anni alla pensione
+            genera_pdf (bool): Se True genera anche il PDF
+
+        Returns:
+            dict: {
+                'input': parametri ricevuti,
+                'fase1': numeri e report FASE 1,
+                'fase2': numeri e report FASE 2 ('piano_obiettivi': goal_optimizer.ottimizza_obiettivi se il gap è negativo
+                         e almeno un obiettivo è flessibile, altrimenti None),
+                'fase3': numeri e report FASE 3,
+                'pdf': bytes del PDF oppure None
+            }
+        """
+        lang = self.lang
+        risparmio_mensile = dati_base['entrate'] - dati_base['uscite']
+
+        # FASE 1: Fondo di Emergenza
+        fondo_emergenza = calcola_fondo_emergenza(dati_base['uscite'])
+        fe_completo, differenza = verifica_fondo_emergenza(dati_base['capitale'], fondo_emergenza)
+
+        mesi_rientro = None
+        if not fe_completo and risparmio_mensile > 0:
+            mesi_rientro = calcola_mesi_rientro_emergenza(differenza, risparmio_mensile)
+
+        report_fase1 = self._report_fase1(
+            dati_base['capitale'],
+            fondo_emergenza,
+            differenza,
+            dati_base['uscite'],
+            risparmio_mensile,
+            mesi_rientro,
+            lang
+        )
+
+        # Capitale eccedente (sarà 0 se fondo emergenza incompleto)
+        capitale_eccedente = max(0, differenza)
+
+        # PAC degli obiettivi, calcolati una volta e passati al report della FASE 2
+        pac_obiettivi = calcola_pac_obiettivi(obiettivi) if obiettivi else None
+
+        # Piano consigliato solo se i PAC superano il risparmio e almeno un obiettivo è flessibile
+        piano_obiettivi = None
+        if obiettivi and ha_flessibilita(obiettivi) and float(pac_obiettivi.cumsum()[-1]) > risparmio_mensile:
+            piano_obiettivi = ottimizza_obiettivi(obiettivi, risparmio_mensile)
+
+        # FASE 2: Spese Prevedibili (PAC)
+        report_fase2, pac_totale, risparmio_disponibile, capitale_investibile_subito = self._report_fase2(
+            obiettivi,
+            dati_base['entrate'],
+            dati_base['uscite'],
+            capitale_eccedente,
+            lang,
+            piano_obiettivi=piano_obiettivi,
+            pac_obiettivi=pac_obiettivi
+        )
+
+        # FASE 3: Investimenti
+        disponibilita_mensile = calcola_disponibilita_investimenti(
+            dati_base['entrate'],
+            dati_base['uscite'],
+            pac_totale
+        )
+
+        report_fase3 = self._report_fase3(
+            disponibilita_mensile,
+            capitale_investibile_subito,
+            profilo_rischio,
+            anni_pensione,
+            lang,
+            liquidita=dati_base['capitale']
+        )
+
+        risultato = {
+            'input': {
+                'dati_base': dati_base,
+                'obiettivi': obiettivi,
+                'profilo_rischio': profilo_rischio,
+                'anni_pensione': anni_pensione,
+                'lang': lang
+            },
+            'fase1': {
+                'fondo_emergenza': fondo_emergenza,
+                'fe_completo': fe_completo,
+                'differenza': differenza,
+                'risparmio_mensile': risparmio_mensile,
+                'mesi_rientro': mesi_rientro,
+                'report': report_fase1
+            },
+            'fase2': {
+                'capitale_eccedente': capitale_eccedente,
+                'pac_totale': pac_totale,
+                'risparmio_disponibile': risparmio_disponibile,
+                'capitale_investibile_subito': capitale_investibile_subito,
+                'piano_obiettivi': piano_obiettivi,
+                'report': report_fase2
+            },
+            'fase3': {
+                'disponibilita_mensile': disponibilita_mensile,
+                'allocazione': genera_allocazione_investimenti(profilo_rischio, anni_pensione),
+                'report': report_fase3
+            },
+            'pdf': None
+        }
+
+        if genera_pdf:
+            risultato['pdf'] = self.genera_pdf(risultato)
+
+        return risultato
+
+    def confronta_profili(self, risultato, allocazioni_personalizzate=None):
+        """
+        Confronta i tre profili di rischio (e allocazioni personalizzate) sugli importi di un risultato.
+
+        Le FASI 1 e 2 non vengono ricalcolate: si riusano l'importo mensile e il capitale
+        investibile già presenti nel risultato di esegui().
+
+        Args:
+            risultato (dict): Risultato restituito da esegui()
+            allocazioni_personalizzate (dict): {nome: allocazione percentuale}, opzionale
+
+        Returns:
+            dict: Vedi profile_comparison.confronta_allocazioni
+        """
+        return confronta_allocazioni(
+            max(risultato['fase3']['disponibilita_mensile'], 0),
+            max(risultato['fase2']['capitale_investibile_subito'], 0),
+            risultato['input']['anni_pensione'],
+            allocazioni_personalizzate=allocazioni_personalizzate
+        )
+
+    def chiave_pdf(self, risultato):
+        """
+        Restituisce la chiave di contenuto del PDF di un risultato, senza generarlo.
+
+        Args:
+            risultato (dict): Risultato restituito da esegui()
+
+        Returns:
+            str: Digest SHA-256 esadecimale (vedi pdf_generator.chiave_pdf)
+        """
+        return chiave_pdf(*self._argomenti_pdf(risultato))
+
+    def genera_pdf(self, risultato):
+        """
+        Genera il PDF a partire da un risultato di esegui().
+
+        Args:
+            risultato (dict): Risultato restituito da esegui()
+
+        Returns:
+            bytes: Contenuto del PDF
+        """
+        buffer = self._pdf(*self._argomenti_pdf(risultato))
+        return buffer.getvalue()
+
+    @staticmethod
+    def _argomenti_pdf(risultato):
+        """Argomenti posizionali di genera_pdf_piano_finanziario per un risultato."""
+        dati = risultato['input']
+        return (
+            dati['dati_base'],
+            {'anni_pensione': dati['anni_pensione']},
+            dati['profilo_rischio'],
+            dati['obiettivi'],
+            risultato['fase1']['report'],
+            risultato['fase2']['report'],
+            risultato['fase3']['report'],
+            dati['lang']
+        )
@@ -0,0 +1,75 @@
+"""
+Profile Comparison Module
+Confronto affiancato dei profili di rischio (Conservatore, Moderato, Aggressivo) e di
+eventuali allocazioni personalizzate sugli stessi importi della FASE 3: tutte le righe sono
+proiettate in un'unica chiamata vettoriale di projections.serie_mensile, senza ricalcolare
+le FASI 1 e 2 per ogni profilo.
+"""
+
+import math
+
+import numpy as np
+
+from glide_path import matrice_glide_path, rendimenti_mensili_glide_path
+from market_assumptions import ASSET, INFLAZIONE_ATTESA, vettore_pesi, parametri_portafoglio
+from projections import serie_mensile, versato_totale
+
+
+# Profili confrontati per codice (vedi calculations.CODICI_PROFILO)
+PROFILI_CONFRONTO = (0, 1, 2)
+
+
+def confronta_allocazioni(contributo_mensile, capitale_iniziale, anni_pensione, profili=PROFILI_CONFRONTO,
+                          allocazioni_personalizzate=None, inflazione=INFLAZIONE_ATTESA):
+    """
+    Proietta gli stessi versamenti su più profili e allocazioni in una sola chiamata.
+
+    I profili seguono il proprio glide path; le allocazioni personalizzate restano
+    costanti per tutto l'orizzonte.
+
+    Args:
+        contributo_mensile (float): Importo investito ogni mese (FASE 3)
+        capitale_iniziale (float): Capitale investibile subito (FASE 2)
+        anni_pensione (float): Anni alla pensione (anche frazionari, arrotondati al mese)
+        profili (tuple): Codici dei profili da confrontare
+        allocazioni_personalizzate (dict): {nome: allocazione percentuale}, opzionale
+        inflazione (float): Inflazione annua usata per i valori in euro di oggi
+
+    Returns:
+        dict: {
+            'nomi': codici profilo (int) e nomi delle allocazioni personalizzate, R valori,
+            'allocazioni': allocazione attuale di ogni riga (dict),
+            'rendimento_atteso', 'volatilita': parametri annui dell'allocazione attuale, shape (R,),
+            'patrimonio_finale': valore atteso alla pensione, shape (R,),
+            'patrimonio_reale': lo stesso in euro di oggi, shape (R,),
+            'versato': totale versato (comune a tutte le righe)
+        }
+    """
+    anni = max(float(anni_pensione), 0.0)
+    anni_interi = math.ceil(anni)
+    profili = tuple(profili)
+    personalizzate = dict(allocazioni_personalizzate or {})
+
+    # Matrice (R, anni_interi + 1, 3): glide path dei profili, allocazione costante per le personalizzate
+    matrici = [matrice_glide_path(profili, np.full(len(profili), anni), anni=anni_interi)] if profili else []
+    if personalizzate:
+        pesi = np.array([vettore_pesi(allocazione) * 100 for allocazione in personalizzate.values()])
+        matrici.append(np.repeat(pesi[:, np.newaxis, :], anni_interi + 1, axis=1))
+    matrice = np.concatenate(matrici, axis=0)
+
+    # Rendimento di ogni mese dell'orizzonte (l'ultimo anno può essere parziale)
+    rendimenti = rendimenti_mensili_glide_path(matrice, anni_interi)[:, :int(round(anni * 12))]
+    saldi = serie_mensile(contributo_mensile, capitale_iniziale, anni, rendimenti, per_mese=True)
+    patrimonio_finale = saldi[:, -1]
+
+    allocazioni = [dict(zip(ASSET, riga)) for riga in matrice[:, 0].tolist()]
+    parametri = np.array([parametri_portafoglio(allocazione) for allocazione in allocazioni])
+    return {
+        'nomi': list(profili) + list(personalizzate),
+        'allocazioni': allocazioni,
+        'rendimento_atteso': parametri[:, 0],
+        'volatilita': parametri[:, 1],
+        'patrimonio_finale': patrimonio_finale,
+        'patrimonio_reale': patrimonio_finale / (1 + inflazione) ** anni,
+        'versato': versato_totale(contributo_mensile, capitale_iniziale, anni)
+    }
@@ -0,0 +1,138 @@
+"""
+Projections Module
+Proiezione deterministica del patrimonio (PAC mensile + capitale iniziale) con rendimento,
+TER e inflazione. Formule chiuse (rendita) quando serve solo il valore finale, serie mensile
+vettorizzata con prodotto cumulato quando serve l'intero andamento. Tutte le funzioni
+accettano array NumPy per calcolare molti nuclei familiari in una sola chiamata.
+"""
+
+import numpy as np
+
+
+def rendimento_netto(rendimento_annuo, ter=0.0):
+    """
+    Rendimento annuo al netto dei costi, con il TER applicato in modo geometrico.
+
+    (1 + netto) = (1 + lordo) × (1 - TER): la stessa convenzione del drift di
+    market_assumptions.parametri_lognormali_mensili (log1p(-ter)), così proiezione
+    deterministica e Monte Carlo usano lo stesso modello dei costi.
+
+    Args:
+        rendimento_annuo (float | array): Rendimento lordo annuo (es. 0.07)
+        ter (float | array): Costi annui (es. 0.002 per 0.20%)
+
+    Returns:
+        float | np.ndarray: Rendimento netto annuo
+    """
+    return (1 + np.asarray(rendimento_annuo, dtype=float)) * (1 - np.asarray(ter, dtype=float)) - 1
+
+
+def tasso_mensile(rendimento_annuo, ter=0.0, inflazione=0.0):
+    """
+    Calcola il tasso mensile equivalente al rendimento annuo netto (e reale).
+
+    Il rendimento netto è (1 + lordo) × (1 - TER) - 1 (vedi rendimento_netto); con
+    inflazione > 0 il tasso è reale, quindi i valori risultanti sono in euro di oggi.
+
+    Args:
+        rendimento_annuo (float | array): Rendimento lordo annuo (es. 0.07)
+        ter (float | array): Costi annui (es. 0.002 per 0.20%)
+        inflazione (float | array): Inflazione annua
+
+    Returns:
+        float | np.ndarray: Tasso mensile composto
+    """
+    reale = (1 + rendimento_netto(rendimento_annuo, ter)) / (1 + np.asarray(inflazione, dtype=float))
+    return reale ** (1 / 12) - 1
+
+
+def valore_finale(contributo_mensile, capitale_iniziale, anni, rendimento_annuo,
+                  ter=0.0, inflazione=0.0, anticipato=True):
+    """
+    Valore finale di PAC + capitale iniziale con formula chiusa (rendita).
+
+    Args:
+        contributo_mensile (float | array): Importo versato ogni mese
+        capitale_iniziale (float | array): Capitale investito subito
+        anni (float | array): Durata in anni
+        rendimento_annuo (float | array): Rendimento lordo annuo
+        ter (float | array): Costi annui
+        inflazione (float | array): Inflazione annua (valori in euro di oggi se > 0)
+        anticipato (bool): True se il contributo è versato a inizio mese
+
+    Returns:
+        float | np.ndarray: Valore finale (float se tutti gli input sono scalari)
+    """
+    i = tasso_mensile(rendimento_annuo, ter, inflazione)
+    mesi = np.asarray(anni, dtype=float) * 12
+    crescita = (1 + i) ** mesi
+
+    # Fattore di accumulo della rendita; con tasso nullo vale il numero di mesi
+    nullo = np.abs(i) < 1e-12
+    fattore = np.where(nullo, mesi, (crescita - 1) / np.where(nullo, 1.0, i))
+    if anticipato:
+        fattore = fattore * (1 + i)
+
+    risultato = np.asarray(capitale_iniziale, dtype=float) * crescita + np.asarray(contributo_mensile, dtype=float) * fattore
+    return float(risultato) if np.ndim(risultato) == 0 else risultato
+
+
+def serie_mensile(contributo_mensile, capitale_iniziale, anni, rendimento_annuo,
+                  ter=0.0, inflazione=0.0, anticipato=True, per_mese=False):
+    """
+    Saldo mese per mese di PAC + capitale iniziale, vettorizzato con prodotto cumulato.
+
+    Il rendimento può anche variare mese per mese: con per_mese=True rendimento_annuo ha
+    come ultima dimensione i mesi (shape (..., anni * 12)). Senza il flag un array di
+    shape (N,) è sempre un rendimento per nucleo, anche quando N coincide con i mesi.
+
+    Args:
+        contributo_mensile (float | array): Importo versato ogni mese, shape (N,) per più nuclei
+        capitale_iniziale (float | array): Capitale investito subito, shape (N,)
+        anni (float): Durata in anni (comune a tutti i nuclei), arrotondata al mese
+        rendimento_annuo (float | array): Rendimento lordo annuo, shape (N,) o (N, mesi) con per_mese
+        ter (float | array): Costi annui
+        inflazione (float | array): Inflazione annua
+        anticipato (bool): True se il contributo è versato a inizio mese
+        per_mese (bool): True se l'ultima dimensione di rendimento_annuo sono i mesi
+
+    Returns:
+        np.ndarray: Saldi a fine mese 0..mesi, shape (..., mesi + 1)
+
+    Raises:
+        ValueError: Se per_mese=True e l'ultima dimensione non ha `mesi` elementi
+    """
+    mesi = int(round(anni * 12))
+    i = np.asarray(tasso_mensile(rendimento_annuo, ter, inflazione), dtype=float)
+    if not per_mese:
+        i = np.repeat(i[..., np.newaxis], mesi, axis=-1)
+    elif i.ndim == 0 or i.shape[-1] != mesi:
+        raise ValueError(f"Rendimenti mensili: attesi {mesi} mesi, trovata shape {i.shape}")
+
+    contributo = np.asarray(contributo_mensile, dtype=float)[..., np.newaxis]
+    capitale = np.asarray(capitale_iniziale, dtype=float)[..., np.newaxis]
+
+    # crescita[..., t] = prodotto dei fattori dei primi t mesi (crescita[..., 0] = 1)
+    fattori = 1 + i
+    crescita = np.concatenate([np.ones(fattori.shape[:-1] + (1,)), np.cumprod(fattori, axis=-1)], axis=-1)
+
+    # Ogni contributo cresce da quando è versato: saldo_t = crescita_t × (capitale + Σ c / crescita_k)
+    if anticipato:
+        sconti = 1 / crescita[..., :-1]
+    else:
+        sconti = 1 / crescita[..., 1:]
+    versamenti_scontati = np.concatenate(
+        [np.zeros(sconti.shape[:-1] + (1,)), np.cumsum(sconti, axis=-1)], axis=-1
+    )
+    return crescita * (capitale + contributo * versamenti_scontati)
+
+
+def versato_totale(contributo_mensile, capitale_iniziale, anni):
+    """
+    Totale versato (capitale iniziale + contributi) nel periodo.
+
+    Returns:
+        float | np.ndarray: Importo versato
+    """
+    risultato = np.asarray(capitale_iniziale, dtype=float) + np.asarray(contributo_mensile, dtype=float) * np.asarray(anni, dtype=float) * 12
+    return float(risultato) if np.ndim(risultato) == 0 else risultato
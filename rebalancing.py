@@ -0,0 +1,184 @@
+"""
+Rebalancing Module
+Simulazione del ribilanciamento dell'allocazione (Azioni/Obbligazioni/Oro) su percorsi di
+rendimento simulati (monte_carlo.simula_rendimenti_asset) o storici. Confronta le regole:
+nessun ribilanciamento, a calendario, a soglia e solo con i nuovi versamenti.
+
+Tutti i calcoli sono vettorizzati sui percorsi: ogni percorso può anche essere un cliente
+diverso (contributo, capitale e pesi obiettivo accettano array di shape (P,) o (P, 3)).
+"""
+
+import numpy as np
+
+from market_assumptions import vettore_pesi
+
+
+# Regole di ribilanciamento supportate
+POLITICHE = ('nessuno', 'calendario', 'soglia', 'solo_contributi')
+
+# Parametri predefiniti delle regole
+MESI_CALENDARIO = 12
+SOGLIA_DERIVA = 0.05
+COSTO_TRANSAZIONE = 0.001
+
+
+def _pesi_obiettivo(allocazione, n_percorsi):
+    """Converte l'allocazione (dict percentuale o array di pesi) in pesi di shape (P, 3)."""
+    if isinstance(allocazione, dict):
+        pesi = vettore_pesi(allocazione)
+    else:
+        pesi = np.asarray(allocazione, dtype=float)
+        pesi = pesi / pesi.sum(axis=-1, keepdims=True)
+    return np.broadcast_to(pesi, (n_percorsi, pesi.shape[-1]))
+
+
+def _ripartisci_contributo(posizioni, pesi, contributo):
+    """
+    Versa il contributo prima sulle classi sottopesate, poi secondo i pesi obiettivo.
+
+    Args:
+        posizioni (np.ndarray): Valore per classe di attivo, shape (P, 3)
+        pesi (np.ndarray): Pesi obiettivo, shape (P, 3)
+        contributo (np.ndarray): Importo da versare, shape (P,)
+
+    Returns:
+        np.ndarray: Importo versato su ogni classe, shape (P, 3)
+    """
+    totale = posizioni.sum(axis=1) + contributo
+    mancanze = np.maximum(pesi * totale[:, np.newaxis] - posizioni, 0.0)
+    somma_mancanze = mancanze.sum(axis=1)
+
+    # Parte del contributo che colma le mancanze, il resto secondo i pesi
+    verso_mancanze = np.minimum(contributo, somma_mancanze)
+    quota = np.divide(mancanze, somma_mancanze[:, np.newaxis], out=np.zeros_like(mancanze),
+                      where=somma_mancanze[:, np.newaxis] > 0)
+    return quota * verso_mancanze[:, np.newaxis] + pesi * (contributo - verso_mancanze)[:, np.newaxis]
+
+
+def simula_ribilanciamento(rendimenti, allocazione, contributo_mensile=0.0, capitale_iniziale=0.0,
+                           politica='calendario', mesi_calendario=MESI_CALENDARIO,
+                           soglia=SOGLIA_DERIVA, costo_transazione=COSTO_TRANSAZIONE):
+    """
+    Applica una regola di ribilanciamento a ogni percorso di rendimento.
+
+    Ogni mese: versamento a inizio mese, crescita delle classi di attivo, poi (se la regola
+    lo prevede) ribilanciamento ai pesi obiettivo. Il costo di transazione è una quota
+    dell'importo scambiato (acquisti + vendite) e viene dedotto dal patrimonio.
+
+    Args:
+        rendimenti (np.ndarray): Rendimenti semplici mensili, shape (mesi, P, 3)
+        allocazione (dict | array): Allocazione obiettivo (percentuali) o pesi, shape (3,) o (P, 3)
+        contributo_mensile (float | array): Versamento mensile, shape (P,)
+        capitale_iniziale (float | array): Capitale iniziale, shape (P,)
+        politica (str): 'nessuno', 'calendario', 'soglia' o 'solo_contributi'
+        mesi_calendario (int): Periodo del ribilanciamento a calendario
+        soglia (float): Scostamento massimo di un peso (es. 0.05 = 5 punti) per la regola a soglia
+        costo_transazione (float): Costo per euro scambiato (es. 0.001 = 0,1%)
+
+    Returns:
+        dict: Array di shape (P,) per percorso: {
+            'patrimonio_finale', 'scambiato' (turnover in euro), 'turnover' (scambiato / patrimonio medio),
+            'costi', 'ribilanciamenti' (numero), 'deriva_media', 'deriva_massima' (scostamento
+            massimo dei pesi a fine mese, prima del ribilanciamento), più 'pesi_finali' di shape (P, 3)
+        }
+    """
+    if politica not in POLITICHE:
+        raise ValueError(f"Politica di ribilanciamento sconosciuta: {politica}")
+
+    rendimenti = np.asarray(rendimenti, dtype=float)
+    mesi, n_percorsi, _ = rendimenti.shape
+    pesi = _pesi_obiettivo(allocazione, n_percorsi)
+    contributo = np.broadcast_to(np.asarray(contributo_mensile, dtype=float), (n_percorsi,))
+
+    posizioni = pesi * np.broadcast_to(np.asarray(capitale_iniziale, dtype=float), (n_percorsi,))[:, np.newaxis]
+    scambiato = np.zeros(n_percorsi)
+    costi = np.zeros(n_percorsi)
+    ribilanciamenti = np.zeros(n_percorsi, dtype=np.int64)
+    somma_deriva = np.zeros(n_percorsi)
+    deriva_massima = np.zeros(n_percorsi)
+    somma_patrimonio = np.zeros(n_percorsi)
+
+    for mese in range(mesi):
+        if politica == 'solo_contributi':
+            posizioni += _ripartisci_contributo(posizioni, pesi, contributo)
+        else:
+            posizioni += pesi * contributo[:, np.newaxis]
+
+        posizioni *= 1 + rendimenti[mese]
+
+        totale = posizioni.sum(axis=1)
+        pesi_attuali = np.divide(posizioni, totale[:, np.newaxis], out=pesi.copy(),
+                                 where=totale[:, np.newaxis] > 0)
+        deriva = np.abs(pesi_attuali - pesi).max(axis=1)
+
+        if politica == 'calendario':
+            da_ribilanciare = np.full(n_percorsi, (mese + 1) % mesi_calendario == 0)
+        elif politica == 'soglia':
+            da_ribilanciare = deriva > soglia
+        else:
+            da_ribilanciare = np.zeros(n_percorsi, dtype=bool)
+
+        if da_ribilanciare.any():
+            scambio = np.abs(pesi * totale[:, np.newaxis] - posizioni).sum(axis=1)
+            scambio = np.where(da_ribilanciare, scambio, 0.0)
+            costo = scambio * costo_transazione
+            scambiato += scambio
+            costi += costo
+            ribilanciamenti += da_ribilanciare
+            posizioni = np.where(
+                da_ribilanciare[:, np.newaxis], pesi * (totale - costo)[:, np.newaxis], posizioni
+            )
+
+        somma_deriva += deriva
+        np.maximum(deriva_massima, deriva, out=deriva_massima)
+        somma_patrimonio += posizioni.sum(axis=1)
+
+    patrimonio_finale = posizioni.sum(axis=1)
+    patrimonio_medio = somma_patrimonio / max(mesi, 1)
+    return {
+        'patrimonio_finale': patrimonio_finale,
+        'scambiato': scambiato,
+        'turnover': np.divide(scambiato, patrimonio_medio, out=np.zeros(n_percorsi), where=patrimonio_medio > 0),
+        'costi': costi,
+        'ribilanciamenti': ribilanciamenti,
+        'deriva_media': somma_deriva / max(mesi, 1),
+        'deriva_massima': deriva_massima,
+        'pesi_finali': np.divide(posizioni, patrimonio_finale[:, np.newaxis], out=pesi.copy(),
+                                 where=patrimonio_finale[:, np.newaxis] > 0)
+    }
+
+
+def confronta_politiche(rendimenti, allocazione, contributo_mensile=0.0, capitale_iniziale=0.0,
+                        politiche=POLITICHE, **parametri):
+    """
+    Confronta più regole di ribilanciamento sugli stessi percorsi di rendimento.
+
+    Args:
+        rendimenti (np.ndarray): Rendimenti semplici mensili, shape (mesi, P, 3)
+        allocazione (dict | array): Allocazione obiettivo
+        contributo_mensile (float | array): Versamento mensile
+        capitale_iniziale (float | array): Capitale iniziale
+        politiche (iterable): Regole da confrontare
+        **parametri: mesi_calendario, soglia, costo_transazione
+
+    Returns:
+        dict: {politica: {
+            'patrimonio_mediano', 'scambiato_medio', 'turnover_medio', 'costi_medi',
+            'ribilanciamenti_medi', 'deriva_media', 'deriva_massima'
+        }}
+    """
+    confronto = {}
+    for politica in politiche:
+        risultato = simula_ribilanciamento(
+            rendimenti, allocazione, contributo_mensile, capitale_iniziale, politica=politica, **parametri
+        )
+        confronto[politica] = {
+            'patrimonio_mediano': float(np.median(risultato['patrimonio_finale'])),
+            'scambiato_medio': float(risultato['scambiato'].mean()),
+            'turnover_medio': float(risultato['turnover'].mean()),
+            'costi_medi': float(risultato['costi'].mean()),
+            'ribilanciamenti_medi': float(risultato['ribilanciamenti'].mean()),
+            'deriva_media': float(risultato['deriva_media'].mean()),
+            'deriva_massima': float(risultato['deriva_massima'].max())
+        }
+    return confronto
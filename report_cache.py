@@ -0,0 +1,28 @@
+"""
+Report Cache Module
+Versioni memorizzate dei generatori di report FASE 1/2/3.
+La chiave è un hash canonico degli argomenti numerici (arrotondati al centesimo) e della lingua.
+"""
+
+from cache import LRUCache, memoizza
+from report_generator_fase1 import genera_report_fase1
+from report_generator_fase2 import genera_report_fase2
+from report_generator_fase3 import genera_report_fase3
+
+
+# Una voce per combinazione di input/lingua; le voci scadono dopo un'ora
+REPORT_CACHE = LRUCache(maxsize=512, ttl=3600)
+
+genera_report_fase1_cache = memoizza(REPORT_CACHE, prefisso='fase1:')(genera_report_fase1)
+genera_report_fase2_cache = memoizza(REPORT_CACHE, prefisso='fase2:')(genera_report_fase2)
+genera_report_fase3_cache = memoizza(REPORT_CACHE, prefisso='fase3:')(genera_report_fase3)
+
+
+def statistiche_cache_report():
+    """
+    Restituisce le metriche della cache dei report.
+
+    Returns:
+        dict: Vedi LRUCache.statistiche()
+    """
+    return REPORT_CACHE.statistiche()
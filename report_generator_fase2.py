@@ -3,10 +3,13 @@ Report Generator Module - Fase 2 (PAC)
 Genera report per la pianificazione delle spese prevedibili
 """
 
-from calculations import formatta_valuta, calcola_pac_mensile, alloca_capitale_eccedente
+from calculations import formatta_valuta, calcola_pac_obiettivi
+from goal_optimizer import ha_flessibilita, ottimizza_obiettivi
+from timeline import alloca_capitale_obiettivi
 
 
-def genera_report_fase2(obiettivi, entrate_mensili, uscite_mensili, capitale_eccedente, lang):
+def genera_report_fase2(obiettivi, entrate_mensili, uscite_mensili, capitale_eccedente, lang, piano_obiettivi=None,
+                        pac_obiettivi=None):
     """
     Genera il report FASE 2 nella lingua specificata.
     
@@ -16,21 +19,132 @@ def genera_report_fase2(obiettivi, entrate_mensili, uscite_mensili, capitale_ecc
         uscite_mensili (float): Uscite mensili totali
         capitale_eccedente (float): Capitale oltre il fondo emergenza
         lang (str): Codice lingua (it, en, de)
+        piano_obiettivi (dict): Piano già calcolato con goal_optimizer.ottimizza_obiettivi
+                                (se None e il gap è negativo viene calcolato qui)
+        pac_obiettivi (np.ndarray): PAC già calcolati con calculations.calcola_pac_obiettivi
+                                    (None = calcolati qui)
         
     Returns:
         tuple: (report_str, pac_totale, risparmio_disponibile, capitale_investibile_subito)
     """
     if lang == "it":
-        return _genera_report_fase2_it(obiettivi, entrate_mensili, uscite_mensili, capitale_eccedente)
+        return _genera_report_fase2_it(obiettivi, entrate_mensili, uscite_mensili, capitale_eccedente, piano_obiettivi, pac_obiettivi)
     elif lang == "en":
-        return _genera_report_fase2_en(obiettivi, entrate_mensili, uscite_mensili, capitale_eccedente)
+        return _genera_report_fase2_en(obiettivi, entrate_mensili, uscite_mensili, capitale_eccedente, piano_obiettivi, pac_obiettivi)
     elif lang == "de":
-        return _genera_report_fase2_de(obiettivi, entrate_mensili, uscite_mensili, capitale_eccedente)
+        return _genera_report_fase2_de(obiettivi, entrate_mensili, uscite_mensili, capitale_eccedente, piano_obiettivi, pac_obiettivi)
     else:
-        return _genera_report_fase2_it(obiettivi, entrate_mensili, uscite_mensili, capitale_eccedente)
+        return _genera_report_fase2_it(obiettivi, entrate_mensili, uscite_mensili, capitale_eccedente, piano_obiettivi, pac_obiettivi)
 
 
-def _genera_report_fase2_it(obiettivi, entrate_mensili, uscite_mensili, capitale_eccedente=0):
+def _riga_ipotesi(obiettivo, lang):
+    """
+    Riga con le ipotesi di rendimento e inflazione di un obiettivo (vuota se assenti).
+    
+    Args:
+        obiettivo (dict): Obiettivo con chiavi opzionali 'rendimento' e 'inflazione' (in %)
+        lang (str): Codice lingua (it, en, de)
+        
+    Returns:
+        str: Riga di elenco in Markdown o stringa vuota
+    """
+    rendimento = obiettivo.get('rendimento', 0)
+    inflazione = obiettivo.get('inflazione', 0)
+    if not rendimento and not inflazione:
+        return ""
+    
+    def percentuale(valore):
+        testo = f"{valore:g}%"
+        return testo.replace(".", ",") if lang == "de" else testo
+    
+    etichette = {
+        'it': "- Ipotesi: rendimento {rendimento} annuo, inflazione {inflazione} annua\n",
+        'en': "- Assumptions: {rendimento} annual return, {inflazione} annual inflation\n",
+        'de': "- Annahmen: Rendite {rendimento} p.a., Inflation {inflazione} p.a.\n"
+    }
+    return etichette.get(lang, etichette['it']).format(
+        rendimento=percentuale(rendimento), inflazione=percentuale(inflazione)
+    )
+
+
+def _sezione_piano_obiettivi(obiettivi, risparmio_disponibile, lang, piano=None):
+    """
+    Sezione con i rinvii e le riduzioni consigliati per chiudere il gap (goal_optimizer).
+    
+    Args:
+        obiettivi (list): Lista di obiettivi con priorità e flessibilità opzionali
+        risparmio_disponibile (float): Entrate - uscite mensili
+        lang (str): Codice lingua (it, en, de)
+        piano (dict): Risultato di ottimizza_obiettivi, calcolato qui se None
+        
+    Returns:
+        str: Sezione Markdown, vuota se nessun obiettivo è flessibile o nulla da modificare
+    """
+    if not ha_flessibilita(obiettivi):
+        return ""
+    if piano is None:
+        piano = ottimizza_obiettivi(obiettivi, risparmio_disponibile)
+    if not piano['modifiche']:
+        return ""
+    
+    testi = {
+        'it': {
+            'titolo': "### 🧭 Piano Consigliato per gli Obiettivi",
+            'intro': "In base alle priorità e alla flessibilità indicate, partendo dagli obiettivi meno importanti:",
+            'rinvio': "scadenza rinviata di {mesi} mesi",
+            'riduzione': "costo ridotto del {percentuale}% a {costo}",
+            'pac': "PAC da {prima} a **{dopo}**",
+            'fattibile': "✅ Con queste modifiche il totale dei PAC scende a {totale}, entro il tuo risparmio disponibile.",
+            'non_fattibile': "⚠️ Anche usando tutta la flessibilità indicata il totale dei PAC è {totale}: resta un deficit di {residuo} al mese."
+        },
+        'en': {
+            'titolo': "### 🧭 Recommended Goal Plan",
+            'intro': "Based on the priorities and flexibility you set, starting from the least important goals:",
+            'rinvio': "deadline moved by {mesi} months",
+            'riduzione': "cost reduced by {percentuale}% to {costo}",
+            'pac': "PAC from {prima} to **{dopo}**",
+            'fattibile': "✅ With these changes your total PAC drops to {totale}, within your available savings.",
+            'non_fattibile': "⚠️ Even using all the flexibility you set, your total PAC is {totale}: a deficit of {residuo} per month remains."
+        },
+        'de': {
+            'titolo': "### 🧭 Empfohlener Plan für die Ziele",
+            'intro': "Basierend auf den angegebenen Prioritäten und Spielräumen, beginnend mit den am wenigsten wichtigen Zielen:",
+            'rinvio': "Termin um {mesi} Monate verschoben",
+            'riduzione': "Kosten um {percentuale}% auf {costo} reduziert",
+            'pac': "Sparplan von {prima} auf **{dopo}**",
+            'fattibile': "✅ Mit diesen Änderungen sinkt Ihr gesamter Sparplan auf {totale} und liegt damit innerhalb Ihrer verfügbaren Ersparnisse.",
+            'non_fattibile': "⚠️ Selbst mit allen angegebenen Spielräumen beträgt Ihr gesamter Sparplan {totale}: Es bleibt ein Defizit von {residuo} pro Monat."
+        }
+    }
+    testi = testi.get(lang, testi['it'])
+    
+    def percentuale(valore):
+        testo = f"{valore:g}"
+        return testo.replace(".", ",") if lang == "de" else testo
+    
+    report = f"\n{testi['titolo']}\n\n{testi['intro']}\n\n"
+    for modifica in piano['modifiche']:
+        azioni = []
+        if modifica['rinvio_mesi']:
+            azioni.append(testi['rinvio'].format(mesi=modifica['rinvio_mesi']))
+        if modifica['riduzione']:
+            azioni.append(testi['riduzione'].format(
+                percentuale=percentuale(modifica['riduzione']), costo=formatta_valuta(modifica['costo_proposto'])
+            ))
+        azioni.append(testi['pac'].format(
+            prima=formatta_valuta(modifica['pac']), dopo=formatta_valuta(modifica['pac_proposto'])
+        ))
+        report += f"- **{modifica['nome']}**: {', '.join(azioni)}\n"
+    
+    esito = 'fattibile' if piano['fattibile'] else 'non_fattibile'
+    report += "\n" + testi[esito].format(
+        totale=formatta_valuta(piano['pac_totale_proposto']), residuo=formatta_valuta(piano['deficit_residuo'])
+    ) + "\n\n"
+    return report
+
+
+def _genera_report_fase2_it(obiettivi, entrate_mensili, uscite_mensili, capitale_eccedente=0, piano_obiettivi=None,
+                            pac_obiettivi=None):
     """Genera il report FASE 2 in italiano."""
     risparmio_disponibile = entrate_mensili - uscite_mensili
     
@@ -85,23 +199,19 @@ può essere destinato direttamente agli investimenti a lungo termine!
     
     report += "### 📋 I Tuoi Obiettivi e PAC Mensili\n\n"
     
-    pac_totale = 0
-    somma_anni = 0
-    for obiettivo in obiettivi:
-        pac_mensile = calcola_pac_mensile(obiettivo['costo'], obiettivo['anni'])
-        pac_totale += pac_mensile
-        somma_anni += obiettivo['anni']
-        
+    # PAC di tutti gli obiettivi in una sola chiamata vettoriale
+    if pac_obiettivi is None:
+        pac_obiettivi = calcola_pac_obiettivi(obiettivi)
+    pac_totale = float(pac_obiettivi.cumsum()[-1])
+    for obiettivo, pac_mensile in zip(obiettivi, pac_obiettivi):
         report += f"""
 **{obiettivo['nome']}**
 - Costo Totale: {formatta_valuta(obiettivo['costo'])}
-- Tempo Disponibile: {obiettivo['anni']} anni ({obiettivo['anni'] * 12} mesi)
+{_riga_ipotesi(obiettivo, 'it')}- Tempo Disponibile: {obiettivo['anni']} anni ({obiettivo['anni'] * 12} mesi)
 - PAC Mensile: **{formatta_valuta(pac_mensile)}**
 
 """
     
-    anni_media = somma_anni / len(obiettivi) if obiettivi else 5
-    
     report += f"""
 ---
 
@@ -124,9 +234,10 @@ disponibile ({formatta_valuta(risparmio_disponibile)})!
 **Deficit mensile**: {formatta_valuta(abs(gap_mensile))}
 
 """
+        report += _sezione_piano_obiettivi(obiettivi, risparmio_disponibile, 'it', piano_obiettivi)
         
         if capitale_eccedente > 0:
-            allocazione = alloca_capitale_eccedente(capitale_eccedente, gap_mensile, anni_media)
+            allocazione = alloca_capitale_obiettivi(obiettivi, risparmio_disponibile, capitale_eccedente, pac_obiettivi)
             
             report += f"""
 ### 💎 COPERTURA CON CAPITALE ECCEDENTE
@@ -135,16 +246,16 @@ Hai {formatta_valuta(capitale_eccedente)} di capitale eccedente dal Fondo di Eme
 
 **Allocazione Intelligente:**
 - **Accantonamento per Obiettivi**: {formatta_valuta(allocazione['a_obiettivi'])}
-  - Questo importo coprirà il gap mensile di {formatta_valuta(abs(gap_mensile))} per circa {int(allocazione['a_obiettivi'] / abs(gap_mensile)) if gap_mensile != 0 else 0} mesi
+  - Questo importo coprirà il gap mensile di {formatta_valuta(abs(gap_mensile))} per circa {allocazione['mesi_coperti']} mesi
 - **Disponibile per Investimenti Immediati**: {formatta_valuta(allocazione['a_investimenti'])}
 
 """
             
-            if allocazione['a_obiettivi'] >= abs(gap_mensile) * 12 * anni_media:
+            if allocazione['coperto']:
                 report += "✅ **Il gap è completamente coperto!** Puoi procedere alla FASE 3.\n"
             else:
                 report += f"""
-⚠️ **Gap parzialmente coperto**. Dopo {int(allocazione['a_obiettivi'] / abs(gap_mensile))} mesi, dovrai:
+⚠️ **Gap parzialmente coperto**. Dopo {allocazione['mesi_coperti']} mesi, dovrai:
 1. Aumentare le entrate
 2. Ridurre le spese
 3. Rivedere gli obiettivi
@@ -174,7 +285,7 @@ ti rimangono ancora **{formatta_valuta(gap_mensile)}** per investimenti a lungo
 """
         
         if capitale_eccedente > 0:
-            allocazione = alloca_capitale_eccedente(capitale_eccedente, gap_mensile, anni_media)
+            allocazione = alloca_capitale_obiettivi(obiettivi, risparmio_disponibile, capitale_eccedente, pac_obiettivi)
             
             report += f"""
 ### 💎 ALLOCAZIONE CAPITALE ECCEDENTE
@@ -197,7 +308,8 @@ Questo accelererà significativamente la crescita del tuo patrimonio!
         return report, pac_totale, risparmio_disponibile, capitale_investibile_subito
 
 
-def _genera_report_fase2_en(obiettivi, entrate_mensili, uscite_mensili, capitale_eccedente=0):
+def _genera_report_fase2_en(obiettivi, entrate_mensili, uscite_mensili, capitale_eccedente=0, piano_obiettivi=None,
+                            pac_obiettivi=None):
     """Genera il report FASE 2 in inglese."""
     risparmio_disponibile = entrate_mensili - uscite_mensili
     
@@ -252,23 +364,19 @@ can be allocated directly to long-term investments!
     
     report += "### 📋 Your Goals and Monthly PACs\n\n"
     
-    pac_totale = 0
-    somma_anni = 0
-    for obiettivo in obiettivi:
-        pac_mensile = calcola_pac_mensile(obiettivo['costo'], obiettivo['anni'])
-        pac_totale += pac_mensile
-        somma_anni += obiettivo['anni']
-        
+    # PAC di tutti gli obiettivi in una sola chiamata vettoriale
+    if pac_obiettivi is None:
+        pac_obiettivi = calcola_pac_obiettivi(obiettivi)
+    pac_totale = float(pac_obiettivi.cumsum()[-1])
+    for obiettivo, pac_mensile in zip(obiettivi, pac_obiettivi):
         report += f"""
 **{obiettivo['nome']}**
 - Total Cost: {formatta_valuta(obiettivo['costo'])}
-- Available Time: {obiettivo['anni']} years ({obiettivo['anni'] * 12} months)
+{_riga_ipotesi(obiettivo, 'en')}- Available Time: {obiettivo['anni']} years ({obiettivo['anni'] * 12} months)
 - Monthly PAC: **{formatta_valuta(pac_mensile)}**
 
 """
     
-    anni_media = somma_anni / len(obiettivi) if obiettivi else 5
-    
     report += f"""
 ---
 
@@ -290,9 +398,10 @@ savings ({formatta_valuta(risparmio_disponibile)})!
 **Monthly deficit**: {formatta_valuta(abs(gap_mensile))}
 
 """
+        report += _sezione_piano_obiettivi(obiettivi, risparmio_disponibile, 'en', piano_obiettivi)
         
         if capitale_eccedente > 0:
-            allocazione = alloca_capitale_eccedente(capitale_eccedente, gap_mensile, anni_media)
+            allocazione = alloca_capitale_obiettivi(obiettivi, risparmio_disponibile, capitale_eccedente, pac_obiettivi)
             
             report += f"""
 ### 💎 COVERAGE WITH SURPLUS CAPITAL
@@ -301,16 +410,16 @@ You have {formatta_valuta(capitale_eccedente)} of surplus capital from the Emerg
 
 **Smart Allocation:**
 - **Allocation for Goals**: {formatta_valuta(allocazione['a_obiettivi'])}
-  - This amount will cover the monthly gap of {formatta_valuta(abs(gap_mensile))} for about {int(allocazione['a_obiettivi'] / abs(gap_mensile)) if gap_mensile != 0 else 0} months
+  - This amount will cover the monthly gap of {formatta_valuta(abs(gap_mensile))} for about {allocazione['mesi_coperti']} months
 - **Available for Immediate Investments**: {formatta_valuta(allocazione['a_investimenti'])}
 
 """
             
-            if allocazione['a_obiettivi'] >= abs(gap_mensile) * 12 * anni_media:
+            if allocazione['coperto']:
                 report += "✅ **The gap is fully covered!** You can proceed to PHASE 3.\n"
             else:
                 report += f"""
-⚠️ **Gap partially covered**. After {int(allocazione['a_obiettivi'] / abs(gap_mensile))} months, you'll need to:
+⚠️ **Gap partially covered**. After {allocazione['mesi_coperti']} months, you'll need to:
 1. Increase income
 2. Reduce expenses
 3. Review goals
@@ -340,7 +449,7 @@ you still have **{formatta_valuta(gap_mensile)}** for long-term investments.
 """
         
         if capitale_eccedente > 0:
-            allocazione = alloca_capitale_eccedente(capitale_eccedente, gap_mensile, anni_media)
+            allocazione = alloca_capitale_obiettivi(obiettivi, risparmio_disponibile, capitale_eccedente, pac_obiettivi)
             
             report += f"""
 ### 💎 SURPLUS CAPITAL ALLOCATION
@@ -363,7 +472,8 @@ This will significantly accelerate the growth of your wealth!
         return report, pac_totale, risparmio_disponibile, capitale_investibile_subito
 
 
-def _genera_report_fase2_de(obiettivi, entrate_mensili, uscite_mensili, capitale_eccedente=0):
+def _genera_report_fase2_de(obiettivi, entrate_mensili, uscite_mensili, capitale_eccedente=0, piano_obiettivi=None,
+                            pac_obiettivi=None):
     """Genera il report FASE 2 in tedesco."""
     risparmio_disponibile = entrate_mensili - uscite_mensili
     
@@ -418,23 +528,19 @@ direkt in langfristige Investitionen allokiert werden!
     
     report += "### 📋 Ihre Ziele und monatliche PACs\n\n"
     
-    pac_totale = 0
-    somma_anni = 0
-    for obiettivo in obiettivi:
-        pac_mensile = calcola_pac_mensile(obiettivo['costo'], obiettivo['anni'])
-        pac_totale += pac_mensile
-        somma_anni += obiettivo['anni']
-        
+    # PAC di tutti gli obiettivi in una sola chiamata vettoriale
+    if pac_obiettivi is None:
+        pac_obiettivi = calcola_pac_obiettivi(obiettivi)
+    pac_totale = float(pac_obiettivi.cumsum()[-1])
+    for obiettivo, pac_mensile in zip(obiettivi, pac_obiettivi):
         report += f"""
 **{obiettivo['nome']}**
 - Gesamtkosten: {formatta_valuta(obiettivo['costo'])}
-- Verfügbare Zeit: {obiettivo['anni']} Jahre ({obiettivo['anni'] * 12} Monate)
+{_riga_ipotesi(obiettivo, 'de')}- Verfügbare Zeit: {obiettivo['anni']} Jahre ({obiettivo['anni'] * 12} Monate)
 - Monatlicher PAC: **{formatta_valuta(pac_mensile)}**
 
 """
     
-    anni_media = somma_anni / len(obiettivi) if obiettivi else 5
-    
     report += f"""
 ---
 
@@ -456,9 +562,10 @@ Ersparnisse ({formatta_valuta(risparmio_disponibile)})!
 **Monatliches Defizit**: {formatta_valuta(abs(gap_mensile))}
 
 """
+        report += _sezione_piano_obiettivi(obiettivi, risparmio_disponibile, 'de', piano_obiettivi)
         
         if capitale_eccedente > 0:
-            allocazione = alloca_capitale_eccedente(capitale_eccedente, gap_mensile, anni_media)
+            allocazione = alloca_capitale_obiettivi(obiettivi, risparmio_disponibile, capitale_eccedente, pac_obiettivi)
             
             report += f"""
 ### 💎 DECKUNG MIT ÜBERSCHUSSKAPITAL
@@ -467,16 +574,16 @@ Sie haben {formatta_valuta(capitale_eccedente)} Überschusskapital aus dem Notgr
 
 **Intelligente Allokation:**
 - **Allokation für Ziele**: {formatta_valuta(allocazione['a_obiettivi'])}
-  - Dieser Betrag deckt die monatliche Lücke von {formatta_valuta(abs(gap_mensile))} für etwa {int(allocazione['a_obiettivi'] / abs(gap_mensile)) if gap_mensile != 0 else 0} Monate
+  - Dieser Betrag deckt die monatliche Lücke von {formatta_valuta(abs(gap_mensile))} für etwa {allocazione['mesi_coperti']} Monate
 - **Verfügbar für sofortige Investitionen**: {formatta_valuta(allocazione['a_investimenti'])}
 
 """
             
-            if allocazione['a_obiettivi'] >= abs(gap_mensile) * 12 * anni_media:
+            if allocazione['coperto']:
                 report += "✅ **Die Lücke ist vollständig gedeckt!** Sie können zu PHASE 3 fortfahren.\n"
             else:
                 report += f"""
-⚠️ **Lücke teilweise gedeckt**. Nach {int(allocazione['a_obiettivi'] / abs(gap_mensile))} Monaten müssen Sie:
+⚠️ **Lücke teilweise gedeckt**. Nach {allocazione['mesi_coperti']} Monaten müssen Sie:
 1. Einkommen erhöhen
 2. Ausgaben reduzieren
 3. Ziele überprüfen
@@ -506,7 +613,7 @@ haben Sie noch **{formatta_valuta(gap_mensile)}** für langfristige Investitione
 """
         
         if capitale_eccedente > 0:
-            allocazione = alloca_capitale_eccedente(capitale_eccedente, gap_mensile, anni_media)
+            allocazione = alloca_capitale_obiettivi(obiettivi, risparmio_disponibile, capitale_eccedente, pac_obiettivi)
             
             report += f"""
 ### 💎 ÜBERSCHUSSKAPITAL-ALLOKATION
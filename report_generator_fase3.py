@@ -2,12 +2,55 @@
 Report Generator Module - Fase 3 (Investimenti)
 Genera report dettagliati per gli investimenti a lungo termine con risorse educative
 Versione 3.2 - Aggiunta sezione pensioni e esempio inflazione €10.000
+Versione 3.3 - Sezioni statiche pre-renderizzate per lingua, report assemblato con str.join
+Versione 3.4 - Proiezione Monte Carlo del piano (percentili e probabilità)
+Versione 3.5 - Cifre degli esempi calcolate con il motore di proiezione (projections)
+Versione 3.6 - Glide path dell'allocazione fino alla pensione (tabella e simulazione)
+Versione 3.7 - Prelievi dopo la pensione simulati con il modulo decumulation
+Versione 3.8 - Tabella dell'impatto dei costi sul piano dell'utente (fee_drag)
+Versione 3.9 - Tabelle dell'inflazione calcolate sulla liquidità dell'utente (inflation)
 """
 
-from calculations import formatta_valuta, genera_allocazione_investimenti
-
-
-def genera_report_fase3(disponibilita_mensile, capitale_investibile_subito, profilo_rischio, anni_pensione, lang):
+import math
+from functools import lru_cache
+
+from calculations import formatta_valuta, formatta_valuta_intera, genera_allocazione_investimenti
+from decumulation import ANNI_DECUMULO, FIDUCIA, TASSO_PRELIEVO, analisi_decumulo
+from fee_drag import TER_REPORT, griglia_costi
+from inflation import (
+    ANNI_INFLAZIONE_REPORT, LIQUIDITA_ESEMPIO, TASSI_INFLAZIONE_REPORT,
+    tabella_inflazione, tabella_potere_acquisto
+)
+from glide_path import allocazioni_annue, glide_path
+from market_assumptions import ASSET, RENDIMENTI_ATTESI, parametri_portafoglio
+from monte_carlo import simula_patrimonio, SEED_REPORT
+from projections import rendimento_netto, valore_finale, versato_totale
+
+
+# Scenari simulati per la proiezione Monte Carlo del report (percentili stabili entro ~2%)
+N_PERCORSI_REPORT = 2000
+
+# Scenari simulati per il tasso di prelievo dell'esempio sulle pensioni (calcolato una volta)
+N_PERCORSI_ESEMPIO = 10000
+
+# Passo (in anni) delle righe della tabella del glide path
+PASSO_TABELLA_GLIDE_PATH = 5
+
+# Parametri degli esempi educativi (devono corrispondere al testo dei frammenti)
+_ESEMPIO_ANNI = 30
+_ESEMPIO_PAC = 200
+_ESEMPIO_PAC_PICCOLO = 100
+_ESEMPIO_RENDIMENTO_NETTO = 0.05
+_ESEMPIO_CAPITALE = 10000
+_ESEMPIO_RENDIMENTO_LORDO = 0.07
+_ESEMPIO_TER_BASSO = 0.002
+_ESEMPIO_TER_ALTO = 0.015
+# Allocazione alla pensione dell'esempio (finale del glide path del profilo Moderato)
+_ESEMPIO_ALLOCAZIONE_PENSIONE = {'Azioni': 30, 'Obbligazioni': 60, 'Oro': 10}
+
+
+def genera_report_fase3(disponibilita_mensile, capitale_investibile_subito, profilo_rischio, anni_pensione, lang,
+                        liquidita=None):
     """
     Genera il report FASE 3 nella lingua specificata.
     
@@ -17,24 +60,425 @@ def genera_report_fase3(disponibilita_mensile, capitale_investibile_subito, prof
         profilo_rischio (str): Profilo di rischio selezionato
         anni_pensione (int): Anni alla pensione
         lang (str): Codice lingua (it, en, de)
+        liquidita (float): Liquidità attuale per le tabelle dell'inflazione (None = esempio da €10.000)
         
     Returns:
         str: Report formattato in Markdown
     """
     if lang == "it":
-        return _genera_report_fase3_it(disponibilita_mensile, capitale_investibile_subito, profilo_rischio, anni_pensione)
+        return _genera_report_fase3_it(disponibilita_mensile, capitale_investibile_subito, profilo_rischio, anni_pensione, liquidita)
     elif lang == "en":
-        return _genera_report_fase3_en(disponibilita_mensile, capitale_investibile_subito, profilo_rischio, anni_pensione)
+        return _genera_report_fase3_en(disponibilita_mensile, capitale_investibile_subito, profilo_rischio, anni_pensione, liquidita)
     elif lang == "de":
-        return _genera_report_fase3_de(disponibilita_mensile, capitale_investibile_subito, profilo_rischio, anni_pensione)
+        return _genera_report_fase3_de(disponibilita_mensile, capitale_investibile_subito, profilo_rischio, anni_pensione, liquidita)
     else:
-        return _genera_report_fase3_it(disponibilita_mensile, capitale_investibile_subito, profilo_rischio, anni_pensione)
+        return _genera_report_fase3_it(disponibilita_mensile, capitale_investibile_subito, profilo_rischio, anni_pensione, liquidita)
 
 
-def _genera_report_fase3_it(disponibilita_mensile, capitale_investibile_subito, profilo_rischio, anni_pensione):
+def _genera_report_fase3_it(disponibilita_mensile, capitale_investibile_subito, profilo_rischio, anni_pensione,
+                            liquidita=None):
     """Genera il report FASE 3 in italiano con dettagli completi."""
+    return _assembla_report_fase3(
+        _frammenti('it'), disponibilita_mensile, capitale_investibile_subito, profilo_rischio, anni_pensione, liquidita
+    )
+
+
+def _genera_report_fase3_en(disponibilita_mensile, capitale_investibile_subito, profilo_rischio, anni_pensione,
+                            liquidita=None):
+    """Generates PHASE 3 report in English with complete details."""
+    return _assembla_report_fase3(
+        _frammenti('en'), disponibilita_mensile, capitale_investibile_subito, profilo_rischio, anni_pensione, liquidita
+    )
+
+
+def _genera_report_fase3_de(disponibilita_mensile, capitale_investibile_subito, profilo_rischio, anni_pensione,
+                            liquidita=None):
+    """Generiert PHASE 3 Bericht auf Deutsch mit vollständigen Details."""
+    return _assembla_report_fase3(
+        _frammenti('de'), disponibilita_mensile, capitale_investibile_subito, profilo_rischio, anni_pensione, liquidita
+    )
+
+
+# Frammenti che contengono le cifre degli esempi (_esempi_numerici)
+_CHIAVI_ESEMPI = ('intro', 'dettagli', 'dettagli_fine')
+
+
+@lru_cache(maxsize=None)
+def _frammenti(lang):
+    """
+    Frammenti statici di una lingua con le cifre degli esempi già inserite.
+    
+    Le cifre sono calcolate al primo report della lingua e non all'import: il tasso di
+    prelievo dell'esempio richiede una simulazione che non deve pesare su ogni processo.
+    
+    Args:
+        lang (str): Codice lingua (it, en, de)
+        
+    Returns:
+        dict: Frammenti della lingua (vedi _FRAMMENTI_IT)
+    """
+    frammenti = {'it': _FRAMMENTI_IT, 'en': _FRAMMENTI_EN, 'de': _FRAMMENTI_DE}[lang]
+    esempi = _esempi_numerici(lang, frammenti['separatore_decimale'])
+    return {**frammenti, **{chiave: frammenti[chiave].format(**esempi) for chiave in _CHIAVI_ESEMPI}}
+
+
+def _assembla_report_fase3(frammenti, disponibilita_mensile, capitale_investibile_subito, profilo_rischio, anni_pensione,
+                           liquidita=None):
+    """
+    Assembla il report unendo i frammenti statici pre-renderizzati con le poche parti dinamiche.
+    
+    Args:
+        frammenti (dict): Frammenti statici della lingua (vedi _frammenti)
+        disponibilita_mensile (float): Disponibilità mensile per investimenti
+        capitale_investibile_subito (float): Capitale da investire immediatamente
+        profilo_rischio (str): Profilo di rischio selezionato
+        anni_pensione (int): Anni alla pensione
+        liquidita (float): Liquidità attuale (None = esempio da €10.000)
+        
+    Returns:
+        str: Report formattato in Markdown
+    """
+    parti = [frammenti['intro'], formatta_valuta(disponibilita_mensile), "\n"]
     
-    report = f"""
+    if capitale_investibile_subito > 0:
+        parti += [
+            frammenti['lump_sum'], formatta_valuta(capitale_investibile_subito), "\n\n",
+            frammenti['strategia_lump_sum']
+        ]
+    
+    parti.append("\n")
+    
+    if disponibilita_mensile <= 0 and capitale_investibile_subito <= 0:
+        parti.append(frammenti['nessuna_disponibilita'])
+        return "".join(parti)
+    
+    # Genera allocazione
+    allocazione = genera_allocazione_investimenti(profilo_rischio, anni_pensione)
+    
+    parti.append(frammenti['allocazione'].format(profilo_rischio=profilo_rischio, anni_pensione=anni_pensione))
+    
+    nomi_asset = frammenti['nomi_asset']
+    for asset, percentuale in allocazione.items():
+        parti += ["- **", nomi_asset.get(asset, asset), "**: ", str(percentuale), "%"]
+        if disponibilita_mensile > 0:
+            importo_mensile = disponibilita_mensile * (percentuale / 100)
+            parti += [" → ", formatta_valuta(importo_mensile), frammenti['al_mese']]
+        
+        if capitale_investibile_subito > 0:
+            importo_lump = capitale_investibile_subito * (percentuale / 100)
+            parti += [" (+ ", formatta_valuta(importo_lump), frammenti['suffisso_lump_sum'], ")"]
+        
+        parti.append("\n")
+    
+    if anni_pensione > 0:
+        percorso = glide_path(profilo_rischio, anni_pensione)
+        parti.append(_sezione_glide_path(frammenti, percorso, anni_pensione))
+        parti.append(_sezione_monte_carlo(
+            frammenti, max(0, disponibilita_mensile), max(0, capitale_investibile_subito), allocazione, anni_pensione,
+            allocazioni_annue(percorso, anni_pensione), dict(zip(ASSET, percorso[-1].tolist()))
+        ))
+        parti.append(_sezione_costi(
+            frammenti, max(0, disponibilita_mensile), max(0, capitale_investibile_subito), allocazione, anni_pensione
+        ))
+    
+    parti += [
+        frammenti['dettagli'],
+        _sezione_inflazione(frammenti, liquidita, max(0, disponibilita_mensile)),
+        frammenti['dettagli_fine']
+    ]
+    return "".join(parti)
+
+
+def _sezione_glide_path(frammenti, percorso, anni_pensione):
+    """
+    Genera la tabella compatta del glide path (una riga ogni PASSO_TABELLA_GLIDE_PATH anni).
+    
+    Args:
+        frammenti (dict): Frammenti statici della lingua
+        percorso (np.ndarray): Allocazioni anno per anno, shape (ceil(anni_pensione) + 1, 3)
+        anni_pensione (float): Anni alla pensione (anche frazionari)
+        
+    Returns:
+        str: Sezione in Markdown
+    """
+    def numero(valore):
+        return f"{valore:g}".replace(".", frammenti['separatore_decimale'])
+    
+    # Una riga ogni PASSO_TABELLA_GLIDE_PATH anni, più la riga alla pensione (ultima del percorso)
+    anni = list(range(0, math.ceil(anni_pensione), PASSO_TABELLA_GLIDE_PATH))
+    righe = [
+        f"| {numero(anno)} | {numero(anni_pensione - anno)} | {azioni:.0f}% | {obbligazioni:.0f}% | {oro:.0f}% |"
+        for anno, (azioni, obbligazioni, oro) in zip(anni + [anni_pensione], percorso[anni + [-1]].tolist())
+    ]
+    return frammenti['glide_path'].format(righe="\n".join(righe))
+
+
+def _formatta_probabilita(probabilita):
+    """Formatta una probabilità come percentuale intera, con >99% e <1% agli estremi."""
+    if probabilita >= 0.995:
+        return ">99%"
+    if probabilita < 0.005:
+        return "<1%"
+    return f"{probabilita:.0%}"
+
+
+@lru_cache(maxsize=256)
+def _simulazione_report(contributo_mensile, capitale_iniziale, allocazione, anni_pensione, obiettivo,
+                        allocazioni_per_anno, allocazione_pensione):
+    """
+    Simulazione Monte Carlo (e prelievi) del report, memorizzata sugli input arrotondati.
+    
+    Gli argomenti sono hashabili: importi arrotondati al centesimo, allocazioni come tuple
+    di coppie (asset, percentuale), allocazioni_per_anno e allocazione_pensione None o tuple.
+    
+    Returns:
+        dict: {'p5', 'p50', 'p95', 'probabilita_obiettivo', 'tasso_sostenibile', 'probabilita_successo'}
+    """
+    simulazione = simula_patrimonio(
+        contributo_mensile, capitale_iniziale, dict(allocazione), anni_pensione,
+        n_percorsi=N_PERCORSI_REPORT, obiettivo=obiettivo, seed=SEED_REPORT,
+        allocazioni_annue=[dict(anno) for anno in allocazioni_per_anno] if allocazioni_per_anno is not None else None
+    )
+    finale = simulazione['finale']
+    risultato = {
+        'p5': float(finale[5]),
+        'p50': float(finale[50]),
+        'p95': float(finale[95]),
+        'probabilita_obiettivo': float(simulazione['probabilita_obiettivo'])
+    }
+    if allocazione_pensione is not None:
+        decumulo = analisi_decumulo(simulazione['percorsi_finali'], dict(allocazione_pensione), seed=SEED_REPORT)
+        risultato['tasso_sostenibile'] = decumulo['tasso_sostenibile']
+        risultato['probabilita_successo'] = decumulo['probabilita_successo']
+    return risultato
+
+
+def _sezione_monte_carlo(frammenti, contributo_mensile, capitale_iniziale, allocazione, anni_pensione,
+                         allocazioni_per_anno=None, allocazione_pensione=None):
+    """
+    Genera la sezione con la simulazione Monte Carlo del piano (seed fisso, risultato riproducibile).
+    
+    Con allocazione_pensione i capitali finali simulati diventano il punto di partenza
+    della simulazione dei prelievi (decumulation).
+    
+    Args:
+        frammenti (dict): Frammenti statici della lingua
+        contributo_mensile (float): Importo investito ogni mese
+        capitale_iniziale (float): Capitale investito subito
+        allocazione (dict): Allocazione percentuale suggerita
+        anni_pensione (int): Anni alla pensione
+        allocazioni_per_anno (list): Allocazione di ogni anno (glide path); None = costante
+        allocazione_pensione (dict): Allocazione durante i prelievi; None = sezione prelievi omessa
+        
+    Returns:
+        str: Sezione in Markdown
+    """
+    def coppie(allocazione):
+        return tuple(allocazione.items())
+    
+    versato = capitale_iniziale + contributo_mensile * anni_pensione * 12
+    simulazione = _simulazione_report(
+        round(contributo_mensile, 2), round(capitale_iniziale, 2), coppie(allocazione), anni_pensione, round(versato, 2),
+        tuple(map(coppie, allocazioni_per_anno)) if allocazioni_per_anno is not None else None,
+        coppie(allocazione_pensione) if allocazione_pensione is not None else None
+    )
+    
+    sezione = frammenti['monte_carlo'].format(
+        n_percorsi=f"{N_PERCORSI_REPORT:,}".replace(",", frammenti['separatore_migliaia']),
+        anni=anni_pensione,
+        contributo=formatta_valuta(contributo_mensile),
+        capitale=formatta_valuta(capitale_iniziale),
+        p5=formatta_valuta(simulazione['p5']),
+        p50=formatta_valuta(simulazione['p50']),
+        p95=formatta_valuta(simulazione['p95']),
+        versato=formatta_valuta(versato),
+        probabilita=_formatta_probabilita(simulazione['probabilita_obiettivo']),
+        mu_azioni=f"{RENDIMENTI_ATTESI['Azioni']:.0%}",
+        mu_obbligazioni=f"{RENDIMENTI_ATTESI['Obbligazioni']:.0%}",
+        mu_oro=f"{RENDIMENTI_ATTESI['Oro']:.0%}"
+    )
+    if allocazione_pensione is None:
+        return sezione
+    
+    # Prelievi dai capitali simulati: tasso fisso sostenibile e probabilità della regola standard
+    return sezione + frammenti['decumulo'].format(
+        tasso=f"{simulazione['tasso_sostenibile'] * 100:.1f}%".replace(".", frammenti['separatore_decimale']),
+        anni=ANNI_DECUMULO,
+        fiducia=f"{FIDUCIA:.0%}",
+        prelievo=formatta_valuta(simulazione['p50'] * simulazione['tasso_sostenibile'] / 12),
+        tasso_regola=f"{TASSO_PRELIEVO:.0%}",
+        probabilita=_formatta_probabilita(simulazione['probabilita_successo'])
+    )
+
+
+@lru_cache(maxsize=1)
+def _tasso_sostenibile_esempio():
+    """Tasso di prelievo sostenibile dell'esempio sulle pensioni (simulato una volta sola)."""
+    return analisi_decumulo(
+        1.0, _ESEMPIO_ALLOCAZIONE_PENSIONE, n_percorsi=N_PERCORSI_ESEMPIO, seed=SEED_REPORT
+    )['tasso_sostenibile']
+
+
+def _sezione_costi(frammenti, contributo_mensile, capitale_iniziale, allocazione, anni_pensione):
+    """
+    Genera la tabella dell'impatto dei costi (TER_REPORT) sul piano dell'utente.
+    
+    Args:
+        frammenti (dict): Frammenti statici della lingua
+        contributo_mensile (float): Importo investito ogni mese
+        capitale_iniziale (float): Capitale investito subito
+        allocazione (dict): Allocazione percentuale suggerita
+        anni_pensione (int): Anni alla pensione
+        
+    Returns:
+        str: Sezione in Markdown
+    """
+    def percentuale(quota, decimali):
+        return f"{quota * 100:.{decimali}f}%".replace(".", frammenti['separatore_decimale'])
+    
+    rendimento = round(parametri_portafoglio(allocazione)[0], 4)
+    piano = ((round(contributo_mensile, 2), round(capitale_iniziale, 2)),)
+    costi = griglia_costi((0.0,) + TER_REPORT, (anni_pensione,), piano, rendimento)
+    
+    righe = [
+        f"| {percentuale(ter, 2)} | {formatta_valuta(finale)} | {formatta_valuta(pagati)} | "
+        f"{formatta_valuta(differenza)} ({percentuale(perdita, 1)}) |"
+        for ter, finale, pagati, differenza, perdita in zip(
+            TER_REPORT, *(costi[chiave][1:, 0, 0].tolist() for chiave in
+                          ('valore_finale', 'costi_pagati', 'differenza', 'perdita_percentuale'))
+        )
+    ]
+    return frammenti['costi'].format(
+        contributo=formatta_valuta(contributo_mensile),
+        capitale=formatta_valuta(capitale_iniziale),
+        anni=anni_pensione,
+        rendimento=percentuale(rendimento, 1),
+        senza_costi=formatta_valuta(float(costi['valore_finale'][0, 0, 0])),
+        righe="\n".join(righe)
+    )
+
+
+def _sezione_inflazione(frammenti, liquidita, contributo_mensile):
+    """
+    Genera le tabelle del potere d'acquisto (scenari A e B) sulla liquidità dell'utente.
+    
+    Args:
+        frammenti (dict): Frammenti statici della lingua
+        liquidita (float): Liquidità attuale (None o <= 0 = esempio da LIQUIDITA_ESEMPIO)
+        contributo_mensile (float): Risparmio mensile (riga sui risparmi futuri se > 0)
+        
+    Returns:
+        str: Sezione in Markdown
+    """
+    def euro(importo):
+        return formatta_valuta_intera(importo, frammenti['lang'])
+    
+    if liquidita is None or liquidita <= 0:
+        importo = LIQUIDITA_ESEMPIO
+        titolo, intro = frammenti['inflazione_esempio']
+    else:
+        importo = liquidita
+        titolo, intro = frammenti['inflazione_utente']
+    
+    tabella = tabella_inflazione(importo, contributo_mensile)
+    anni = ANNI_INFLAZIONE_REPORT
+    reale, perso = tabella['reale'].tolist(), tabella['perso'].tolist()
+    
+    def righe(scenario):
+        prima = f"| {frammenti['inflazione_oggi']} | {euro(importo)} | {euro(importo)} | {euro(0)} |"
+        return "\n".join([prima] + [
+            f"| {frammenti['inflazione_anni'].format(anni=anno)} | {euro(importo)} | {euro(valore)} | {euro(perdita)} |"
+            for anno, valore, perdita in zip(anni, reale[scenario], perso[scenario])
+        ])
+    
+    tasso_a, tasso_b = (f"{tasso:.0%}" for tasso in TASSI_INFLAZIONE_REPORT)
+    contributi = ""
+    if contributo_mensile > 0:
+        contributi = frammenti['inflazione_contributi'].format(
+            contributo=euro(contributo_mensile),
+            anni=anni[-1],
+            versato=euro(tabella['versato'][-1]),
+            tasso_a=tasso_a,
+            tasso_b=tasso_b,
+            versato_reale_a=euro(tabella['versato_reale'][0, -1]),
+            versato_reale_b=euro(tabella['versato_reale'][1, -1])
+        )
+    
+    return frammenti['inflazione'].format(
+        importo=euro(importo),
+        titolo=titolo,
+        intro=intro.format(importo=euro(importo)),
+        tasso_a=tasso_a,
+        tasso_b=tasso_b,
+        anni=anni[-1],
+        righe_a=righe(0),
+        righe_b=righe(1),
+        reale_a=euro(reale[0][-1]),
+        reale_b=euro(reale[1][-1]),
+        contributi=contributi
+    )
+
+
+def _esempi_numerici(lang, separatore_decimale):
+    """
+    Calcola con il motore di proiezione le cifre degli esempi dei frammenti statici.
+    
+    Viene chiamata una sola volta per lingua, al primo report (vedi _frammenti).
+    
+    Args:
+        lang (str): Codice lingua (it, en, de)
+        separatore_decimale (str): Separatore decimale delle percentuali nel testo
+        
+    Returns:
+        dict: Valori formattati da sostituire nei frammenti
+    """
+    def migliaia(importo):
+        return formatta_valuta_intera(round(importo, -3), lang)
+    
+    def percentuale(quota, decimali=1):
+        return f"{quota * 100:.{decimali}f}%".replace(".", separatore_decimale)
+    
+    pac_finale = valore_finale(_ESEMPIO_PAC, 0, _ESEMPIO_ANNI, _ESEMPIO_RENDIMENTO_NETTO)
+    costi = griglia_costi(
+        (0.0, _ESEMPIO_TER_BASSO, _ESEMPIO_TER_ALTO, _ESEMPIO_TER_BASSO + 0.01), (_ESEMPIO_ANNI,),
+        ((0.0, _ESEMPIO_CAPITALE),), _ESEMPIO_RENDIMENTO_LORDO
+    )
+    senza_costi, ter_basso, ter_alto, ter_basso_piu_uno = costi['valore_finale'][:, 0, 0].tolist()
+    netto_basso, netto_alto = (
+        float(rendimento_netto(_ESEMPIO_RENDIMENTO_LORDO, ter)) for ter in (_ESEMPIO_TER_BASSO, _ESEMPIO_TER_ALTO)
+    )
+    
+    def fattore(netto):
+        return f"{1 + netto:.4f}".replace(".", separatore_decimale)
+    
+    return {
+        'pac_versato': formatta_valuta_intera(versato_totale(_ESEMPIO_PAC, 0, _ESEMPIO_ANNI), lang),
+        'pac_finale': migliaia(pac_finale),
+        'pensione_tasso': percentuale(_tasso_sostenibile_esempio()),
+        'pensione_mensile': formatta_valuta_intera(round(pac_finale * _tasso_sostenibile_esempio() / 12, -1), lang),
+        'pensione_anni': ANNI_DECUMULO,
+        'pensione_fiducia': percentuale(FIDUCIA, 0),
+        'piccolo_versato': formatta_valuta_intera(versato_totale(_ESEMPIO_PAC_PICCOLO, 0, _ESEMPIO_ANNI), lang),
+        'piccolo_finale': migliaia(valore_finale(_ESEMPIO_PAC_PICCOLO, 0, _ESEMPIO_ANNI, _ESEMPIO_RENDIMENTO_NETTO)),
+        'ter_basso_netto': percentuale(netto_basso, 2),
+        'ter_basso_fattore': fattore(netto_basso),
+        'ter_alto_netto': percentuale(netto_alto, 2),
+        'ter_alto_fattore': fattore(netto_alto),
+        'ter_basso_finale': formatta_valuta_intera(ter_basso, lang),
+        'ter_alto_finale': formatta_valuta_intera(ter_alto, lang),
+        'ter_differenza': formatta_valuta_intera(ter_basso - ter_alto, lang),
+        'ter_costo_punto': percentuale(1 - ter_basso_piu_uno / ter_basso, 0),
+        'ter_mantieni': percentuale(ter_basso / senza_costi),
+        'ter_perdi': percentuale(1 - ter_alto / senza_costi),
+        'spesa_mesi': round(10 * float(tabella_potere_acquisto((0.03,), (30,))[0, 0]))
+    }
+
+
+# ============================================================================
+# FRAMMENTI STATICI - ITALIANO
+# ============================================================================
+
+_INTRO_IT = """
 ## 📈 FASE 3: Investimenti a Lungo Termine
 
 ### Fai Crescere il Tuo Patrimonio
@@ -89,28 +533,24 @@ Come colmi il gap di €600-800 al mese? Solo con risparmi e investimenti accumu
 4. **Lasciare un'eredità** ai tuoi cari
 
 **Esempio di Accumulo (con PAC mensile di €200 per 30 anni):**
-- Versato totale: €72.000
-- Con rendimento medio 5% netto annuo: **~€160.000**
-- Questo capitale può generare €500-600/mese per integrare la pensione!
+- Versato totale: {pac_versato}
+- Con rendimento medio 5% netto annuo: **~{pac_finale}**
+- Prelevando il {pensione_tasso} all'anno (importo costante rivalutato con l'inflazione, che dura {pensione_anni} anni nel {pensione_fiducia} degli scenari simulati), questo capitale può generare circa {pensione_mensile}/mese per integrare la pensione!
 
 ---
 
 ### Disponibilità per Investimenti
 
-**Importo Mensile Investibile**: {formatta_valuta(disponibilita_mensile)}
-"""
-    
-    if capitale_investibile_subito > 0:
-        report += f"**Capitale da Investire Subito (lump sum)**: {formatta_valuta(capitale_investibile_subito)}\n\n"
-        report += """
+**Importo Mensile Investibile**: """
+
+_LUMP_SUM_IT = "**Capitale da Investire Subito (lump sum)**: "
+
+_STRATEGIA_LUMP_SUM_IT = """
 💡 **Strategia Consigliata**: Investi il capitale iniziale in un'unica soluzione (lump sum) seguendo 
 l'allocazione indicata sotto, e continua con investimenti mensili regolari (PAC).
 """
-    
-    report += "\n"
-    
-    if disponibilita_mensile <= 0 and capitale_investibile_subito <= 0:
-        report += """
+
+_NESSUNA_DISPONIBILITA_IT = """
 ### ⚠️ Nessuna Disponibilità
 
 Al momento non hai disponibilità per investimenti a lungo termine. 
@@ -118,12 +558,8 @@ Concentrati sul completare le fasi precedenti o riduci le tue spese.
 
 ---
 """
-        return report
-    
-    # Genera allocazione
-    allocazione = genera_allocazione_investimenti(profilo_rischio, anni_pensione)
-    
-    report += f"""
+
+_ALLOCAZIONE_IT = """
 ### 🎯 La Tua Allocazione di Portafoglio
 
 **Profilo di Rischio**: {profilo_rischio}  
@@ -132,21 +568,51 @@ Concentrati sul completare le fasi precedenti o riduci le tue spese.
 Basandoci sul tuo profilo e orizzonte temporale, ecco l'allocazione suggerita:
 
 """
-    
-    for asset, percentuale in allocazione.items():
-        if disponibilita_mensile > 0:
-            importo_mensile = disponibilita_mensile * (percentuale / 100)
-            report += f"- **{asset}**: {percentuale}% → {formatta_valuta(importo_mensile)} al mese"
-        else:
-            report += f"- **{asset}**: {percentuale}%"
-        
-        if capitale_investibile_subito > 0:
-            importo_lump = capitale_investibile_subito * (percentuale / 100)
-            report += f" (+ {formatta_valuta(importo_lump)} lump sum)"
-        
-        report += "\n"
-    
-    report += """
+
+_GLIDE_PATH_IT = """
+### 🛬 Glide Path: Come Cambia l'Allocazione
+
+Avvicinandoti alla pensione la quota in azioni scende gradualmente a favore delle obbligazioni, per ridurre il rischio quando il capitale ti servirà:
+
+| Anno | Anni alla pensione | Azioni | Obbligazioni | Oro |
+|------|--------------------|--------|--------------|-----|
+{righe}
+"""
+
+_MONTE_CARLO_IT = """
+### 🎲 Proiezione del Tuo Piano (Simulazione Monte Carlo)
+
+Abbiamo simulato **{n_percorsi} scenari di mercato** per i tuoi {anni} anni alla pensione, investendo {contributo} al mese e {capitale} subito seguendo il glide path qui sopra.
+
+| Scenario | Capitale alla pensione |
+|----------|------------------------|
+| Sfavorevole (5° percentile) | {p5} |
+| Mediano (50° percentile) | {p50} |
+| Favorevole (95° percentile) | {p95} |
+
+- **Totale versato**: {versato}
+- **Probabilità di superare il totale versato**: {probabilita}
+
+⚠️ *Ipotesi di rendimento annuo: Azioni {mu_azioni}, Obbligazioni {mu_obbligazioni}, Oro {mu_oro}. Valori nominali, al lordo di costi e tasse: è una simulazione educativa, non una previsione.*
+"""
+
+_DECUMULO_IT = """
+**💶 Dopo la pensione**: con l'allocazione finale del glide path, un prelievo costante del **{tasso}** annuo del capitale (rivalutato ogni anno con l'inflazione) dura {anni} anni nel {fiducia} degli scenari simulati: sul capitale mediano sono circa **{prelievo}/mese**. Con la regola del {tasso_regola} il capitale durerebbe {anni} anni nel {probabilita} degli scenari.
+"""
+
+_COSTI_IT = """
+### 💸 Quanto Ti Costano i Costi (Il Tuo Piano)
+
+Lo stesso piano ({contributo} al mese e {capitale} subito per {anni} anni) con un rendimento lordo ipotetico del {rendimento} annuo, al variare dei costi annui (TER). Senza costi il capitale finale sarebbe {senza_costi}.
+
+| TER | Capitale finale | Costi pagati | Capitale perso |
+|-----|-----------------|--------------|----------------|
+{righe}
+
+*Il capitale perso comprende i costi pagati e il rendimento che quei soldi avrebbero prodotto.*
+"""
+
+_DETTAGLI_IT = """
 
 ---
 
@@ -276,7 +742,7 @@ Quando scegli una piattaforma di investimento, valuta:
    - Le crisi sono opportunità (compri a sconto con PAC)
 
 2. **💎 COSTI BASSI = Più Rendimento**
-   - TER 0.20% vs 1.50% = €24.590 di differenza su €10.000 in 30 anni!
+   - TER 0.20% vs 1.50% = {ter_differenza} di differenza su €10.000 in 30 anni!
    - ⚠️ Calcolo teorico con interesse composto al 7% lordo annuo (non una previsione di mercato)
 
 3. **🧘 DISCIPLINA = PAC Continuo**
@@ -301,7 +767,7 @@ Quando scegli una piattaforma di investimento, valuta:
 **Formula dell'Interesse Composto:**
 ```
 Capitale Finale = Capitale Iniziale × (1 + Rendimento Netto Annuo)^Anni
-Rendimento Netto = Rendimento Lordo - TER
+Rendimento Netto = (1 + Rendimento Lordo) × (1 - TER) - 1
 ```
 
 **Esempio con €10.000 investiti per 30 anni:**
@@ -309,22 +775,22 @@ Rendimento Netto = Rendimento Lordo - TER
 **Scenario 1: ETF a Basso Costo (TER 0.20%)**
 - Rendimento lordo: 7.00% annuo
 - Costi (TER): 0.20% annuo
-- Rendimento netto: 6.80% annuo
-- Capitale finale: €10.000 × (1.068)³⁰ = **€76.465**
+- Rendimento netto: {ter_basso_netto} annuo
+- Capitale finale: €10.000 × ({ter_basso_fattore})³⁰ = **{ter_basso_finale}**
 
 **Scenario 2: Fondo Attivo Costoso (TER 1.50%)**
 - Rendimento lordo: 7.00% annuo
 - Costi (TER): 1.50% annuo
-- Rendimento netto: 5.50% annuo
-- Capitale finale: €10.000 × (1.055)³⁰ = **€51.874**
+- Rendimento netto: {ter_alto_netto} annuo
+- Capitale finale: €10.000 × ({ter_alto_fattore})³⁰ = **{ter_alto_finale}**
 
-**💰 Differenza: €24.591 persi in costi!**
+**💰 Differenza: {ter_differenza} persi in costi!**
 
-Questo significa che **ogni 1% di costi in più ti costa circa il 32% del tuo capitale finale** su un orizzonte di 30 anni.
+Questo significa che **ogni 1% di costi in più ti costa circa il {ter_costo_punto} del tuo capitale finale** su un orizzonte di 30 anni.
 
 **📉 Impatto Percentuale dei Costi:**
-- Con TER 0.20%: Mantieni il 96.5% del potenziale rendimento
-- Con TER 1.50%: Perdi il 32.1% del potenziale rendimento
+- Con TER 0.20%: Mantieni il {ter_mantieni} del potenziale rendimento
+- Con TER 1.50%: Perdi il {ter_perdi} del potenziale rendimento
 
 **Conclusione:** I costi hanno un impatto devastante sul lungo termine a causa dell'interesse composto. Anche differenze apparentemente piccole (1% vs 0.2%) si traducono in decine di migliaia di euro persi - soldi che avrebbero potuto integrare la tua pensione!
 
@@ -337,35 +803,41 @@ Questo significa che **ogni 1% di costi in più ti costa circa il 32% del tuo ca
 **Cos'è l'Inflazione?**
 L'inflazione è l'aumento generalizzato dei prezzi nel tempo, che riduce il potere d'acquisto del denaro.
 
-**🚨 Impatto dell'Inflazione su €10.000 (Esempi Reali):**
+"""
+
+_INFLAZIONE_IT = """**🚨 Impatto dell'Inflazione su {importo} ({titolo}):**
 
-Immagina di avere €10.000 risparmiati oggi. Ecco cosa succede se li lasci fermi sul conto corrente:
+{intro}
 
-**Scenario A: Inflazione al 2% annuo (target BCE)**
+**Scenario A: Inflazione al {tasso_a} annuo (target BCE)**
 
 | Anno | Valore Nominale | Potere d'Acquisto Reale | Hai Perso |
 |------|-----------------|-------------------------|-----------|
-| Oggi | €10.000 | €10.000 | €0 |
-| 10 anni | €10.000 | €8.203 | €1.797 |
-| 20 anni | €10.000 | €6.730 | €3.270 |
-| 30 anni | €10.000 | €5.521 | €4.479 |
+{righe_a}
 
-**Con inflazione al 2%, in 30 anni i tuoi €10.000 valgono come €5.521 di oggi!**
+**Con inflazione al {tasso_a}, in {anni} anni i tuoi {importo} valgono come {reale_a} di oggi!**
 
-**Scenario B: Inflazione al 3% annuo (più realistica storicamente)**
+**Scenario B: Inflazione al {tasso_b} annuo (più realistica storicamente)**
 
 | Anno | Valore Nominale | Potere d'Acquisto Reale | Hai Perso |
 |------|-----------------|-------------------------|-----------|
-| Oggi | €10.000 | €10.000 | €0 |
-| 10 anni | €10.000 | €7.441 | €2.559 |
-| 20 anni | €10.000 | €5.537 | €4.463 |
-| 30 anni | €10.000 | €4.120 | €5.880 |
+{righe_b}
+
+**Con inflazione al {tasso_b}, in {anni} anni i tuoi {importo} valgono come {reale_b} di oggi!**
+{contributi}
+"""
+
+_INFLAZIONE_ESEMPIO_IT = ("Esempi Reali", "Immagina di avere {importo} risparmiati oggi. Ecco cosa succede se li lasci fermi sul conto corrente:")
+
+_INFLAZIONE_UTENTE_IT = ("La Tua Liquidità", "Oggi hai {importo} di liquidità. Ecco cosa succede se li lasci fermi sul conto corrente:")
 
-**Con inflazione al 3%, in 30 anni i tuoi €10.000 valgono come €4.120 di oggi!**
+_INFLAZIONE_CONTRIBUTI_IT = """
+**E i risparmi futuri?** Accantonando {contributo} al mese sul conto per {anni} anni versi {versato}, che con inflazione al {tasso_a} varranno solo {versato_reale_a} di oggi (al {tasso_b}: {versato_reale_b}).
+"""
 
-#### 🛒 Esempio Pratico: La Spesa al Supermercato
+_DETTAGLI_FINE_IT = """#### 🛒 Esempio Pratico: La Spesa al Supermercato
 
-Se oggi con €10.000 fai la spesa per 10 mesi (€1.000/mese), tra 30 anni con inflazione al 3% quei soldi basteranno solo per **4 mesi di spesa**!
+Se oggi con €10.000 fai la spesa per 10 mesi (€1.000/mese), tra 30 anni con inflazione al 3% quei soldi basteranno solo per **{spesa_mesi} mesi di spesa**!
 
 #### 💡 Lezioni Chiave per TUTTI:
 
@@ -377,7 +849,7 @@ Se oggi con €10.000 fai la spesa per 10 mesi (€1.000/mese), tra 30 anni con
 2. **Non serve essere ricchi per investire**
    - Con €50-100 al mese puoi iniziare un PAC
    - I piccoli importi diventano grandi con il tempo
-   - €100/mese per 30 anni = €36.000 versati → €~80.000 con rendimento medio
+   - €100/mese per 30 anni = {piccolo_versato} versati → ~{piccolo_finale} con rendimento medio
 
 3. **Il tempo è il tuo migliore alleato**
    - Prima inizi, più l'interesse composto lavora per te
@@ -494,14 +966,38 @@ Cerca canali di finanza personale in tedesco focalizzati su:
 
 ---
 """
-    
-    return report
 
-
-def _genera_report_fase3_en(disponibilita_mensile, capitale_investibile_subito, profilo_rischio, anni_pensione):
-    """Generates PHASE 3 report in English with complete details."""
-    
-    report = f"""
+_FRAMMENTI_IT = {
+    'lang': 'it',
+    'intro': _INTRO_IT,
+    'lump_sum': _LUMP_SUM_IT,
+    'strategia_lump_sum': _STRATEGIA_LUMP_SUM_IT,
+    'nessuna_disponibilita': _NESSUNA_DISPONIBILITA_IT,
+    'allocazione': _ALLOCAZIONE_IT,
+    'nomi_asset': {},
+    'al_mese': " al mese",
+    'suffisso_lump_sum': " lump sum",
+    'glide_path': _GLIDE_PATH_IT,
+    'monte_carlo': _MONTE_CARLO_IT,
+    'decumulo': _DECUMULO_IT,
+    'costi': _COSTI_IT,
+    'separatore_migliaia': '.',
+    'separatore_decimale': '.',
+    'inflazione': _INFLAZIONE_IT,
+    'inflazione_esempio': _INFLAZIONE_ESEMPIO_IT,
+    'inflazione_utente': _INFLAZIONE_UTENTE_IT,
+    'inflazione_contributi': _INFLAZIONE_CONTRIBUTI_IT,
+    'inflazione_oggi': "Oggi",
+    'inflazione_anni': "{anni} anni",
+    'dettagli': _DETTAGLI_IT,
+    'dettagli_fine': _DETTAGLI_FINE_IT
+}
+
+# ============================================================================
+# FRAMMENTI STATICI - ENGLISH
+# ============================================================================
+
+_INTRO_EN = """
 ## 📈 PHASE 3: Long-Term Investments
 
 ### Grow Your Wealth
@@ -556,28 +1052,24 @@ How do you fill the gap of €600-800 per month? Only with savings and investmen
 4. **Leave an inheritance** to your loved ones
 
 **Accumulation Example (with €200 monthly PAC for 30 years):**
-- Total invested: €72,000
-- With average 5% net annual return: **~€160,000**
-- This capital can generate €500-600/month to supplement your pension!
+- Total invested: {pac_versato}
+- With average 5% net annual return: **~{pac_finale}**
+- Withdrawing {pensione_tasso} per year (a constant amount adjusted for inflation, lasting {pensione_anni} years in {pensione_fiducia} of simulated scenarios), this capital can generate about {pensione_mensile}/month to supplement your pension!
 
 ---
 
 ### Investment Availability
 
-**Monthly Investable Amount**: {formatta_valuta(disponibilita_mensile)}
-"""
-    
-    if capitale_investibile_subito > 0:
-        report += f"**Capital to Invest Immediately (lump sum)**: {formatta_valuta(capitale_investibile_subito)}\n\n"
-        report += """
+**Monthly Investable Amount**: """
+
+_LUMP_SUM_EN = "**Capital to Invest Immediately (lump sum)**: "
+
+_STRATEGIA_LUMP_SUM_EN = """
 💡 **Recommended Strategy**: Invest the initial capital in a single lump sum following 
 the allocation indicated below, and continue with regular monthly investments (PAC).
 """
-    
-    report += "\n"
-    
-    if disponibilita_mensile <= 0 and capitale_investibile_subito <= 0:
-        report += """
+
+_NESSUNA_DISPONIBILITA_EN = """
 ### ⚠️ No Availability
 
 Currently you have no availability for long-term investments. 
@@ -585,12 +1077,8 @@ Focus on completing previous phases or reduce your expenses.
 
 ---
 """
-        return report
-    
-    # Generate allocation
-    allocazione = genera_allocazione_investimenti(profilo_rischio, anni_pensione)
-    
-    report += f"""
+
+_ALLOCAZIONE_EN = """
 ### 🎯 Your Portfolio Allocation
 
 **Risk Profile**: {profilo_rischio}  
@@ -599,22 +1087,51 @@ Focus on completing previous phases or reduce your expenses.
 Based on your profile and time horizon, here's the suggested allocation:
 
 """
-    
-    for asset, percentuale in allocazione.items():
-        asset_en = {"Azioni": "Stocks", "Obbligazioni": "Bonds", "Oro": "Gold"}.get(asset, asset)
-        if disponibilita_mensile > 0:
-            importo_mensile = disponibilita_mensile * (percentuale / 100)
-            report += f"- **{asset_en}**: {percentuale}% → {formatta_valuta(importo_mensile)} per month"
-        else:
-            report += f"- **{asset_en}**: {percentuale}%"
-        
-        if capitale_investibile_subito > 0:
-            importo_lump = capitale_investibile_subito * (percentuale / 100)
-            report += f" (+ {formatta_valuta(importo_lump)} lump sum)"
-        
-        report += "\n"
-    
-    report += """
+
+_GLIDE_PATH_EN = """
+### 🛬 Glide Path: How Your Allocation Changes
+
+As you approach retirement the share of stocks gradually decreases in favor of bonds, reducing risk when you will need the capital:
+
+| Year | Years to retirement | Stocks | Bonds | Gold |
+|------|---------------------|--------|-------|------|
+{righe}
+"""
+
+_MONTE_CARLO_EN = """
+### 🎲 Your Plan Projection (Monte Carlo Simulation)
+
+We simulated **{n_percorsi} market scenarios** over your {anni} years to retirement, investing {contributo} per month and {capitale} immediately following the glide path above.
+
+| Scenario | Capital at retirement |
+|----------|-----------------------|
+| Unfavorable (5th percentile) | {p5} |
+| Median (50th percentile) | {p50} |
+| Favorable (95th percentile) | {p95} |
+
+- **Total contributed**: {versato}
+- **Probability of exceeding the total contributed**: {probabilita}
+
+⚠️ *Assumed annual returns: Stocks {mu_azioni}, Bonds {mu_obbligazioni}, Gold {mu_oro}. Nominal values, before costs and taxes: this is an educational simulation, not a forecast.*
+"""
+
+_DECUMULO_EN = """
+**💶 After retirement**: with the final glide path allocation, a constant withdrawal of **{tasso}** of the capital per year (adjusted every year for inflation) lasts {anni} years in {fiducia} of simulated scenarios: on the median capital this is about **{prelievo}/month**. With the {tasso_regola} rule the capital would last {anni} years in {probabilita} of scenarios.
+"""
+
+_COSTI_EN = """
+### 💸 What Costs Cost You (Your Plan)
+
+The same plan ({contributo} per month and {capitale} immediately for {anni} years) with a hypothetical gross return of {rendimento} per year, for different annual costs (TER). Without costs the final capital would be {senza_costi}.
+
+| TER | Final capital | Costs paid | Capital lost |
+|-----|---------------|------------|--------------|
+{righe}
+
+*The capital lost includes the costs paid and the return that money would have earned.*
+"""
+
+_DETTAGLI_EN = """
 
 ---
 
@@ -744,7 +1261,7 @@ When choosing an investment platform, evaluate:
    - Crises are opportunities (buy at discount with PAC)
 
 2. **💎 LOW COSTS = More Returns**
-   - TER 0.20% vs 1.50% = €24,590 difference on €10,000 over 30 years!
+   - TER 0.20% vs 1.50% = {ter_differenza} difference on €10,000 over 30 years!
    - ⚠️ Theoretical calculation with 7% gross annual compound interest (not a market forecast)
 
 3. **🧘 DISCIPLINE = Continuous PAC**
@@ -769,7 +1286,7 @@ When choosing an investment platform, evaluate:
 **Compound Interest Formula:**
 ```
 Final Capital = Initial Capital × (1 + Net Annual Return)^Years
-Net Return = Gross Return - TER
+Net Return = (1 + Gross Return) × (1 - TER) - 1
 ```
 
 **Example with €10,000 invested for 30 years:**
@@ -777,22 +1294,22 @@ Net Return = Gross Return - TER
 **Scenario 1: Low-Cost ETF (TER 0.20%)**
 - Gross return: 7.00% per year
 - Costs (TER): 0.20% per year
-- Net return: 6.80% per year
-- Final capital: €10,000 × (1.068)³⁰ = **€76,465**
+- Net return: {ter_basso_netto} per year
+- Final capital: €10,000 × ({ter_basso_fattore})³⁰ = **{ter_basso_finale}**
 
 **Scenario 2: Expensive Active Fund (TER 1.50%)**
 - Gross return: 7.00% per year
 - Costs (TER): 1.50% per year
-- Net return: 5.50% per year
-- Final capital: €10,000 × (1.055)³⁰ = **€51,874**
+- Net return: {ter_alto_netto} per year
+- Final capital: €10,000 × ({ter_alto_fattore})³⁰ = **{ter_alto_finale}**
 
-**💰 Difference: €24,591 lost to costs!**
+**💰 Difference: {ter_differenza} lost to costs!**
 
-This means that **every 1% extra in costs costs you approximately 32% of your final capital** over a 30-year horizon.
+This means that **every 1% extra in costs costs you approximately {ter_costo_punto} of your final capital** over a 30-year horizon.
 
 **📉 Percentage Impact of Costs:**
-- With TER 0.20%: You keep 96.5% of potential returns
-- With TER 1.50%: You lose 32.1% of potential returns
+- With TER 0.20%: You keep {ter_mantieni} of potential returns
+- With TER 1.50%: You lose {ter_perdi} of potential returns
 
 **Conclusion:** Costs have a devastating long-term impact due to compound interest. Even seemingly small differences (1% vs 0.2%) translate into tens of thousands of euros lost - money that could have supplemented your pension!
 
@@ -805,35 +1322,41 @@ This means that **every 1% extra in costs costs you approximately 32% of your fi
 **What is Inflation?**
 Inflation is the general increase in prices over time, which reduces the purchasing power of money.
 
-**🚨 Impact of Inflation on €10,000 (Real Examples):**
+"""
+
+_INFLAZIONE_EN = """**🚨 Impact of Inflation on {importo} ({titolo}):**
 
-Imagine having €10,000 saved today. Here's what happens if you leave them idle in your checking account:
+{intro}
 
-**Scenario A: 2% annual inflation (ECB target)**
+**Scenario A: {tasso_a} annual inflation (ECB target)**
 
 | Year | Nominal Value | Real Purchasing Power | You've Lost |
 |------|---------------|----------------------|-------------|
-| Today | €10,000 | €10,000 | €0 |
-| 10 years | €10,000 | €8,203 | €1,797 |
-| 20 years | €10,000 | €6,730 | €3,270 |
-| 30 years | €10,000 | €5,521 | €4,479 |
+{righe_a}
 
-**With 2% inflation, in 30 years your €10,000 are worth like €5,521 today!**
+**With {tasso_a} inflation, in {anni} years your {importo} are worth like {reale_a} today!**
 
-**Scenario B: 3% annual inflation (more historically realistic)**
+**Scenario B: {tasso_b} annual inflation (more historically realistic)**
 
 | Year | Nominal Value | Real Purchasing Power | You've Lost |
 |------|---------------|----------------------|-------------|
-| Today | €10,000 | €10,000 | €0 |
-| 10 years | €10,000 | €7,441 | €2,559 |
-| 20 years | €10,000 | €5,537 | €4,463 |
-| 30 years | €10,000 | €4,120 | €5,880 |
+{righe_b}
 
-**With 3% inflation, in 30 years your €10,000 are worth like €4,120 today!**
+**With {tasso_b} inflation, in {anni} years your {importo} are worth like {reale_b} today!**
+{contributi}
+"""
 
-#### 🛒 Practical Example: Grocery Shopping
+_INFLAZIONE_ESEMPIO_EN = ("Real Examples", "Imagine having {importo} saved today. Here's what happens if you leave them idle in your checking account:")
 
-If today with €10,000 you do grocery shopping for 10 months (€1,000/month), in 30 years with 3% inflation that money will only be enough for **4 months of groceries**!
+_INFLAZIONE_UTENTE_EN = ("Your Liquidity", "Today you have {importo} in liquidity. Here's what happens if you leave it idle in your checking account:")
+
+_INFLAZIONE_CONTRIBUTI_EN = """
+**And future savings?** Setting aside {contributo} per month in your account for {anni} years you deposit {versato}, which with {tasso_a} inflation will only be worth {versato_reale_a} today (at {tasso_b}: {versato_reale_b}).
+"""
+
+_DETTAGLI_FINE_EN = """#### 🛒 Practical Example: Grocery Shopping
+
+If today with €10,000 you do grocery shopping for 10 months (€1,000/month), in 30 years with 3% inflation that money will only be enough for **{spesa_mesi} months of groceries**!
 
 #### 💡 Key Lessons for EVERYONE:
 
@@ -845,7 +1368,7 @@ If today with €10,000 you do grocery shopping for 10 months (€1,000/month),
 2. **You don't need to be rich to invest**
    - With €50-100 per month you can start a PAC
    - Small amounts become large with time
-   - €100/month for 30 years = €36,000 invested → €~80,000 with average return
+   - €100/month for 30 years = {piccolo_versato} invested → ~{piccolo_finale} with average return
 
 3. **Time is your best ally**
    - The earlier you start, the more compound interest works for you
@@ -962,14 +1485,38 @@ Look for German personal finance channels focused on:
 
 ---
 """
-    
-    return report
 
-
-def _genera_report_fase3_de(disponibilita_mensile, capitale_investibile_subito, profilo_rischio, anni_pensione):
-    """Generiert PHASE 3 Bericht auf Deutsch mit vollständigen Details."""
-    
-    report = f"""
+_FRAMMENTI_EN = {
+    'lang': 'en',
+    'intro': _INTRO_EN,
+    'lump_sum': _LUMP_SUM_EN,
+    'strategia_lump_sum': _STRATEGIA_LUMP_SUM_EN,
+    'nessuna_disponibilita': _NESSUNA_DISPONIBILITA_EN,
+    'allocazione': _ALLOCAZIONE_EN,
+    'nomi_asset': {"Azioni": "Stocks", "Obbligazioni": "Bonds", "Oro": "Gold"},
+    'al_mese': " per month",
+    'suffisso_lump_sum': " lump sum",
+    'glide_path': _GLIDE_PATH_EN,
+    'monte_carlo': _MONTE_CARLO_EN,
+    'decumulo': _DECUMULO_EN,
+    'costi': _COSTI_EN,
+    'separatore_migliaia': ',',
+    'separatore_decimale': '.',
+    'inflazione': _INFLAZIONE_EN,
+    'inflazione_esempio': _INFLAZIONE_ESEMPIO_EN,
+    'inflazione_utente': _INFLAZIONE_UTENTE_EN,
+    'inflazione_contributi': _INFLAZIONE_CONTRIBUTI_EN,
+    'inflazione_oggi': "Today",
+    'inflazione_anni': "{anni} years",
+    'dettagli': _DETTAGLI_EN,
+    'dettagli_fine': _DETTAGLI_FINE_EN
+}
+
+# ============================================================================
+# FRAMMENTI STATICI - DEUTSCH
+# ============================================================================
+
+_INTRO_DE = """
 ## 📈 PHASE 3: Langfristige Investitionen
 
 ### Lassen Sie Ihr Vermögen wachsen
@@ -1024,28 +1571,24 @@ Wie schließen Sie die Lücke von €600-800 pro Monat? Nur mit Ersparnissen und
 4. **Ein Erbe zu hinterlassen** für Ihre Lieben
 
 **Beispiel Ansparen (mit €200 monatlichem PAC für 30 Jahre):**
-- Insgesamt eingezahlt: €72.000
-- Mit durchschnittlich 5% Nettorendite pro Jahr: **~€160.000**
-- Dieses Kapital kann €500-600/Monat generieren, um die Rente zu ergänzen!
+- Insgesamt eingezahlt: {pac_versato}
+- Mit durchschnittlich 5% Nettorendite pro Jahr: **~{pac_finale}**
+- Bei einer Entnahme von {pensione_tasso} pro Jahr (konstanter, inflationsangepasster Betrag, der in {pensione_fiducia} der simulierten Szenarien {pensione_anni} Jahre reicht) kann dieses Kapital etwa {pensione_mensile}/Monat generieren, um die Rente zu ergänzen!
 
 ---
 
 ### Investitionsverfügbarkeit
 
-**Monatlich investierbarer Betrag**: {formatta_valuta(disponibilita_mensile)}
-"""
-    
-    if capitale_investibile_subito > 0:
-        report += f"**Sofort zu investierendes Kapital (Einmalanlage)**: {formatta_valuta(capitale_investibile_subito)}\n\n"
-        report += """
+**Monatlich investierbarer Betrag**: """
+
+_LUMP_SUM_DE = "**Sofort zu investierendes Kapital (Einmalanlage)**: "
+
+_STRATEGIA_LUMP_SUM_DE = """
 💡 **Empfohlene Strategie**: Investieren Sie das Anfangskapital in einer Einmalanlage gemäß 
 der unten angegebenen Allokation und fahren Sie mit regelmäßigen monatlichen Investitionen (PAC) fort.
 """
-    
-    report += "\n"
-    
-    if disponibilita_mensile <= 0 and capitale_investibile_subito <= 0:
-        report += """
+
+_NESSUNA_DISPONIBILITA_DE = """
 ### ⚠️ Keine Verfügbarkeit
 
 Derzeit haben Sie keine Verfügbarkeit für langfristige Investitionen. 
@@ -1053,12 +1596,8 @@ Konzentrieren Sie sich auf das Abschließen vorheriger Phasen oder reduzieren Si
 
 ---
 """
-        return report
-    
-    # Allokation generieren
-    allocazione = genera_allocazione_investimenti(profilo_rischio, anni_pensione)
-    
-    report += f"""
+
+_ALLOCAZIONE_DE = """
 ### 🎯 Ihre Portfolio-Allokation
 
 **Risikoprofil**: {profilo_rischio}  
@@ -1067,22 +1606,51 @@ Konzentrieren Sie sich auf das Abschließen vorheriger Phasen oder reduzieren Si
 Basierend auf Ihrem Profil und Zeithorizont ist hier die vorgeschlagene Allokation:
 
 """
-    
-    for asset, percentuale in allocazione.items():
-        asset_de = {"Azioni": "Aktien", "Obbligazioni": "Anleihen", "Oro": "Gold"}.get(asset, asset)
-        if disponibilita_mensile > 0:
-            importo_mensile = disponibilita_mensile * (percentuale / 100)
-            report += f"- **{asset_de}**: {percentuale}% → {formatta_valuta(importo_mensile)} pro Monat"
-        else:
-            report += f"- **{asset_de}**: {percentuale}%"
-        
-        if capitale_investibile_subito > 0:
-            importo_lump = capitale_investibile_subito * (percentuale / 100)
-            report += f" (+ {formatta_valuta(importo_lump)} Einmalanlage)"
-        
-        report += "\n"
-    
-    report += """
+
+_GLIDE_PATH_DE = """
+### 🛬 Gleitpfad: Wie sich Ihre Allokation verändert
+
+Je näher die Rente rückt, desto mehr sinkt der Aktienanteil schrittweise zugunsten von Anleihen, um das Risiko zu verringern, wenn Sie das Kapital benötigen:
+
+| Jahr | Jahre bis zur Rente | Aktien | Anleihen | Gold |
+|------|---------------------|--------|----------|------|
+{righe}
+"""
+
+_MONTE_CARLO_DE = """
+### 🎲 Projektion Ihres Plans (Monte-Carlo-Simulation)
+
+Wir haben **{n_percorsi} Marktszenarien** über Ihre {anni} Jahre bis zur Rente simuliert, mit {contributo} pro Monat und {capitale} sofort investiert gemäß dem Gleitpfad oben.
+
+| Szenario | Kapital bei Renteneintritt |
+|----------|----------------------------|
+| Ungünstig (5. Perzentil) | {p5} |
+| Median (50. Perzentil) | {p50} |
+| Günstig (95. Perzentil) | {p95} |
+
+- **Insgesamt eingezahlt**: {versato}
+- **Wahrscheinlichkeit, den eingezahlten Betrag zu übertreffen**: {probabilita}
+
+⚠️ *Angenommene Jahresrenditen: Aktien {mu_azioni}, Anleihen {mu_obbligazioni}, Gold {mu_oro}. Nominalwerte, vor Kosten und Steuern: Dies ist eine Bildungssimulation, keine Prognose.*
+"""
+
+_DECUMULO_DE = """
+**💶 Nach dem Renteneintritt**: Mit der finalen Allokation des Gleitpfads reicht eine konstante Entnahme von **{tasso}** des Kapitals pro Jahr (jährlich an die Inflation angepasst) in {fiducia} der simulierten Szenarien {anni} Jahre: beim Median-Kapital sind das etwa **{prelievo}/Monat**. Mit der {tasso_regola}-Regel würde das Kapital in {probabilita} der Szenarien {anni} Jahre reichen.
+"""
+
+_COSTI_DE = """
+### 💸 Was Sie die Kosten Kosten (Ihr Plan)
+
+Derselbe Plan ({contributo} pro Monat und {capitale} sofort für {anni} Jahre) mit einer hypothetischen Bruttorendite von {rendimento} pro Jahr, bei unterschiedlichen jährlichen Kosten (TER). Ohne Kosten läge das Endkapital bei {senza_costi}.
+
+| TER | Endkapital | Gezahlte Kosten | Verlorenes Kapital |
+|-----|------------|-----------------|--------------------|
+{righe}
+
+*Das verlorene Kapital umfasst die gezahlten Kosten und die Rendite, die dieses Geld erzielt hätte.*
+"""
+
+_DETTAGLI_DE = """
 
 ---
 
@@ -1212,7 +1780,7 @@ Bei der Auswahl einer Investitionsplattform bewerten Sie:
    - Krisen sind Gelegenheiten (kaufen Sie mit Rabatt durch PAC)
 
 2. **💎 NIEDRIGE KOSTEN = Mehr Rendite**
-   - TER 0,20% vs. 1,50% = €24.590 Unterschied auf €10.000 über 30 Jahre!
+   - TER 0,20% vs. 1,50% = {ter_differenza} Unterschied auf €10.000 über 30 Jahre!
    - ⚠️ Theoretische Berechnung mit 7% Brutto-Jahreszins (keine Marktprognose)
 
 3. **🧘 DISZIPLIN = Kontinuierlicher PAC**
@@ -1237,7 +1805,7 @@ Bei der Auswahl einer Investitionsplattform bewerten Sie:
 **Zinseszins-Formel:**
 ```
 Endkapital = Anfangskapital × (1 + Netto-Jahresrendite)^Jahre
-Nettorendite = Bruttorendite - TER
+Nettorendite = (1 + Bruttorendite) × (1 - TER) - 1
 ```
 
 **Beispiel mit €10.000 investiert für 30 Jahre:**
@@ -1245,22 +1813,22 @@ Nettorendite = Bruttorendite - TER
 **Szenario 1: Kostengünstiger ETF (TER 0,20%)**
 - Bruttorendite: 7,00% pro Jahr
 - Kosten (TER): 0,20% pro Jahr
-- Nettorendite: 6,80% pro Jahr
-- Endkapital: €10.000 × (1,068)³⁰ = **€76.465**
+- Nettorendite: {ter_basso_netto} pro Jahr
+- Endkapital: €10.000 × ({ter_basso_fattore})³⁰ = **{ter_basso_finale}**
 
 **Szenario 2: Teurer aktiver Fonds (TER 1,50%)**
 - Bruttorendite: 7,00% pro Jahr
 - Kosten (TER): 1,50% pro Jahr
-- Nettorendite: 5,50% pro Jahr
-- Endkapital: €10.000 × (1,055)³⁰ = **€51.874**
+- Nettorendite: {ter_alto_netto} pro Jahr
+- Endkapital: €10.000 × ({ter_alto_fattore})³⁰ = **{ter_alto_finale}**
 
-**💰 Unterschied: €24.591 durch Kosten verloren!**
+**💰 Unterschied: {ter_differenza} durch Kosten verloren!**
 
-Das bedeutet, dass **jedes zusätzliche 1% an Kosten Sie etwa 32% Ihres Endkapitals kostet** über einen 30-Jahres-Horizont.
+Das bedeutet, dass **jedes zusätzliche 1% an Kosten Sie etwa {ter_costo_punto} Ihres Endkapitals kostet** über einen 30-Jahres-Horizont.
 
 **📉 Prozentuale Auswirkung der Kosten:**
-- Mit TER 0,20%: Sie behalten 96,5% der potenziellen Rendite
-- Mit TER 1,50%: Sie verlieren 32,1% der potenziellen Rendite
+- Mit TER 0,20%: Sie behalten {ter_mantieni} der potenziellen Rendite
+- Mit TER 1,50%: Sie verlieren {ter_perdi} der potenziellen Rendite
 
 **Fazit:** Kosten haben aufgrund des Zinseszinses eine verheerende langfristige Auswirkung. Selbst scheinbar kleine Unterschiede (1% vs. 0,2%) führen zu Zehntausenden von Euro an Verlusten - Geld, das Ihre Rente hätte ergänzen können!
 
@@ -1273,35 +1841,41 @@ Das bedeutet, dass **jedes zusätzliche 1% an Kosten Sie etwa 32% Ihres Endkapit
 **Was ist Inflation?**
 Inflation ist der allgemeine Preisanstieg im Laufe der Zeit, der die Kaufkraft des Geldes verringert.
 
-**🚨 Auswirkung der Inflation auf €10.000 (Reale Beispiele):**
+"""
+
+_INFLAZIONE_DE = """**🚨 Auswirkung der Inflation auf {importo} ({titolo}):**
 
-Stellen Sie sich vor, Sie haben heute €10.000 gespart. Hier ist, was passiert, wenn Sie sie ungenutzt auf dem Girokonto lassen:
+{intro}
 
-**Szenario A: 2% jährliche Inflation (EZB-Ziel)**
+**Szenario A: {tasso_a} jährliche Inflation (EZB-Ziel)**
 
 | Jahr | Nominalwert | Reale Kaufkraft | Sie haben verloren |
 |------|-------------|-----------------|-------------------|
-| Heute | €10.000 | €10.000 | €0 |
-| 10 Jahre | €10.000 | €8.203 | €1.797 |
-| 20 Jahre | €10.000 | €6.730 | €3.270 |
-| 30 Jahre | €10.000 | €5.521 | €4.479 |
+{righe_a}
 
-**Mit 2% Inflation sind Ihre €10.000 in 30 Jahren wie €5.521 heute wert!**
+**Mit {tasso_a} Inflation sind Ihre {importo} in {anni} Jahren wie {reale_a} heute wert!**
 
-**Szenario B: 3% jährliche Inflation (historisch realistischer)**
+**Szenario B: {tasso_b} jährliche Inflation (historisch realistischer)**
 
 | Jahr | Nominalwert | Reale Kaufkraft | Sie haben verloren |
 |------|-------------|-----------------|-------------------|
-| Heute | €10.000 | €10.000 | €0 |
-| 10 Jahre | €10.000 | €7.441 | €2.559 |
-| 20 Jahre | €10.000 | €5.537 | €4.463 |
-| 30 Jahre | €10.000 | €4.120 | €5.880 |
+{righe_b}
+
+**Mit {tasso_b} Inflation sind Ihre {importo} in {anni} Jahren wie {reale_b} heute wert!**
+{contributi}
+"""
+
+_INFLAZIONE_ESEMPIO_DE = ("Reale Beispiele", "Stellen Sie sich vor, Sie haben heute {importo} gespart. Hier ist, was passiert, wenn Sie sie ungenutzt auf dem Girokonto lassen:")
 
-**Mit 3% Inflation sind Ihre €10.000 in 30 Jahren wie €4.120 heute wert!**
+_INFLAZIONE_UTENTE_DE = ("Ihre Liquidität", "Heute haben Sie {importo} an Liquidität. Hier ist, was passiert, wenn Sie sie ungenutzt auf dem Girokonto lassen:")
 
-#### 🛒 Praktisches Beispiel: Der Supermarkteinkauf
+_INFLAZIONE_CONTRIBUTI_DE = """
+**Und zukünftige Ersparnisse?** Wenn Sie {anni} Jahre lang {contributo} pro Monat auf dem Konto zurücklegen, zahlen Sie {versato} ein, die bei {tasso_a} Inflation nur noch {versato_reale_a} heute wert sind (bei {tasso_b}: {versato_reale_b}).
+"""
+
+_DETTAGLI_FINE_DE = """#### 🛒 Praktisches Beispiel: Der Supermarkteinkauf
 
-Wenn Sie heute mit €10.000 für 10 Monate einkaufen (€1.000/Monat), reicht dieses Geld in 30 Jahren mit 3% Inflation nur noch für **4 Monate Einkäufe**!
+Wenn Sie heute mit €10.000 für 10 Monate einkaufen (€1.000/Monat), reicht dieses Geld in 30 Jahren mit 3% Inflation nur noch für **{spesa_mesi} Monate Einkäufe**!
 
 #### 💡 Wichtige Lektionen für ALLE:
 
@@ -1313,7 +1887,7 @@ Wenn Sie heute mit €10.000 für 10 Monate einkaufen (€1.000/Monat), reicht d
 2. **Man muss nicht reich sein, um zu investieren**
    - Mit €50-100 pro Monat können Sie einen PAC starten
    - Kleine Beträge werden mit der Zeit groß
-   - €100/Monat für 30 Jahre = €36.000 eingezahlt → €~80.000 mit durchschnittlicher Rendite
+   - €100/Monat für 30 Jahre = {piccolo_versato} eingezahlt → ~{piccolo_finale} mit durchschnittlicher Rendite
 
 3. **Zeit ist Ihr bester Verbündeter**
    - Je früher Sie anfangen, desto mehr arbeitet der Zinseszins für Sie
@@ -1430,5 +2004,29 @@ Suchen Sie nach deutschen Finanzbildungskanälen mit Fokus auf:
 
 ---
 """
-    
-    return report
+
+_FRAMMENTI_DE = {
+    'lang': 'de',
+    'intro': _INTRO_DE,
+    'lump_sum': _LUMP_SUM_DE,
+    'strategia_lump_sum': _STRATEGIA_LUMP_SUM_DE,
+    'nessuna_disponibilita': _NESSUNA_DISPONIBILITA_DE,
+    'allocazione': _ALLOCAZIONE_DE,
+    'nomi_asset': {"Azioni": "Aktien", "Obbligazioni": "Anleihen", "Oro": "Gold"},
+    'al_mese': " pro Monat",
+    'suffisso_lump_sum': " Einmalanlage",
+    'glide_path': _GLIDE_PATH_DE,
+    'monte_carlo': _MONTE_CARLO_DE,
+    'decumulo': _DECUMULO_DE,
+    'costi': _COSTI_DE,
+    'separatore_migliaia': '.',
+    'separatore_decimale': ',',
+    'inflazione': _INFLAZIONE_DE,
+    'inflazione_esempio': _INFLAZIONE_ESEMPIO_DE,
+    'inflazione_utente': _INFLAZIONE_UTENTE_DE,
+    'inflazione_contributi': _INFLAZIONE_CONTRIBUTI_DE,
+    'inflazione_oggi': "Heute",
+    'inflazione_anni': "{anni} Jahre",
+    'dettagli': _DETTAGLI_DE,
+    'dettagli_fine': _DETTAGLI_FINE_DE
+}
@@ -0,0 +1,147 @@
+"""
+Sensitivity Module
+Analisi "cosa succede se" del piano: le tre fasi (batch_calculations.calcola_piano_batch)
+valutate su una griglia entrate × uscite in un'unica chiamata vettoriale, con risultati di
+shape (E, U) pronti per una heatmap, e sensibilità alle differenze finite per capire quale
+input sposta di più ogni risultato.
+"""
+
+import numpy as np
+
+from batch_calculations import calcola_piano_batch
+from calculations import parametri_obiettivi
+
+
+# Griglia predefinita: ±30% su entrate e uscite, 101 punti per asse (il centro è il piano attuale)
+VARIAZIONE_GRIGLIA = 0.30
+PUNTI_GRIGLIA = 101
+
+# Risultati del piano restituiti dalla griglia e dalle sensibilità
+RISULTATI_SENSIBILITA = (
+    'fondo_emergenza', 'mesi_rientro', 'gap_mensile', 'a_obiettivi',
+    'capitale_investibile_subito', 'disponibilita_investimenti'
+)
+
+# Input perturbati dalle differenze finite ('costi_obiettivi' scala tutti i costi insieme)
+INPUT_SENSIBILITA = ('entrate', 'uscite', 'capitale', 'costi_obiettivi')
+
+# Variazione relativa usata dalle differenze finite centrali
+PASSO_RELATIVO = 0.01
+
+
+def _piano_su_righe(entrate, uscite, capitale, obiettivi, scala_costi=1.0):
+    """
+    Valuta il piano per N varianti dello stesso nucleo con obiettivi comuni.
+
+    Args:
+        entrate, uscite, capitale (np.ndarray): Input di ogni variante, shape (N,)
+        obiettivi (list): Obiettivi del nucleo
+        scala_costi (np.ndarray): Fattore applicato ai costi degli obiettivi, shape (N,)
+
+    Returns:
+        dict: Risultato di calcola_piano_batch
+    """
+    n = entrate.shape[0]
+    costi, anni, rendimenti, inflazione = parametri_obiettivi(obiettivi)
+    forma = (n, costi.shape[0])
+    scala_costi = np.broadcast_to(np.asarray(scala_costi, dtype=float), (n,))
+    return calcola_piano_batch(
+        entrate, uscite, capitale,
+        costi_obiettivi=scala_costi[:, np.newaxis] * costi,
+        anni_obiettivi=np.broadcast_to(anni, forma),
+        rendimenti_obiettivi=np.broadcast_to(rendimenti * 100, forma),
+        inflazione_obiettivi=np.broadcast_to(inflazione * 100, forma)
+    )
+
+
+def griglia_sensibilita(dati_base, obiettivi, variazione_entrate=VARIAZIONE_GRIGLIA,
+                        variazione_uscite=VARIAZIONE_GRIGLIA, punti=PUNTI_GRIGLIA):
+    """
+    Valuta il piano su una griglia di entrate × uscite (una sola chiamata vettoriale).
+
+    Args:
+        dati_base (dict): {'entrate', 'uscite', 'capitale', ...}
+        obiettivi (list): Obiettivi della FASE 2
+        variazione_entrate (float): Variazione relativa massima delle entrate (0.30 = ±30%)
+        variazione_uscite (float): Variazione relativa massima delle uscite
+        punti (int): Punti per asse (dispari per includere il piano attuale al centro)
+
+    Returns:
+        dict: {
+            'entrate': valori delle entrate, shape (E,),
+            'uscite': valori delle uscite, shape (U,),
+            'variazioni_entrate', 'variazioni_uscite': variazioni relative degli assi,
+            più ogni chiave di RISULTATI_SENSIBILITA come array di shape (E, U)
+        }
+    """
+    variazioni_entrate = np.linspace(-variazione_entrate, variazione_entrate, punti)
+    variazioni_uscite = np.linspace(-variazione_uscite, variazione_uscite, punti)
+    entrate = dati_base['entrate'] * (1 + variazioni_entrate)
+    uscite = dati_base['uscite'] * (1 + variazioni_uscite)
+
+    griglia_entrate, griglia_uscite = np.meshgrid(entrate, uscite, indexing='ij')
+    n = griglia_entrate.size
+    piano = _piano_su_righe(
+        griglia_entrate.ravel(), griglia_uscite.ravel(), np.full(n, float(dati_base['capitale'])), obiettivi
+    )
+
+    risultato = {
+        'entrate': entrate,
+        'uscite': uscite,
+        'variazioni_entrate': variazioni_entrate,
+        'variazioni_uscite': variazioni_uscite
+    }
+    for chiave in RISULTATI_SENSIBILITA:
+        risultato[chiave] = piano[chiave].reshape(griglia_entrate.shape)
+    return risultato
+
+
+def sensibilita(dati_base, obiettivi, passo_relativo=PASSO_RELATIVO):
+    """
+    Sensibilità di ogni risultato a ogni input con differenze finite centrali.
+
+    Tutte le varianti (base, +passo e -passo per ciascun input) sono valutate in una
+    sola chiamata. L'elasticità (variazione % del risultato per +1% dell'input) rende
+    confrontabili input di scala diversa.
+
+    Args:
+        dati_base (dict): {'entrate', 'uscite', 'capitale', ...}
+        obiettivi (list): Obiettivi della FASE 2
+        passo_relativo (float): Variazione relativa di ogni input
+
+    Returns:
+        dict: {risultato: {
+            'valore': valore nel piano attuale,
+            'derivate': {input: variazione del risultato per €1 (per 'costi_obiettivi': per +100% dei costi)},
+            'elasticita': {input: variazione % per +1% dell'input (nan se non definita)},
+            'piu_influente': input con elasticità maggiore in valore assoluto (None se nessuna è definita)
+        }}
+    """
+    n_input = len(INPUT_SENSIBILITA)
+    # Riga 0 = piano attuale, righe 1 + 2i e 2 + 2i = input i aumentato e diminuito
+    fattori = np.ones((1 + 2 * n_input, n_input))
+    for indice in range(n_input):
+        fattori[1 + 2 * indice, indice] = 1 + passo_relativo
+        fattori[2 + 2 * indice, indice] = 1 - passo_relativo
+
+    base = np.array([dati_base['entrate'], dati_base['uscite'], dati_base['capitale'], 1.0], dtype=float)
+    valori = fattori * base
+    piano = _piano_su_righe(valori[:, 0], valori[:, 1], valori[:, 2], obiettivi, scala_costi=valori[:, 3])
+
+    passi = 2 * passo_relativo * base
+    risultato = {}
+    for chiave in RISULTATI_SENSIBILITA:
+        valore = piano[chiave].astype(float)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            derivate = (valore[1::2] - valore[2::2]) / np.where(passi != 0, passi, np.nan)
+            elasticita = derivate * base / valore[0]
+        elasticita = np.where(np.isfinite(elasticita), elasticita, np.nan)
+
+        definite = ~np.isnan(elasticita)
+        risultato[chiave] = {
+            'valore': float(valore[0]),
+            'derivate': dict(zip(INPUT_SENSIBILITA, derivate.tolist())),
+            'elasticita': dict(zip(INPUT_SENSIBILITA, elasticita.tolist())),
+            'piu_influente': INPUT_SENSIBILITA[int(np.nanargmax(np.abs(elasticita)))] if definite.any() else None
+        }
+    return risultato
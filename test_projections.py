@@ -0,0 +1,42 @@
+"""
+Test di projections: la serie mensile deve coincidere con la formula chiusa e i costi
+seguono la stessa convenzione del Monte Carlo.
+"""
+
+import numpy as np
+import pytest
+
+from market_assumptions import parametri_lognormali_mensili
+from projections import serie_mensile, tasso_mensile, valore_finale
+
+
+def test_serie_mensile_un_rendimento_per_nucleo_anche_con_n_uguale_ai_mesi():
+    # 12 nuclei su 1 anno: N == mesi non deve trasformare i rendimenti in un percorso mensile
+    contributi = np.full(12, 100.0)
+    rendimenti = np.linspace(0.01, 0.12, 12)
+
+    saldi = serie_mensile(contributi, 0.0, 1, rendimenti)
+
+    assert saldi.shape == (12, 13)
+    np.testing.assert_allclose(saldi[:, -1], valore_finale(contributi, 0.0, 1, rendimenti))
+
+
+def test_serie_mensile_per_mese_con_rendimento_costante_coincide_con_valore_finale():
+    rendimenti = np.full((2, 24), 0.05)
+
+    saldi = serie_mensile(np.array([100.0, 200.0]), np.array([1000.0, 0.0]), 2, rendimenti, per_mese=True)
+
+    np.testing.assert_allclose(saldi[:, -1], valore_finale(np.array([100.0, 200.0]), np.array([1000.0, 0.0]), 2, 0.05))
+
+
+def test_serie_mensile_per_mese_rifiuta_mesi_errati():
+    with pytest.raises(ValueError):
+        serie_mensile(100.0, 0.0, 1, np.full(11, 0.05), per_mese=True)
+
+
+def test_tasso_mensile_applica_il_ter_come_il_drift_del_monte_carlo():
+    # Senza volatilità il drift del Monte Carlo è il rendimento deterministico netto
+    media_log, _ = parametri_lognormali_mensili(0.07, 0.0, ter=0.015)
+
+    assert (1 + tasso_mensile(0.07, ter=0.015)) ** 12 == pytest.approx(np.exp(media_log * 12))
+    assert (1 + tasso_mensile(0.07, ter=0.015)) ** 12 == pytest.approx(1.07 * 0.985)
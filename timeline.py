@@ -0,0 +1,158 @@
+"""
+Timeline Module
+Simulazione mese per mese dei flussi del piano: il risparmio mensile ricostituisce prima
+il fondo di emergenza, poi paga i PAC degli obiettivi attivi; l'eccedenza va agli investimenti.
+Le scadenze degli obiettivi sono gestite con una coda di priorità (heapq): quando un obiettivo
+si conclude il suo PAC non pesa più sul risparmio dei mesi successivi.
+
+Il ciclo sui mesi è vettorizzato sui nuclei familiari (array di shape (N,)), così la stessa
+funzione serve per il singolo report e per l'intero portafoglio clienti.
+"""
+
+import heapq
+
+import numpy as np
+
+from calculations import calcola_pac_obiettivi
+
+
+def simula_timeline(risparmio_mensile, capitale_eccedente, pac_obiettivi, mesi_obiettivi,
+                    deficit_emergenza=0.0, mesi=None):
+    """
+    Simula i flussi mensili di N nuclei familiari.
+
+    Ogni mese il risparmio (se positivo) va, nell'ordine: al fondo di emergenza mancante,
+    ai PAC degli obiettivi non ancora scaduti, agli investimenti. La parte di PAC che il
+    risparmio non copre ("scoperto") viene pagata con il capitale eccedente, che viene quindi
+    diviso tra accantonamento per obiettivi e investimento immediato.
+
+    Args:
+        risparmio_mensile (array): Entrate - uscite, shape (N,)
+        capitale_eccedente (array): Capitale oltre il fondo di emergenza, shape (N,)
+        pac_obiettivi (array): PAC mensile di ogni obiettivo, shape (N, K); NaN = assente
+        mesi_obiettivi (array): Mesi alla scadenza di ogni obiettivo, shape (N, K); una scadenza
+            frazionaria (es. 30.9) conta come mese intero, il PAC è dovuto fino al mese 31
+        deficit_emergenza (array): Importo mancante al fondo di emergenza, shape (N,)
+        mesi (int): Mesi simulati (None = fino all'ultima scadenza)
+
+    Returns:
+        dict: {
+            'fabbisogno_obiettivi': totale dei PAC scoperti nel periodo,
+            'a_obiettivi': capitale eccedente accantonato per gli obiettivi,
+            'a_investimenti': capitale eccedente investibile subito,
+            'scoperto_residuo': PAC scoperti che nemmeno il capitale copre,
+            'mesi_coperti': mesi con PAC scoperti pagati interamente dal capitale,
+            'mese_esaurimento': mese (da 1) in cui il capitale accantonato finisce (inf = mai),
+            'mese_fondo_completo': mese (da 0) in cui il fondo di emergenza è completo (inf = mai),
+            'pac_attivi': PAC dovuti ogni mese, shape (N, mesi),
+            'scoperto_mensile': PAC non coperti dal risparmio, shape (N, mesi)
+        }
+    """
+    risparmio_mensile = np.atleast_1d(np.asarray(risparmio_mensile, dtype=float))
+    n = risparmio_mensile.shape[0]
+    capitale_eccedente = np.broadcast_to(np.asarray(capitale_eccedente, dtype=float), (n,))
+    fondo_mancante = np.broadcast_to(np.maximum(np.asarray(deficit_emergenza, dtype=float), 0.0), (n,)).copy()
+    pac_obiettivi = np.asarray(pac_obiettivi, dtype=float).reshape(n, -1)
+    mesi_obiettivi = np.asarray(mesi_obiettivi, dtype=float).reshape(n, -1)
+
+    presenti = ~np.isnan(pac_obiettivi) & (mesi_obiettivi > 0)
+    pac = np.where(presenti, np.nan_to_num(pac_obiettivi), 0.0)
+    # Scadenze frazionarie arrotondate per eccesso (la tolleranza assorbe es. 2.5 × 12 = 30.000000001)
+    scadenze = np.ceil(np.where(presenti, mesi_obiettivi, 0.0) - 1e-9).astype(np.int64)
+
+    if mesi is None:
+        mesi = max(int(scadenze.max(initial=0)), 1)
+
+    # Coda delle scadenze: (mese, nuclei, PAC che si liberano), un evento per mese di scadenza
+    nuclei, colonne = np.nonzero(presenti)
+    mesi_scadenza = scadenze[nuclei, colonne]
+    ordine = np.argsort(mesi_scadenza, kind='stable')
+    mesi_unici, inizi = np.unique(mesi_scadenza[ordine], return_index=True)
+    coda = [
+        (int(mese), indice, nuclei[gruppo], pac[nuclei[gruppo], colonne[gruppo]])
+        for indice, (mese, gruppo) in enumerate(zip(mesi_unici, np.split(ordine, inizi[1:])))
+    ]
+    heapq.heapify(coda)
+
+    pac_attivo = np.cumsum(pac, axis=1)[:, -1] if pac.shape[1] else np.zeros(n)
+    disponibile_base = np.maximum(risparmio_mensile, 0.0)
+    mese_fondo_completo = np.where(fondo_mancante <= 0, 0.0, np.inf)
+
+    # Serie memorizzate per mese (righe contigue), trasposte alla fine
+    pac_attivi = np.empty((mesi, n))
+    scoperto_mensile = np.empty((mesi, n))
+
+    for mese in range(mesi):
+        # Obiettivi scaduti: il loro PAC non è più dovuto
+        while coda and coda[0][0] <= mese:
+            _, _, nuclei_scaduti, importi = heapq.heappop(coda)
+            np.subtract.at(pac_attivo, nuclei_scaduti, importi)
+        np.maximum(pac_attivo, 0.0, out=pac_attivo)
+
+        quota_fondo = np.minimum(disponibile_base, fondo_mancante)
+        fondo_mancante -= quota_fondo
+        disponibile = disponibile_base - quota_fondo
+        mese_fondo_completo[np.isinf(mese_fondo_completo) & (fondo_mancante <= 0)] = mese + 1
+
+        versato = np.minimum(disponibile, pac_attivo)
+        pac_attivi[mese] = pac_attivo
+        np.subtract(pac_attivo, versato, out=scoperto_mensile[mese])
+
+    # Il capitale eccedente copre lo scoperto finché basta
+    scoperto_cumulato = np.cumsum(scoperto_mensile, axis=0)
+    fabbisogno = scoperto_cumulato[-1]
+    a_obiettivi = np.minimum(capitale_eccedente, fabbisogno)
+
+    coperto = scoperto_cumulato <= a_obiettivi * (1 + 1e-12)
+    esaurito = ~coperto
+    mese_esaurimento = np.where(esaurito.any(axis=0), esaurito.argmax(axis=0) + 1.0, np.inf)
+    mesi_coperti = ((scoperto_mensile > 0) & coperto).sum(axis=0)
+
+    return {
+        'fabbisogno_obiettivi': fabbisogno,
+        'a_obiettivi': a_obiettivi,
+        'a_investimenti': capitale_eccedente - a_obiettivi,
+        'scoperto_residuo': fabbisogno - a_obiettivi,
+        'mesi_coperti': mesi_coperti,
+        'mese_esaurimento': mese_esaurimento,
+        'mese_fondo_completo': mese_fondo_completo,
+        'pac_attivi': pac_attivi.T,
+        'scoperto_mensile': scoperto_mensile.T
+    }
+
+
+def alloca_capitale_obiettivi(obiettivi, risparmio_mensile, capitale_eccedente, pac_obiettivi=None):
+    """
+    Divide il capitale eccedente tra obiettivi e investimenti seguendo le scadenze reali.
+
+    Sostituisce la stima con la media degli anni (alloca_capitale_eccedente): ogni
+    obiettivo pesa sul risparmio solo fino alla propria scadenza.
+
+    Args:
+        obiettivi (list): Lista di dizionari con obiettivi
+        risparmio_mensile (float): Risparmio mensile disponibile
+        capitale_eccedente (float): Capitale oltre il fondo emergenza
+        pac_obiettivi (np.ndarray): PAC già calcolati (None = calcolati qui)
+
+    Returns:
+        dict: {
+            'a_obiettivi': importo da destinare agli obiettivi,
+            'a_investimenti': importo da investire subito,
+            'mesi_coperti': mesi in cui il capitale copre il gap,
+            'coperto': True se il gap è coperto fino all'ultima scadenza
+        }
+    """
+    if pac_obiettivi is None:
+        pac_obiettivi = calcola_pac_obiettivi(obiettivi)
+    mesi_obiettivi = [obiettivo['anni'] * 12 for obiettivo in obiettivi]
+
+    timeline = simula_timeline(
+        [risparmio_mensile], [capitale_eccedente],
+        np.reshape(pac_obiettivi, (1, -1)), np.reshape(mesi_obiettivi, (1, -1))
+    )
+    return {
+        'a_obiettivi': float(timeline['a_obiettivi'][0]),
+        'a_investimenti': float(timeline['a_investimenti'][0]),
+        'mesi_coperti': int(timeline['mesi_coperti'][0]),
+        'coperto': bool(timeline['scoperto_residuo'][0] <= 0)
+    }
@@ -144,7 +144,22 @@ L'allocazione dipende da:
         "estimated_cost": "Costo Stimato (€)",
         "years_to_goal": "Anni all'Obiettivo",
         "add_goal_btn": "✅ Aggiungi Obiettivo",
+        "goal_return": "Rendimento Annuo Atteso (%)",
+        "goal_return_help": "Rendimento netto atteso di dove accantoni il PAC (0 = conto senza interessi)",
+        "goal_inflation": "Inflazione Annua del Costo (%)",
+        "goal_inflation_help": "Di quanto cresce ogni anno il costo dell'obiettivo (0 = costo fisso)",
+        "goal_priority": "Priorità",
+        "goal_priority_help": "Se i PAC superano il risparmio disponibile, il piano consigliato modifica prima gli obiettivi meno importanti",
+        "goal_priority_1": "Alta",
+        "goal_priority_2": "Media",
+        "goal_priority_3": "Bassa",
+        "goal_max_delay": "Rinvio Massimo (anni)",
+        "goal_max_delay_help": "Di quanti anni al massimo puoi spostare la scadenza (0 = scadenza fissa)",
+        "goal_max_cut": "Riduzione Massima del Costo (%)",
+        "goal_max_cut_help": "Di quanto al massimo puoi ridurre il costo dell'obiettivo (0 = costo non riducibile)",
         "your_goals": "📋 I Tuoi Obiettivi",
+        "goals_page": "Pagina (di {pagine})",
+        "goals_summary": "{numero} obiettivi · PAC mensile totale: {pac}",
         "no_goals": "ℹ️ Nessun obiettivo aggiunto. Se non hai obiettivi specifici, più capitale andrà agli investimenti (FASE 3)!",
         "goal_added": "✅ Obiettivo '{goal_name}' aggiunto!",
         "goal_name_required": "⚠️ Inserisci un nome per l'obiettivo",
@@ -171,8 +186,30 @@ L'allocazione dipende da:
         "time": "Tempo",
         "years": "anni",
         "monthly_pac": "PAC mensile",
+        "goal_assumptions": "Rendimento {rendimento}% · Inflazione {inflazione}%",
+        "goal_flexibility": "Priorità {priorita} · Rinvio max {rinvio} anni · Riduzione max {riduzione}%",
         "months": "mesi",
         
+        # Analisi di sensibilità
+        "sensitivity_title": "🔍 Cosa succede se cambiano entrate e uscite?",
+        "sensitivity_intro": "Importo mensile investibile (FASE 3) al variare di entrate (righe) e uscite (colonne), senza dover reinserire i dati.",
+        "sensitivity_income": "Entrate",
+        "sensitivity_expenses": "Uscite",
+        "sensitivity_most": "L'input che sposta di più l'importo investibile è **{input}**: +1% → {variazione} al mese.",
+        "sensitivity_input_entrate": "le entrate",
+        "sensitivity_input_uscite": "le uscite",
+        "sensitivity_input_capitale": "la liquidità",
+        "sensitivity_input_costi_obiettivi": "il costo degli obiettivi",
+        "comparison_title": "⚖️ Confronto tra i profili di rischio",
+        "comparison_intro": "Gli stessi importi (PAC di {pac}/mese e {capitale} investiti subito, {versato} versati in {anni} anni) proiettati con ogni profilo e il relativo glide path. Il tuo profilo è in grassetto.",
+        "comparison_profile": "Profilo",
+        "comparison_allocation": "Azioni / Obbligazioni / Oro oggi",
+        "comparison_return": "Rendimento atteso",
+        "comparison_volatility": "Volatilità",
+        "comparison_final": "Patrimonio alla pensione",
+        "comparison_real": "In euro di oggi",
+        "comparison_note": "Proiezione con i rendimenti attesi, senza costi; i valori in euro di oggi scontano un'inflazione del 2% annuo. Una volatilità più alta significa oscillazioni più ampie lungo il percorso.",
+        
         # Educational resources
         "educational_sites": "🎓 Siti Educativi Consigliati",
         "educational_sites_intro": "Per approfondire la tua educazione finanziaria, ti consigliamo questi strumenti gratuiti:",
@@ -339,7 +376,22 @@ Allocation depends on:
         "estimated_cost": "Estimated Cost (€)",
         "years_to_goal": "Years to Goal",
         "add_goal_btn": "✅ Add Goal",
+        "goal_return": "Expected Annual Return (%)",
+        "goal_return_help": "Expected net return where you set aside the PAC (0 = account without interest)",
+        "goal_inflation": "Annual Cost Inflation (%)",
+        "goal_inflation_help": "How much the goal's cost grows each year (0 = fixed cost)",
+        "goal_priority": "Priority",
+        "goal_priority_help": "If your PACs exceed your available savings, the recommended plan changes the least important goals first",
+        "goal_priority_1": "High",
+        "goal_priority_2": "Medium",
+        "goal_priority_3": "Low",
+        "goal_max_delay": "Maximum Delay (years)",
+        "goal_max_delay_help": "By how many years at most you can move the deadline (0 = fixed deadline)",
+        "goal_max_cut": "Maximum Cost Reduction (%)",
+        "goal_max_cut_help": "By how much at most you can reduce the goal's cost (0 = cost cannot be reduced)",
         "your_goals": "📋 Your Goals",
+        "goals_page": "Page (of {pagine})",
+        "goals_summary": "{numero} goals · Total monthly PAC: {pac}",
         "no_goals": "ℹ️ No goals added. If you don't have specific goals, more capital will go to investments (PHASE 3)!",
         "goal_added": "✅ Goal '{goal_name}' added!",
         "goal_name_required": "⚠️ Enter a name for the goal",
@@ -366,8 +418,30 @@ Allocation depends on:
         "time": "Time",
         "years": "years",
         "monthly_pac": "Monthly PAC",
+        "goal_assumptions": "Return {rendimento}% · Inflation {inflazione}%",
+        "goal_flexibility": "{priorita} priority · Max delay {rinvio} years · Max cut {riduzione}%",
         "months": "months",
         
+        # Sensitivity analysis
+        "sensitivity_title": "🔍 What if income and expenses change?",
+        "sensitivity_intro": "Monthly investable amount (PHASE 3) for different income (rows) and expenses (columns), without re-entering your data.",
+        "sensitivity_income": "Income",
+        "sensitivity_expenses": "Expenses",
+        "sensitivity_most": "The input that moves the investable amount the most is **{input}**: +1% → {variazione} per month.",
+        "sensitivity_input_entrate": "income",
+        "sensitivity_input_uscite": "expenses",
+        "sensitivity_input_capitale": "liquidity",
+        "sensitivity_input_costi_obiettivi": "goal costs",
+        "comparison_title": "⚖️ Risk profile comparison",
+        "comparison_intro": "The same amounts ({pac}/month PAC and {capitale} invested now, {versato} contributed over {anni} years) projected with each profile and its glide path. Your profile is shown in bold.",
+        "comparison_profile": "Profile",
+        "comparison_allocation": "Stocks / Bonds / Gold today",
+        "comparison_return": "Expected return",
+        "comparison_volatility": "Volatility",
+        "comparison_final": "Wealth at retirement",
+        "comparison_real": "In today's euros",
+        "comparison_note": "Projection with expected returns, before costs; values in today's euros assume 2% annual inflation. Higher volatility means wider swings along the way.",
+        
         # Educational resources
         "educational_sites": "🎓 Recommended Educational Sites",
         "educational_sites_intro": "To deepen your financial education, we recommend these free tools:",
@@ -534,7 +608,22 @@ Allokation hängt ab von:
         "estimated_cost": "Geschätzte Kosten (€)",
         "years_to_goal": "Jahre bis zum Ziel",
         "add_goal_btn": "✅ Ziel hinzufügen",
+        "goal_return": "Erwartete Jahresrendite (%)",
+        "goal_return_help": "Erwartete Nettorendite der Anlage, in die Sie den PAC einzahlen (0 = Konto ohne Zinsen)",
+        "goal_inflation": "Jährliche Kosteninflation (%)",
+        "goal_inflation_help": "Wie stark die Kosten des Ziels jedes Jahr steigen (0 = feste Kosten)",
+        "goal_priority": "Priorität",
+        "goal_priority_help": "Wenn Ihre Sparpläne die verfügbaren Ersparnisse übersteigen, ändert der empfohlene Plan zuerst die am wenigsten wichtigen Ziele",
+        "goal_priority_1": "Hoch",
+        "goal_priority_2": "Mittel",
+        "goal_priority_3": "Niedrig",
+        "goal_max_delay": "Maximale Verschiebung (Jahre)",
+        "goal_max_delay_help": "Um wie viele Jahre Sie den Termin höchstens verschieben können (0 = fester Termin)",
+        "goal_max_cut": "Maximale Kostensenkung (%)",
+        "goal_max_cut_help": "Um wie viel Sie die Kosten des Ziels höchstens senken können (0 = Kosten nicht reduzierbar)",
         "your_goals": "📋 Ihre Ziele",
+        "goals_page": "Seite (von {pagine})",
+        "goals_summary": "{numero} Ziele · Gesamter monatlicher Sparplan: {pac}",
         "no_goals": "ℹ️ Keine Ziele hinzugefügt. Wenn Sie keine spezifischen Ziele haben, geht mehr Kapital in Investitionen (PHASE 3)!",
         "goal_added": "✅ Ziel '{goal_name}' hinzugefügt!",
         "goal_name_required": "⚠️ Geben Sie einen Namen für das Ziel ein",
@@ -561,8 +650,30 @@ Allokation hängt ab von:
         "time": "Zeit",
         "years": "Jahre",
         "monthly_pac": "Monatlicher PAC",
+        "goal_assumptions": "Rendite {rendimento}% · Inflation {inflazione}%",
+        "goal_flexibility": "Priorität {priorita} · Max. Verschiebung {rinvio} Jahre · Max. Senkung {riduzione}%",
         "months": "Monate",
         
+        # Sensitivitätsanalyse
+        "sensitivity_title": "🔍 Was passiert, wenn sich Einnahmen und Ausgaben ändern?",
+        "sensitivity_intro": "Monatlich investierbarer Betrag (PHASE 3) bei unterschiedlichen Einnahmen (Zeilen) und Ausgaben (Spalten), ohne Ihre Daten neu einzugeben.",
+        "sensitivity_income": "Einnahmen",
+        "sensitivity_expenses": "Ausgaben",
+        "sensitivity_most": "Am stärksten wirkt sich auf den investierbaren Betrag aus: **{input}** (+1% → {variazione} pro Monat).",
+        "sensitivity_input_entrate": "Einnahmen",
+        "sensitivity_input_uscite": "Ausgaben",
+        "sensitivity_input_capitale": "Liquidität",
+        "sensitivity_input_costi_obiettivi": "Kosten der Ziele",
+        "comparison_title": "⚖️ Vergleich der Risikoprofile",
+        "comparison_intro": "Dieselben Beträge (Sparplan von {pac}/Monat und {capitale} sofort investiert, {versato} eingezahlt in {anni} Jahren), projiziert mit jedem Profil und dessen Glide Path. Ihr Profil ist fett hervorgehoben.",
+        "comparison_profile": "Profil",
+        "comparison_allocation": "Aktien / Anleihen / Gold heute",
+        "comparison_return": "Erwartete Rendite",
+        "comparison_volatility": "Volatilität",
+        "comparison_final": "Vermögen bei Renteneintritt",
+        "comparison_real": "In heutigen Euro",
+        "comparison_note": "Projektion mit erwarteten Renditen, vor Kosten; Werte in heutigen Euro berücksichtigen 2% Inflation pro Jahr. Höhere Volatilität bedeutet stärkere Schwankungen unterwegs.",
+        
         # Bildungsressourcen
         "educational_sites": "🎓 Empfohlene Bildungsseiten",
         "educational_sites_intro": "Um Ihre Finanzbildung zu vertiefen, empfehlen wir diese kostenlosen Tools:",
@@ -3,9 +3,17 @@ UI Components for Streamlit App
 Contiene tutti i componenti di interfaccia utente
 """
 
+import numpy as np
 import streamlit as st
 from translations import t
-from calculations import calcola_pac_mensile, formatta_valuta
+from calculations import codice_profilo, formatta_valuta, formatta_valuta_intera
+from sensitivity import griglia_sensibilita, sensibilita
+from goal_optimizer import PRIORITA, PRIORITA_PREDEFINITA
+from goal_store import GoalStore
+
+
+# Obiettivi mostrati per pagina nell'elenco della FASE 2
+OBIETTIVI_PER_PAGINA = 20
 
 
 def render_language_selector():
@@ -163,6 +171,20 @@ def render_dati_demografici(lang):
     }
 
 
+def archivio_obiettivi():
+    """
+    Restituisce l'archivio degli obiettivi della sessione, creandolo se manca.
+    
+    Una lista di dizionari salvata in st.session_state.obiettivi viene convertita in GoalStore.
+    
+    Returns:
+        GoalStore: Archivio degli obiettivi
+    """
+    if not isinstance(st.session_state.get('obiettivi'), GoalStore):
+        st.session_state.obiettivi = GoalStore(st.session_state.get('obiettivi') or [])
+    return st.session_state.obiettivi
+
+
 def render_gestione_obiettivi(lang):
     """
     Renderizza la sezione per gestire obiettivi finanziari multipli.
@@ -174,12 +196,11 @@ def render_gestione_obiettivi(lang):
     
     st.markdown(t("goals_intro", lang))
     
-    # Inizializza session_state per gli obiettivi se non esiste
-    if 'obiettivi' not in st.session_state:
-        st.session_state.obiettivi = []
+    # Archivio degli obiettivi (id stabili, PAC calcolato solo all'inserimento)
+    archivio = archivio_obiettivi()
     
     # Form per aggiungere nuovo obiettivo
-    with st.expander(t("add_goal", lang), expanded=len(st.session_state.obiettivi) == 0):
+    with st.expander(t("add_goal", lang), expanded=len(archivio) == 0):
         col1, col2, col3 = st.columns([2, 1, 1])
         
         with col1:
@@ -207,39 +228,131 @@ def render_gestione_obiettivi(lang):
                 key="input_anni"
             )
         
+        col4, col5 = st.columns(2)
+        
+        with col4:
+            rendimento_obiettivo = st.number_input(
+                t("goal_return", lang),
+                min_value=0.0,
+                max_value=15.0,
+                value=0.0,
+                step=0.5,
+                help=t("goal_return_help", lang),
+                key="input_rendimento"
+            )
+        
+        with col5:
+            inflazione_obiettivo = st.number_input(
+                t("goal_inflation", lang),
+                min_value=0.0,
+                max_value=10.0,
+                value=0.0,
+                step=0.5,
+                help=t("goal_inflation_help", lang),
+                key="input_inflazione"
+            )
+        
+        # Priorità e flessibilità usate dal piano consigliato quando i PAC superano il risparmio
+        col6, col7, col8 = st.columns(3)
+        
+        with col6:
+            priorita_obiettivo = st.selectbox(
+                t("goal_priority", lang),
+                PRIORITA,
+                index=PRIORITA.index(PRIORITA_PREDEFINITA),
+                format_func=lambda priorita: t(f"goal_priority_{priorita}", lang),
+                help=t("goal_priority_help", lang),
+                key="input_priorita"
+            )
+        
+        with col7:
+            rinvio_obiettivo = st.number_input(
+                t("goal_max_delay", lang),
+                min_value=0,
+                max_value=10,
+                value=0,
+                help=t("goal_max_delay_help", lang),
+                key="input_rinvio"
+            )
+        
+        with col8:
+            riduzione_obiettivo = st.number_input(
+                t("goal_max_cut", lang),
+                min_value=0.0,
+                max_value=100.0,
+                value=0.0,
+                step=5.0,
+                help=t("goal_max_cut_help", lang),
+                key="input_riduzione"
+            )
+        
         if st.button(t("add_goal_btn", lang)):
             if nome_obiettivo:
-                st.session_state.obiettivi.append({
+                archivio.aggiungi({
                     "nome": nome_obiettivo,
                     "costo": costo_obiettivo,
-                    "anni": anni_obiettivo
+                    "anni": anni_obiettivo,
+                    "rendimento": rendimento_obiettivo,
+                    "inflazione": inflazione_obiettivo,
+                    "priorita": priorita_obiettivo,
+                    "rinvio_massimo": rinvio_obiettivo,
+                    "riduzione_massima": riduzione_obiettivo
                 })
                 st.success(t("goal_added", lang, goal_name=nome_obiettivo))
                 st.rerun()
             else:
                 st.error(t("goal_name_required", lang))
     
-    # Mostra obiettivi esistenti
-    if st.session_state.obiettivi:
+    # Mostra obiettivi esistenti, una pagina alla volta
+    if len(archivio):
         st.subheader(t("your_goals", lang))
-        for idx, obiettivo in enumerate(st.session_state.obiettivi):
+        pagine = archivio.numero_pagine(OBIETTIVI_PER_PAGINA)
+        pagina = 1
+        if pagine > 1:
+            pagina = st.number_input(
+                t("goals_page", lang, pagine=pagine),
+                min_value=1,
+                max_value=pagine,
+                value=1,
+                key="pagina_obiettivi"
+            )
+        st.caption(t(
+            "goals_summary", lang,
+            numero=len(archivio),
+            pac=formatta_valuta(archivio.pac_totale)
+        ))
+        
+        for id_obiettivo, obiettivo, pac_mensile in archivio.pagina(pagina, OBIETTIVI_PER_PAGINA):
             col1, col2 = st.columns([4, 1])
             with col1:
-                pac_mensile = calcola_pac_mensile(obiettivo['costo'], obiettivo['anni'])
+                ipotesi = ""
+                if obiettivo.get('rendimento') or obiettivo.get('inflazione'):
+                    ipotesi = " | " + t(
+                        "goal_assumptions", lang,
+                        rendimento=f"{obiettivo.get('rendimento', 0):g}",
+                        inflazione=f"{obiettivo.get('inflazione', 0):g}"
+                    )
+                if obiettivo.get('rinvio_massimo') or obiettivo.get('riduzione_massima'):
+                    ipotesi += " | " + t(
+                        "goal_flexibility", lang,
+                        priorita=t(f"goal_priority_{obiettivo.get('priorita', PRIORITA_PREDEFINITA)}", lang),
+                        rinvio=obiettivo.get('rinvio_massimo', 0),
+                        riduzione=f"{obiettivo.get('riduzione_massima', 0):g}"
+                    )
                 st.info(f"""
                 **{obiettivo['nome']}**  
                 {t("cost", lang)}: {formatta_valuta(obiettivo['costo'])} | 
                 {t("time", lang)}: {obiettivo['anni']} {t("years", lang)} | 
-                {t("monthly_pac", lang)}: {formatta_valuta(pac_mensile)}
+                {t("monthly_pac", lang)}: {formatta_valuta(pac_mensile)}{ipotesi}
                 """)
             with col2:
-                if st.button("🗑️", key=f"del_{idx}", help="Delete"):
-                    st.session_state.obiettivi.pop(idx)
+                if st.button("🗑️", key=f"del_{id_obiettivo}", help="Delete"):
+                    archivio.rimuovi(id_obiettivo)
                     st.rerun()
     else:
         st.info(t("no_goals", lang))
     
-    return st.session_state.obiettivi
+    return archivio.come_lista()
 
 
 def render_profilo_rischio(lang):
@@ -278,6 +391,97 @@ def render_profilo_rischio(lang):
     return profilo
 
 
+def render_analisi_sensibilita(lang, dati_base, obiettivi, punti_tabella=5):
+    """
+    Renderizza l'analisi "cosa succede se" su entrate e uscite (±30%).
+    
+    Args:
+        lang (str): Codice lingua
+        dati_base (dict): Dati finanziari di base
+        obiettivi (list): Obiettivi della FASE 2
+        punti_tabella (int): Righe e colonne mostrate (estratte dalla griglia completa)
+    """
+    griglia = griglia_sensibilita(dati_base, obiettivi)
+    indici = np.linspace(0, len(griglia['entrate']) - 1, punti_tabella).round().astype(int)
+    disponibilita = griglia['disponibilita_investimenti'][np.ix_(indici, indici)]
+    
+    def variazione(quota):
+        return f"{quota * 100:+.0f}%" if round(quota * 100) else "0%"
+    
+    with st.expander(t("sensitivity_title", lang), expanded=False):
+        st.markdown(t("sensitivity_intro", lang))
+        
+        intestazione = [f"{t('sensitivity_income', lang)} \\ {t('sensitivity_expenses', lang)}"] + [
+            f"{formatta_valuta_intera(griglia['uscite'][j], lang)} ({variazione(griglia['variazioni_uscite'][j])})"
+            for j in indici
+        ]
+        righe = ["| " + " | ".join(intestazione) + " |", "|" + "---|" + "---:|" * len(indici)]
+        for riga, i in enumerate(indici):
+            celle = [f"{formatta_valuta_intera(griglia['entrate'][i], lang)} ({variazione(griglia['variazioni_entrate'][i])})"]
+            celle += [formatta_valuta_intera(valore, lang) for valore in disponibilita[riga]]
+            righe.append("| " + " | ".join(celle) + " |")
+        st.markdown("\n".join(righe))
+        
+        risultato = sensibilita(dati_base, obiettivi)['disponibilita_investimenti']
+        if risultato['piu_influente'] is not None:
+            derivata = risultato['derivate'][risultato['piu_influente']]
+            base = {'entrate': dati_base['entrate'], 'uscite': dati_base['uscite'], 'capitale': dati_base['capitale']}
+            variazione_mensile = derivata * base.get(risultato['piu_influente'], 1.0) / 100
+            st.markdown(t(
+                "sensitivity_most", lang,
+                input=t(f"sensitivity_input_{risultato['piu_influente']}", lang),
+                variazione=("+" if variazione_mensile >= 0 else "-") + formatta_valuta_intera(abs(variazione_mensile), lang)
+            ))
+
+
+def render_confronto_profili(lang, pipeline, risultato, allocazioni_personalizzate=None):
+    """
+    Renderizza il confronto dei tre profili di rischio sugli stessi importi della FASE 3.
+    
+    Args:
+        lang (str): Codice lingua
+        pipeline (PlanPipeline): Pipeline che ha prodotto il risultato
+        risultato (dict): Risultato di PlanPipeline.esegui
+        allocazioni_personalizzate (dict): {nome: allocazione percentuale}, opzionale
+    """
+    confronto = pipeline.confronta_profili(risultato, allocazioni_personalizzate)
+    nomi_profili = {0: t("conservative", lang), 1: t("moderate", lang), 2: t("aggressive", lang)}
+    profilo_attuale = codice_profilo(risultato['input']['profilo_rischio'])
+    
+    def percentuale(quota):
+        testo = f"{quota * 100:.1f}%"
+        return testo if lang == 'en' else testo.replace(".", ",")
+    
+    with st.expander(t("comparison_title", lang), expanded=False):
+        st.markdown(t(
+            "comparison_intro", lang,
+            pac=formatta_valuta_intera(max(risultato['fase3']['disponibilita_mensile'], 0), lang),
+            capitale=formatta_valuta_intera(max(risultato['fase2']['capitale_investibile_subito'], 0), lang),
+            anni=risultato['input']['anni_pensione'],
+            versato=formatta_valuta_intera(confronto['versato'], lang)
+        ))
+        
+        righe = [
+            f"| {t('comparison_profile', lang)} | {t('comparison_allocation', lang)} | "
+            f"{t('comparison_return', lang)} | {t('comparison_volatility', lang)} | "
+            f"{t('comparison_final', lang)} | {t('comparison_real', lang)} |",
+            "|---|---|---:|---:|---:|---:|"
+        ]
+        for indice, nome in enumerate(confronto['nomi']):
+            etichetta = nomi_profili.get(nome, nome) if isinstance(nome, int) else nome
+            if nome == profilo_attuale:
+                etichetta = f"**{etichetta}**"
+            allocazione = " / ".join(f"{valore:.0f}%" for valore in confronto['allocazioni'][indice].values())
+            righe.append(
+                f"| {etichetta} | {allocazione} | "
+                f"{percentuale(confronto['rendimento_atteso'][indice])} | {percentuale(confronto['volatilita'][indice])} | "
+                f"{formatta_valuta_intera(confronto['patrimonio_finale'][indice], lang)} | "
+                f"{formatta_valuta_intera(confronto['patrimonio_reale'][indice], lang)} |"
+            )
+        st.markdown("\n".join(righe))
+        st.caption(t("comparison_note", lang))
+
+
 def render_educational_resources(lang):
     """Renderizza la sezione con le risorse educative consigliate."""
     st.markdown("---")